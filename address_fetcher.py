@@ -1,4 +1,12 @@
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+import json
+import sqlite3
+import threading
+import time
 
 """
 Verifies and retrieves addresses
@@ -8,6 +16,8 @@ Verifies and retrieves addresses
 class AddressSearch:
     api_url = "https://geocode.search.hereapi.com/v1/geocode"
     api_key = ""
+    # Seconds allowed to connect to and read from the API
+    timeout = (3.05, 10)
 
     @staticmethod
     def get_address_details(house_number: int, postal_code: str) -> dict:
@@ -17,34 +27,360 @@ class AddressSearch:
         Returns:
             Dict[str, dict]: Dictionary containg an error (if address is invalid or and HTTPError is raised) and address if found.
         """
-        result = {"result": False, "err_msg": "", "address": {}}
         query_params = {
             "qq": f"houseNumber={house_number};postalCode={postal_code}",
             "apiKey": AddressSearch.api_key,
         }
         try:
-            response = requests.get(AddressSearch.api_url, params=query_params)
+            response = requests.get(
+                AddressSearch.api_url,
+                params=query_params,
+                timeout=AddressSearch.timeout,
+            )
             # Raise an HTTPError for bad responses
             response.raise_for_status()
-            data = response.json()
-            if data.get("items"):
-                for item in data["items"]:
-                    if not item["address"]:
-                        result["err_msg"] = "Failed to retrieve a full address."
-                        return result
-                    address = item["address"]
-                    result["address"] = {
-                        "postcode": postal_code.upper().replace(" ", ""),
-                        "city": address.get("city"),
-                        "country": address.get("countryName"),
-                        "house_number": house_number,
-                        "label": address.get("label"),
-                    }
-                    result["result"] = True
+            return AddressSearch.read_response(
+                response.json(), house_number, postal_code
+            )
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return {
+                "result": False,
+                "err_msg": f"An error occurred: {e}",
+                "address": {},
+            }
+
+    @staticmethod
+    def read_response(data: dict, house_number: int, postal_code: str) -> dict:
+        """
+        Read the address from a HERE Geocoding API response.
+
+        Arguments:
+            data (dict): Decoded JSON body of the response.
+            house_number (int): House number the address was searched with.
+            postal_code (str): Postcode the address was searched with.
+
+        Returns:
+            Dict[str, dict]: Dictionary containg an error (if address is invalid) and address if found.
+        """
+        result = {"result": False, "err_msg": "", "address": {}}
+        if data.get("items"):
+            for item in data["items"]:
+                if not item["address"]:
+                    result["err_msg"] = "Failed to retrieve a full address."
                     return result
-            else:
-                result["err_msg"] = "No address found."
+                address = item["address"]
+                result["address"] = {
+                    "postcode": postal_code.upper().replace(" ", ""),
+                    "city": address.get("city"),
+                    "country": address.get("countryName"),
+                    "house_number": house_number,
+                    "label": address.get("label"),
+                }
+                result["result"] = True
                 return result
-        except requests.exceptions.RequestException as e:
-            result["err_msg"] = f"An error occurred: {e}"
+        result["err_msg"] = "No address found."
+        return result
+
+
+class AddressCache:
+    """
+    Persistent cache of address lookups, stored in its own SQLite database.
+
+    Addresses are stored by postcode and house number. Entries older than the time to live are ignored and evicted.
+    """
+
+    def __init__(self, database_path: Path, ttl: float = 30 * 24 * 60 * 60) -> None:
+        """
+        Initialise an AddressCache object, creating the cache table if needed.
+
+        Arguments:
+            database_path (Path): Path of the cache database file.
+            ttl (float): Seconds an address is kept for. Defaults to 30 days.
+        """
+        self._database_path = database_path
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        conn = sqlite3.connect(self._database_path)
+        cur = conn.cursor()
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS AddressCache (
+                Postcode VARCHAR(16) NOT NULL,
+                HouseNumber VARCHAR(32) NOT NULL,
+                Address TEXT NOT NULL,
+                FetchedAt REAL NOT NULL,
+                PRIMARY KEY (Postcode, HouseNumber)
+            );
+            """
+        )
+        conn.commit()
+        cur.close()
+        conn.close()
+        self.evict_expired()
+
+    @staticmethod
+    def _key(house_number: Union[int, str], postcode: str) -> tuple:
+        """Return the cache key of an address, ignoring case and spacing."""
+        return postcode.upper().replace(" ", ""), str(house_number).strip()
+
+    def get(self, house_number: Union[int, str], postcode: str) -> Optional[dict]:
+        """
+        Return a cached address. Only the exact house number and postcode looked up before is returned,
+        so every cached address was confirmed by the API.
+
+        Arguments:
+            house_number (Union[int, str]): House number of the address.
+            postcode (str): Postcode of the address.
+
+        Returns:
+            Optional[dict]: The address, otherwise None if it is not cached.
+        """
+        postcode, house_number = self._key(house_number, postcode)
+        with self._lock:
+            conn = sqlite3.connect(self._database_path)
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT Address FROM AddressCache
+                WHERE Postcode = ? AND HouseNumber = ? AND FetchedAt >= ?;
+                """,
+                (postcode, house_number, time.time() - self._ttl),
+            )
+            row = cur.fetchone()
+            cur.close()
+            conn.close()
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, house_number: Union[int, str], postcode: str, address: dict) -> None:
+        """
+        Store an address in the cache.
+
+        Arguments:
+            house_number (Union[int, str]): House number of the address.
+            postcode (str): Postcode of the address.
+            address (dict): The address returned by the lookup.
+        """
+        postcode, house_number = self._key(house_number, postcode)
+        with self._lock:
+            conn = sqlite3.connect(self._database_path)
+            cur = conn.cursor()
+            cur.execute(
+                "INSERT OR REPLACE INTO AddressCache (Postcode, HouseNumber, Address, FetchedAt) VALUES (?,?,?,?);",
+                (postcode, house_number, json.dumps(address), time.time()),
+            )
+            conn.commit()
+            cur.close()
+            conn.close()
+
+    def evict_expired(self) -> int:
+        """
+        Delete addresses older than the time to live.
+
+        Returns:
+            int: Number of addresses deleted.
+        """
+        with self._lock:
+            conn = sqlite3.connect(self._database_path)
+            cur = conn.cursor()
+            cur.execute(
+                "DELETE FROM AddressCache WHERE FetchedAt < ?;",
+                (time.time() - self._ttl,),
+            )
+            deleted = cur.rowcount
+            conn.commit()
+            cur.close()
+            conn.close()
+        return deleted
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket, limiting how often an operation can happen.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """
+        Initialise a TokenBucket object, starting full.
+
+        Arguments:
+            rate (float): Tokens added per second.
+            capacity (int): Maximum number of tokens, allowing short bursts.
+        """
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, waiting until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity,
+                    self._tokens + (now - self._last_refill) * self._rate,
+                )
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+class AddressService:
+    """
+    Looks up addresses on worker threads, through a persistent cache and a pooled HTTP session.
+    """
+
+    # Responses worth retrying, as the same request may succeed later
+    retry_statuses = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        cache: AddressCache,
+        api_url: str = AddressSearch.api_url,
+        api_key: str = None,
+        timeout: tuple = AddressSearch.timeout,
+        retries: int = 3,
+        workers: int = 4,
+        rate: float = 5.0,
+        burst: int = 5,
+        backoff: float = 0.3,
+    ) -> None:
+        """
+        Initialise an AddressService object.
+
+        Arguments:
+            cache (AddressCache): Cache checked before the API is called.
+            api_url (str): URL of the geocoding API. Defaults to the HERE Geocoding API.
+            api_key (str): Optional. Key for the geocoding API. Defaults to AddressSearch.api_key.
+            timeout (tuple): Seconds allowed to connect to and read from the API.
+            retries (int): Number of times a failed request is retried. Defaults to 3.
+            workers (int): Number of worker threads. Defaults to 4.
+            rate (float): Maximum API requests per second. Defaults to 5.
+            burst (int): Number of API requests allowed at once before the rate applies. Defaults to 5.
+            backoff (float): Seconds waited before the first retry, doubling for each retry after. Defaults to 0.3.
+        """
+        self._cache = cache
+        self._api_url = api_url
+        self._api_key = api_key if api_key is not None else AddressSearch.api_key
+        self._timeout = timeout
+        self._rate_limit = TokenBucket(rate, burst)
+        self._retries = retries
+        self._backoff = backoff
+        # Connections are kept alive and reused. Retries are made by _fetch, so each is rate limited
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self._session = requests.Session()
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="address"
+        )
+
+    def _fetch(self, house_number: Union[int, str], postcode: str) -> dict:
+        """
+        Look up an address in the cache, otherwise with the API, caching the result if found.
+
+        Returns:
+            Dict[str, dict]: Dictionary containg the success of the lookup (bool), an error (if present) and address if found.
+        """
+        address = self._cache.get(house_number, postcode)
+        if address is not None:
+            return {"result": True, "err_msg": "", "address": address}
+        query_params = {
+            "qq": f"houseNumber={house_number};postalCode={postcode}",
+            "apiKey": self._api_key,
+        }
+        error = None
+        for attempt in range(self._retries + 1):
+            if attempt > 0:
+                time.sleep(self._backoff * 2 ** (attempt - 1))
+            # Every attempt takes a token, so retries count towards the rate limit
+            self._rate_limit.acquire()
+            try:
+                response = self._session.get(
+                    self._api_url, params=query_params, timeout=self._timeout
+                )
+                if (
+                    response.status_code in self.retry_statuses
+                    and attempt < self._retries
+                ):
+                    continue
+                # Raise an HTTPError for bad responses
+                response.raise_for_status()
+                result = AddressSearch.read_response(
+                    response.json(), house_number, postcode
+                )
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                # The API may be briefly unreachable, so these are retried
+                error = e
+                continue
+            except (requests.exceptions.RequestException, ValueError) as e:
+                error = e
+                break
+            if result["result"]:
+                self._cache.put(house_number, postcode, result["address"])
             return result
+        return {
+            "result": False,
+            "err_msg": f"An error occurred: {error}",
+            "address": {},
+        }
+
+    def lookup_async(self, house_number: Union[int, str], postcode: str) -> Future:
+        """
+        Start looking up an address on a worker thread.
+
+        Arguments:
+            house_number (Union[int, str]): House number of the address.
+            postcode (str): Postcode of the address.
+
+        Returns:
+            Future: Resolves to the lookup result, formatted as in AddressSearch.get_address_details.
+        """
+        return self._executor.submit(self._fetch, house_number, postcode)
+
+    def lookup(self, house_number: Union[int, str], postcode: str) -> dict:
+        """Look up an address on a worker thread, waiting for the result."""
+        return self.lookup_async(house_number, postcode).result()
+
+    def lookup_batch(
+        self, addresses: Iterable[Tuple[Union[int, str], str]]
+    ) -> List[dict]:
+        """
+        Look up many addresses concurrently, within the rate limit.
+
+        Identical addresses are only looked up once.
+
+        Arguments:
+            addresses (Iterable[Tuple[Union[int, str], str]]): House number and postcode of each address.
+
+        Returns:
+            List[dict]: Lookup results in the same order as the addresses, formatted as in AddressSearch.get_address_details.
+        """
+        addresses = list(addresses)
+        # Unique addresses by cache key
+        unique_addresses = {}
+        for house_number, postcode in addresses:
+            unique_addresses.setdefault(
+                AddressCache._key(house_number, postcode), (house_number, postcode)
+            )
+        futures = {
+            key: self.lookup_async(*address)
+            for key, address in unique_addresses.items()
+        }
+        results = {key: future.result() for key, future in futures.items()}
+        return [
+            results[AddressCache._key(house_number, postcode)]
+            for house_number, postcode in addresses
+        ]
+
+    def close(self) -> None:
+        """Stop the worker threads and close pooled connections."""
+        self._executor.shutdown(wait=False)
+        self._session.close()
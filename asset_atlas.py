@@ -0,0 +1,69 @@
+import tkinter as tk
+from pathlib import Path
+from typing import Any, Iterable, Tuple, Union
+
+"""
+Decodes the GUI's image assets once, so elements can be shown images already in memory
+"""
+
+
+class AssetAtlas:
+    """
+    Cache of decoded image assets for the GUI, by file and the size they are displayed at.
+
+    Updating an element with a filename makes Tk read and decode the file every time. Elements updated
+    with an image from the atlas show it straight away, so each asset is decoded at most once per size.
+    """
+
+    def __init__(self, master: tk.Misc) -> None:
+        """
+        Initialise an AssetAtlas object.
+
+        Arguments:
+            master (tk.Misc): Tk widget owning the images, such as the window's root.
+        """
+        self._master = master
+        # Decoded images by (path, size)
+        self._images = {}
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def get(self, path: Union[Path, str], size: Tuple[int, int] = None) -> Any:
+        """
+        Return a decoded image, decoding it the first time it is requested.
+
+        Arguments:
+            path (Union[Path, str]): Path of the image file.
+            size (Tuple[int, int]): Optional. Width and height the image is displayed at.
+                                    Defaults to None, displaying the image at its own size.
+
+        Returns:
+            Any: A tk.PhotoImage, or a PIL ImageTk.PhotoImage if resized, to pass to an element's data argument.
+        """
+        key = (str(path), tuple(size) if size is not None else None)
+        image = self._images.get(key)
+        if image is None:
+            image = self._images[key] = self._load(*key)
+        return image
+
+    def preload(self, paths: Iterable[Union[Path, str]]) -> None:
+        """Decode images at their own size ahead of being shown."""
+        for path in paths:
+            self.get(path)
+
+    def _load(self, path: str, size: Tuple[int, int] = None) -> Any:
+        """Decode an image file at its own size once, resizing it if displayed at a different size."""
+        image = self._images.get((path, None))
+        if image is None:
+            image = self._images[(path, None)] = tk.PhotoImage(
+                master=self._master, file=path
+            )
+        if size is None or (image.width(), image.height()) == size:
+            return image
+        # Tk can only scale images by whole factors, so other sizes are resized with PIL, which is slow to import
+        from PIL import Image, ImageTk
+
+        with Image.open(path) as source:
+            resized = source.resize(size, getattr(Image, "Resampling", Image).LANCZOS)
+        return ImageTk.PhotoImage(resized, master=self._master)
@@ -0,0 +1,313 @@
+from binary_search_tree import BinarySearchTree, BinarySearchTreeNode
+from typing import Iterable, Optional
+
+"""
+Self-balancing binary search trees, which stay O(log n) deep however values are inserted
+"""
+
+
+class AVLTreeNode(BinarySearchTreeNode):
+    """Class representing nodes in an AVL tree."""
+
+    __slots__ = ("subtree_height",)
+
+    def __init__(self, value: int) -> None:
+        """
+        Initialise an AVLTreeNode object as a leaf.
+
+        Arguments:
+            value (int): Value of the node.
+        """
+        super().__init__(value)
+        # Levels in the subtree rooted here
+        self.subtree_height = 1
+
+
+class RedBlackTreeNode(BinarySearchTreeNode):
+    """Class representing nodes in a red-black tree."""
+
+    __slots__ = ("red",)
+
+    def __init__(self, value: int) -> None:
+        """
+        Initialise a RedBlackTreeNode object as a red leaf.
+
+        Arguments:
+            value (int): Value of the node.
+        """
+        super().__init__(value)
+        self.red = True
+
+
+class BalancedBinarySearchTree(BinarySearchTree):
+    """
+    Base class for binary search trees which rebalance themselves with rotations.
+
+    Nodes are linked through their left and right attributes only. Subclasses implement
+    _insert and _delete, each returning the new root of the subtree they were given.
+    """
+
+    def add_node(self, value: int) -> None:
+        """
+        Add a node to the tree, rebalancing it. Values already in the tree are ignored.
+
+        Arguments:
+            value (int): Value to be assigned to the node attribute.
+        """
+        self.root = self._insert(self.root, value)
+
+    def delete(self, value: int, trace: dict = None) -> bool:
+        """
+        Delete a value from the tree, rebalancing it.
+
+        Arguments:
+            value (int): Value to delete.
+            trace (dict): Optional. Filled with the steps taken to find the value.
+
+        Returns:
+            bool: True if the value was in the tree, otherwise False.
+        """
+        if not self.search(value, trace):
+            return False
+        self.root = self._delete(self.root, value)
+        return True
+
+    def build_balanced_tree(self, values: Iterable[int]) -> None:
+        """Build a tree from values, which is balanced however they are ordered."""
+        self.build_tree(values)
+
+    def build_from_sorted(self, values: Iterable[int], count: int = None) -> None:
+        """Build a tree from values in ascending order, inserting each so the tree keeps its balancing rules."""
+        self.build_tree(values)
+
+    def _rotate_left(self, node: BinarySearchTreeNode) -> BinarySearchTreeNode:
+        """Rotate a subtree left, returning its new root (the old root's right child)."""
+        new_root = node.right
+        node.right = new_root.left
+        new_root.left = node
+        self.rotations += 1
+        return new_root
+
+    def _rotate_right(self, node: BinarySearchTreeNode) -> BinarySearchTreeNode:
+        """Rotate a subtree right, returning its new root (the old root's left child)."""
+        new_root = node.left
+        node.left = new_root.right
+        new_root.right = node
+        self.rotations += 1
+        return new_root
+
+    @staticmethod
+    def _min_node(node: BinarySearchTreeNode) -> BinarySearchTreeNode:
+        """Return the node with the smallest value in a subtree."""
+        while node.left is not None:
+            node = node.left
+        return node
+
+
+class AVLTree(BalancedBinarySearchTree):
+    """
+    Class representing an AVL tree.
+
+    The heights of every node's subtrees differ by at most one, so the tree is at most about 1.44 log2(n) deep.
+    """
+
+    @property
+    def height(self) -> int:
+        """Return the number of levels in the tree."""
+        return self._height(self.root)
+
+    @staticmethod
+    def _height(node: Optional[AVLTreeNode]) -> int:
+        """Return the height of a subtree, where an empty subtree has height 0."""
+        return node.subtree_height if node is not None else 0
+
+    def _update_height(self, node: AVLTreeNode) -> None:
+        """Recalculate a node's height from its children."""
+        node.subtree_height = 1 + max(self._height(node.left), self._height(node.right))
+
+    def _rotate_left(self, node: AVLTreeNode) -> AVLTreeNode:
+        new_root = super()._rotate_left(node)
+        self._update_height(node)
+        self._update_height(new_root)
+        return new_root
+
+    def _rotate_right(self, node: AVLTreeNode) -> AVLTreeNode:
+        new_root = super()._rotate_right(node)
+        self._update_height(node)
+        self._update_height(new_root)
+        return new_root
+
+    def _rebalance(self, node: AVLTreeNode) -> AVLTreeNode:
+        """
+        Restore the AVL property at a node whose subtrees have just changed.
+
+        Returns:
+            AVLTreeNode: Root of the rebalanced subtree.
+        """
+        self._update_height(node)
+        balance = self._height(node.left) - self._height(node.right)
+        # Left heavy: rotate right, first rotating the left child left if it leans right
+        if balance > 1:
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        # Right heavy: rotate left, first rotating the right child right if it leans left
+        if balance < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def _insert(self, node: Optional[AVLTreeNode], value: int) -> AVLTreeNode:
+        """Insert a value into a subtree, returning the subtree's new root."""
+        if node is None:
+            return AVLTreeNode(value)
+        if value < node.value:
+            node.left = self._insert(node.left, value)
+        elif value > node.value:
+            node.right = self._insert(node.right, value)
+        else:
+            return node
+        return self._rebalance(node)
+
+    def _delete(self, node: Optional[AVLTreeNode], value: int) -> Optional[AVLTreeNode]:
+        """Delete a value from a subtree, returning the subtree's new root."""
+        if node is None:
+            return None
+        if value < node.value:
+            node.left = self._delete(node.left, value)
+        elif value > node.value:
+            node.right = self._delete(node.right, value)
+        else:
+            if node.left is None:
+                return node.right
+            if node.right is None:
+                return node.left
+            # Replace the value with its successor's, then delete the successor
+            node.value = self._min_node(node.right).value
+            node.right = self._delete(node.right, node.value)
+        return self._rebalance(node)
+
+
+class RedBlackTree(BalancedBinarySearchTree):
+    """
+    Class representing a left-leaning red-black tree.
+
+    Every path from the root to an empty subtree passes the same number of black nodes,
+    and red nodes are always left children with black parents, so the tree is at most 2 log2(n) deep.
+    """
+
+    @staticmethod
+    def _is_red(node: Optional[RedBlackTreeNode]) -> bool:
+        """Check if a node is red, where empty subtrees are black."""
+        return node is not None and node.red
+
+    def _rotate_left(self, node: RedBlackTreeNode) -> RedBlackTreeNode:
+        new_root = super()._rotate_left(node)
+        new_root.red = node.red
+        node.red = True
+        return new_root
+
+    def _rotate_right(self, node: RedBlackTreeNode) -> RedBlackTreeNode:
+        new_root = super()._rotate_right(node)
+        new_root.red = node.red
+        node.red = True
+        return new_root
+
+    @staticmethod
+    def _flip_colours(node: RedBlackTreeNode) -> None:
+        """Flip the colours of a node and its children."""
+        node.red = not node.red
+        node.left.red = not node.left.red
+        node.right.red = not node.right.red
+
+    def _fix_up(self, node: RedBlackTreeNode) -> RedBlackTreeNode:
+        """
+        Restore the left-leaning red-black properties at a node on the way back up from an insert or delete.
+
+        Returns:
+            RedBlackTreeNode: Root of the fixed subtree.
+        """
+        if self._is_red(node.right) and not self._is_red(node.left):
+            node = self._rotate_left(node)
+        if self._is_red(node.left) and self._is_red(node.left.left):
+            node = self._rotate_right(node)
+        if self._is_red(node.left) and self._is_red(node.right):
+            self._flip_colours(node)
+        return node
+
+    def _move_red_left(self, node: RedBlackTreeNode) -> RedBlackTreeNode:
+        """Make the left child or one of its children red, before descending left to delete."""
+        self._flip_colours(node)
+        if self._is_red(node.right.left):
+            node.right = self._rotate_right(node.right)
+            node = self._rotate_left(node)
+            self._flip_colours(node)
+        return node
+
+    def _move_red_right(self, node: RedBlackTreeNode) -> RedBlackTreeNode:
+        """Make the right child or one of its children red, before descending right to delete."""
+        self._flip_colours(node)
+        if self._is_red(node.left.left):
+            node = self._rotate_right(node)
+            self._flip_colours(node)
+        return node
+
+    def add_node(self, value: int) -> None:
+        super().add_node(value)
+        self.root.red = False
+
+    def delete(self, value: int, trace: dict = None) -> bool:
+        if not self.search(value, trace):
+            return False
+        if not self._is_red(self.root.left) and not self._is_red(self.root.right):
+            self.root.red = True
+        self.root = self._delete(self.root, value)
+        if self.root is not None:
+            self.root.red = False
+        return True
+
+    def _insert(self, node: Optional[RedBlackTreeNode], value: int) -> RedBlackTreeNode:
+        """Insert a value into a subtree, returning the subtree's new root."""
+        if node is None:
+            return RedBlackTreeNode(value)
+        if value < node.value:
+            node.left = self._insert(node.left, value)
+        elif value > node.value:
+            node.right = self._insert(node.right, value)
+        else:
+            return node
+        return self._fix_up(node)
+
+    def _delete_min(self, node: RedBlackTreeNode) -> Optional[RedBlackTreeNode]:
+        """Delete the smallest value from a subtree, returning the subtree's new root."""
+        if node.left is None:
+            return None
+        if not self._is_red(node.left) and not self._is_red(node.left.left):
+            node = self._move_red_left(node)
+        node.left = self._delete_min(node.left)
+        return self._fix_up(node)
+
+    def _delete(self, node: RedBlackTreeNode, value: int) -> Optional[RedBlackTreeNode]:
+        """Delete a value known to be in a subtree, returning the subtree's new root."""
+        if value < node.value:
+            if not self._is_red(node.left) and not self._is_red(node.left.left):
+                node = self._move_red_left(node)
+            node.left = self._delete(node.left, value)
+        else:
+            if self._is_red(node.left):
+                node = self._rotate_right(node)
+            if value == node.value and node.right is None:
+                return None
+            if not self._is_red(node.right) and not self._is_red(node.right.left):
+                node = self._move_red_right(node)
+            if value == node.value:
+                # Replace the value with its successor's, then delete the successor
+                node.value = self._min_node(node.right).value
+                node.right = self._delete_min(node.right)
+            else:
+                node.right = self._delete(node.right, value)
+        return self._fix_up(node)
+
+    def _node_colour(self, node: RedBlackTreeNode) -> str:
+        return "red" if node.red else "black"
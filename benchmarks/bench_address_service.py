@@ -0,0 +1,71 @@
+from address_fetcher import AddressCache, AddressService
+from pathlib import Path
+from tests.geocoding_stub import GeocodingStub
+from typing import List
+import argparse
+import tempfile
+import time
+
+"""
+Measures AddressService throughput against a local stub of the geocoding API, and checks the rate limit holds
+
+Run from the project folder:
+    python -m benchmarks.bench_address_service
+"""
+
+
+def peak_rate(request_times: List[float], window: float = 1.0) -> int:
+    """Return the most requests which arrived within any window of the given length in seconds."""
+    peak, start = 0, 0
+    for end, request_time in enumerate(request_times):
+        while request_time - request_times[start] > window:
+            start += 1
+        peak = max(peak, end - start + 1)
+    return peak
+
+
+def run(
+    addresses: int, workers: int, rate: float, burst: int, latency: float, failures: int
+) -> None:
+    """Look up a batch of distinct addresses, printing the throughput and request rate seen by the API."""
+    with tempfile.TemporaryDirectory() as temp_dir, GeocodingStub(
+        delay=latency, failures=failures
+    ) as stub:
+        service = AddressService(
+            AddressCache(Path(temp_dir) / "address_cache.db"),
+            api_url=stub.url("/flaky" if failures else "/slow"),
+            workers=workers,
+            rate=rate,
+            burst=burst,
+            backoff=0,
+        )
+        batch = [(house_number, "AB1 2CD") for house_number in range(addresses)]
+        start_time = time.perf_counter()
+        results = service.lookup_batch(batch)
+        elapsed = time.perf_counter() - start_time
+        service.close()
+        request_times = sorted(stub.request_times)
+    found = sum(result["result"] for result in results)
+    # The bucket starts full, so the first second may also use the burst
+    allowed = rate + burst
+    peak = peak_rate(request_times)
+    print(
+        f"workers={workers:<3} rate={rate:<5g} burst={burst:<3} failures={failures:<4} "
+        f"found={found}/{addresses}  requests={len(request_times):<5} "
+        f"{addresses / elapsed:7.1f} lookups/s  peak={peak} req/s (allowed {allowed:g})"
+        + ("" if peak <= allowed else "  OVER LIMIT")
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark address lookups.")
+    parser.add_argument("--addresses", type=int, default=200)
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Seconds the stub takes to answer."
+    )
+    args = parser.parse_args()
+    # Throughput is limited by latency with few workers, then by the rate limit
+    for workers, rate, burst in ((1, 1000, 5), (4, 1000, 5), (16, 1000, 5), (4, 50, 5)):
+        run(args.addresses, workers, rate, burst, args.latency, 0)
+    # Retries of failed requests must stay within the rate limit too
+    run(args.addresses, 4, 50, 5, args.latency, args.addresses // 2)
@@ -0,0 +1,67 @@
+from balanced_trees import AVLTree, RedBlackTree
+from binary_search_tree import BinarySearchTree
+from typing import List
+import argparse
+import random
+import time
+
+"""
+Compares AVL and red-black trees with a plain binary search tree: insert, search and delete times, heights and rotations
+
+Run from the project folder:
+    python -m benchmarks.bench_balanced_trees
+"""
+
+
+def run(tree_class: type, name: str, values: List[int]) -> None:
+    """Insert, search for and delete half of a list of values, printing the times, height and rotations."""
+    tree = tree_class()
+    start_time = time.perf_counter()
+    tree.build_tree(values)
+    insert_time = time.perf_counter() - start_time
+    height = tree.height
+    insert_rotations = tree.rotations
+    start_time = time.perf_counter()
+    for value in values:
+        tree.search(value)
+    search_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    for value in values[::2]:
+        tree.delete(value)
+    delete_time = time.perf_counter() - start_time
+    print(
+        f"  {name:<20} insert {insert_time * 1000:8.1f}ms  search {search_time * 1000:8.1f}ms  "
+        f"delete half {delete_time * 1000:8.1f}ms  height {height:<6} "
+        f"rotations {insert_rotations} + {tree.rotations - insert_rotations}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark balanced trees.")
+    parser.add_argument("--values", type=int, default=100000)
+    parser.add_argument(
+        "--unbalanced-values",
+        type=int,
+        default=3000,
+        help="Sorted values given to the plain binary search tree, which takes quadratic time.",
+    )
+    args = parser.parse_args()
+    random_values = random.sample(range(args.values * 10), args.values)
+    print(f"Random, {args.values} values")
+    for tree_class, name in (
+        (BinarySearchTree, "Binary search tree"),
+        (AVLTree, "AVL tree"),
+        (RedBlackTree, "Red-black tree"),
+    ):
+        run(tree_class, name, random_values)
+    # Sorted values are the worst case for a plain tree, and cause the most rotations in balanced trees
+    print(f"Sorted, {args.values} values")
+    for tree_class, name in ((AVLTree, "AVL tree"), (RedBlackTree, "Red-black tree")):
+        run(tree_class, name, list(range(args.values)))
+    print(f"Sorted, {args.unbalanced_values} values")
+    for tree_class, name in (
+        (BinarySearchTree, "Binary search tree"),
+        (AVLTree, "AVL tree"),
+        (RedBlackTree, "Red-black tree"),
+    ):
+        run(tree_class, name, list(range(args.unbalanced_values)))
@@ -0,0 +1,86 @@
+from data_handler import DataHandler
+from database_access import Database
+from pathlib import Path
+from sessions import SessionStore
+import argparse
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+"""
+Measures how request latency, memory sampling and thread count scale with the number of sessions studying at once
+
+Run from the project folder:
+    python -m benchmarks.bench_sessions
+"""
+
+
+def create_pack(db: Database, card_count: int) -> int:
+    """Create a pack of integer cards, returning its ID."""
+    cards = [
+        {
+            "question": f"What is {number} + {number}?",
+            "answer": str(number * 2),
+            "points": 1,
+            "question_type": "Integer",
+        }
+        for number in range(card_count)
+    ]
+    return db.create_flashcard_pack("Doubling", cards, 1)
+
+
+def run(db: Database, pack_id: int, session_count: int, requests: int) -> None:
+    """Start studying in many sessions, then time requests moving to the next card and sampling sizes."""
+    store = SessionStore(memory_limit=1024 * 1024 * 1024)
+    thread_count = threading.active_count()
+    start_time = time.perf_counter()
+    sessions = []
+    for _ in range(session_count):
+        session = store.add()
+        DataHandler(db, session).load_pack_data(pack_id)
+        sessions.append(session)
+    setup_time = time.perf_counter() - start_time
+    # Each request is handled as the study service does, holding the session while it runs
+    latencies = []
+    for session in random.choices(sessions, k=requests):
+        start_time = time.perf_counter()
+        store.acquire(session.session_id)
+        handler = DataHandler(db, session)
+        if not handler.next_card_info:
+            handler.load_pack_data(pack_id)
+        store.release(session)
+        latencies.append(time.perf_counter() - start_time)
+    start_time = time.perf_counter()
+    store.sample_sizes()
+    sample_time = time.perf_counter() - start_time
+    usage = store.memory_usage()
+    latencies.sort()
+    print(
+        f"sessions={session_count:<6} setup={setup_time * 1000 / session_count:6.2f}ms/session  "
+        f"request mean={statistics.mean(latencies) * 1000:6.3f}ms "
+        f"p99={latencies[int(0.99 * len(latencies))] * 1000:6.3f}ms  "
+        f"sample={sample_time * 1000:8.1f}ms  "
+        f"memory={usage['total_bytes'] / session_count / 1024:6.1f}KiB/session  "
+        f"threads=+{threading.active_count() - thread_count}"
+    )
+    for session in sessions:
+        store.remove(session.session_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark session scaling.")
+    parser.add_argument("--cards", type=int, default=20, help="Cards in the pack.")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument(
+        "--sessions", type=int, nargs="+", default=[10, 100, 1000, 5000]
+    )
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = Database(Path(temp_dir) / "study_tool_db.db")
+        db.check_database()
+        pack_id = create_pack(db, args.cards)
+        # Request latency and threads should stay flat as sessions grow, and sampling grow linearly
+        for session_count in args.sessions:
+            run(db, pack_id, session_count, args.requests)
@@ -0,0 +1,93 @@
+from binary_search_tree import BinarySearchTree, BinarySearchTreeNode
+from merge_sort import MergeSort
+from typing import Callable, List, Optional
+import argparse
+import random
+import time
+import tracemalloc
+
+"""
+Measures building balanced binary search trees of a million keys, from unsorted, sorted and streamed values
+
+Run from the project folder:
+    python -m benchmarks.bench_tree_build
+"""
+
+
+def build_from_slices(values: List[int]) -> Optional[BinarySearchTreeNode]:
+    """Build a balanced subtree by copying slices at every level, as trees were built before index ranges."""
+    if not values:
+        return None
+    mid_index = len(values) // 2
+    root = BinarySearchTreeNode(values[mid_index])
+    root.left = build_from_slices(values[:mid_index])
+    root.right = build_from_slices(values[mid_index + 1 :])
+    return root
+
+
+def run(name: str, build: Callable[[BinarySearchTree], None], memory: bool) -> list:
+    """Build a tree, printing the time taken and optionally the peak memory, and return its pre-order traversal."""
+    tree = BinarySearchTree()
+    if memory:
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    build(tree)
+    elapsed = time.perf_counter() - start_time
+    line = f"  {name:<42} {elapsed:6.2f}s  height {tree.height}"
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        line += f"  peak {peak / 1024 / 1024:6.1f}MiB"
+    print(line)
+    return tree.pre_order_traversal()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark building balanced trees.")
+    parser.add_argument("--values", type=int, default=10**6)
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Also measure peak memory, which slows every build.",
+    )
+    args = parser.parse_args()
+    count = args.values
+    sorted_values = list(range(count))
+    shuffled_values = random.sample(sorted_values, count)
+    print(f"{count} values")
+    builds = [
+        (
+            "merge sort, then slices (previous build)",
+            lambda tree: setattr(
+                tree,
+                "root",
+                build_from_slices(MergeSort.sort(list(set(shuffled_values)))),
+            ),
+        ),
+        (
+            "sorted(), then slices",
+            lambda tree: setattr(
+                tree, "root", build_from_slices(sorted(set(shuffled_values)))
+            ),
+        ),
+        (
+            "build_balanced_tree, shuffled list",
+            lambda tree: tree.build_balanced_tree(shuffled_values),
+        ),
+        (
+            "build_balanced_tree, sorted list",
+            lambda tree: tree.build_balanced_tree(sorted_values),
+        ),
+        (
+            "build_from_sorted, list",
+            lambda tree: tree.build_from_sorted(sorted_values),
+        ),
+        (
+            "build_from_sorted, iterator with count",
+            lambda tree: tree.build_from_sorted(iter(range(count)), count),
+        ),
+    ]
+    traversals = [run(name, build, args.memory) for name, build in builds]
+    # Every build must give the same shape
+    if any(traversal != traversals[0] for traversal in traversals):
+        raise AssertionError("Builds gave different trees")
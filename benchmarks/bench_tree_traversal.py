@@ -0,0 +1,114 @@
+from binary_search_tree import BinarySearchTree, BinarySearchTreeNode
+from typing import Callable, List, Optional
+import argparse
+import random
+import time
+
+"""
+Measures iterative insertion and traversal of binary search trees against recursive versions
+
+Run from the project folder:
+    python -m benchmarks.bench_tree_traversal
+"""
+
+
+# Recursive versions, as the tree was built and traversed before insertion and traversal used loops
+def add_node_recursive(node: BinarySearchTreeNode, value: int) -> None:
+    if value < node.value:
+        if node.left is None:
+            node.left = BinarySearchTreeNode(value)
+        else:
+            add_node_recursive(node.left, value)
+    elif value > node.value:
+        if node.right is None:
+            node.right = BinarySearchTreeNode(value)
+        else:
+            add_node_recursive(node.right, value)
+
+
+def build_tree_recursive(values: List[int]) -> BinarySearchTree:
+    tree = BinarySearchTree()
+    tree.root = BinarySearchTreeNode(values[0])
+    for value in values[1:]:
+        add_node_recursive(tree.root, value)
+    return tree
+
+
+def pre_order_recursive(node: Optional[BinarySearchTreeNode]) -> List[int]:
+    if node is None:
+        return []
+    return (
+        [node.value] + pre_order_recursive(node.left) + pre_order_recursive(node.right)
+    )
+
+
+def in_order_recursive(node: Optional[BinarySearchTreeNode]) -> List[int]:
+    if node is None:
+        return []
+    return in_order_recursive(node.left) + [node.value] + in_order_recursive(node.right)
+
+
+def post_order_recursive(node: Optional[BinarySearchTreeNode]) -> List[int]:
+    if node is None:
+        return []
+    return (
+        post_order_recursive(node.left)
+        + post_order_recursive(node.right)
+        + [node.value]
+    )
+
+
+def build_tree_iterative(values: List[int]) -> BinarySearchTree:
+    tree = BinarySearchTree()
+    tree.build_tree(values)
+    return tree
+
+
+def timed(function: Callable, *args) -> tuple:
+    """Call a function, returning its result and the seconds taken, or None if it ran out of stack."""
+    start_time = time.perf_counter()
+    try:
+        result = function(*args)
+    except RecursionError:
+        return None, None
+    return result, time.perf_counter() - start_time
+
+
+def format_time(seconds: Optional[float]) -> str:
+    return "recursion limit" if seconds is None else f"{seconds * 1000:9.1f}ms"
+
+
+def run(name: str, values: List[int]) -> None:
+    """Build and traverse a tree both ways, checking the traversals match and printing the times."""
+    print(f"{name}, {len(values)} values")
+    tree, iterative_time = timed(build_tree_iterative, values)
+    recursive_tree, recursive_time = timed(build_tree_recursive, values)
+    print(
+        f"  {'insert':<11} iterative {format_time(iterative_time)}  recursive {format_time(recursive_time)}"
+    )
+    traversals = (
+        ("pre-order", tree.pre_order_traversal, pre_order_recursive),
+        ("in-order", tree.in_order_traversal, in_order_recursive),
+        ("post-order", tree.post_order_traversal, post_order_recursive),
+    )
+    for order, iterative, recursive in traversals:
+        iterative_result, iterative_time = timed(iterative)
+        recursive_result, recursive_time = timed(recursive, tree.root)
+        if recursive_result is not None and recursive_result != iterative_result:
+            raise AssertionError(f"{order} traversals differ")
+        print(
+            f"  {order:<11} iterative {format_time(iterative_time)}  recursive {format_time(recursive_time)}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark tree insertion and traversal."
+    )
+    parser.add_argument("--random-values", type=int, default=200000)
+    parser.add_argument("--sorted-values", type=int, default=5000)
+    args = parser.parse_args()
+    # Random values give a tree of logarithmic height, where both versions work
+    run("Random", random.sample(range(args.random_values * 10), args.random_values))
+    # Sorted values give a tree as tall as it is large, which only the iterative version can build
+    run("Sorted", list(range(args.sorted_values)))
@@ -0,0 +1,224 @@
+from database_access import Database
+from pathlib import Path
+from study_service import StudyService
+from typing import Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import tempfile
+import threading
+import time
+
+"""
+Load tests StudyService, running concurrent students against a local server and reporting latency and throughput
+
+Each student signs in, then studies their pack, views their library and leaderboard and draws a tree each round.
+
+Run from the project folder:
+    python -m benchmarks.load_test_service
+"""
+
+PASSWORD = "Password1!"
+# Questions and answers of the pack each student studies
+CARDS = {f"What is {number} + {number}?": str(number * 2) for number in range(10)}
+
+
+def create_students(db: Database, students: int) -> None:
+    """Create accounts for the students, each with a pack of CARDS in their library."""
+    address = {"postcode": "AB12CD", "city": "Testville", "country": "UK"}
+    cards = [
+        {
+            "question": question,
+            "answer": answer,
+            "points": 1,
+            "question_type": "Integer",
+        }
+        for question, answer in CARDS.items()
+    ]
+    for student in range(students):
+        username = f"student{student}"
+        db.create_account(username, PASSWORD, "Sam", f"{username}@example.com", address)
+        with db.transaction() as cur:
+            cur.execute("SELECT UID FROM Users WHERE Username = ?;", (username,))
+            UID = cur.fetchone()[0]
+        db.create_flashcard_pack("Doubling", cards, UID)
+
+
+def free_port() -> int:
+    """Return a port no other program is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_service(service: StudyService, port: int) -> None:
+    """Serve on a thread with its own event loop, so the students don't share the server's loop."""
+    threading.Thread(
+        target=asyncio.run, args=(service.serve("127.0.0.1", port),), daemon=True
+    ).start()
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port)).close()
+            return
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+class Client:
+    """One student's keep-alive connection, recording the latency of each route."""
+
+    def __init__(self, latencies: Dict[str, List[float]], errors: List[str]) -> None:
+        self._latencies = latencies
+        self._errors = errors
+        self._reader = self._writer = None
+        self.token = ""
+
+    async def connect(self, port: int) -> None:
+        self._reader, self._writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def request(
+        self, method: str, path: str, body: Optional[dict] = None
+    ) -> Tuple[int, bytes]:
+        """Send a request and read its response, returning the status and body."""
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: 127.0.0.1\r\n"
+            f"Authorization: Bearer {self.token}\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n"
+        )
+        start_time = time.perf_counter()
+        self._writer.write(head.encode("latin-1") + payload)
+        await self._writer.drain()
+        status = int((await self._reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        response = await self._reader.readexactly(length)
+        self._latencies.setdefault(f"{method} {path}", []).append(
+            time.perf_counter() - start_time
+        )
+        if status >= 400:
+            self._errors.append(f"{method} {path} -> {status}")
+        return status, response
+
+
+async def run_student(
+    student: int, port: int, rounds: int, latencies: dict, errors: list
+) -> None:
+    """Sign a student in, study for a number of rounds, then sign out."""
+    client = Client(latencies, errors)
+    await client.connect(port)
+    try:
+        status, response = await client.request(
+            "POST", "/sessions", {"username": f"student{student}", "password": PASSWORD}
+        )
+        if status != 201:
+            return
+        client.token = json.loads(response)["token"]
+        for _ in range(rounds):
+            _, response = await client.request("GET", "/library")
+            pack_id = json.loads(response)["packs"][0]["pack_id"]
+            await client.request("POST", "/study", {"pack_id": pack_id})
+            while True:
+                _, response = await client.request("GET", "/study/next")
+                card = json.loads(response)["card"]
+                if card is None:
+                    break
+                answer = CARDS[card["question"]]
+                await client.request("POST", "/study/answer", {"answer": answer})
+            await client.request("POST", "/study/finish")
+            await client.request("GET", "/leaderboard")
+            values = ",".join(str(random.randint(0, 999)) for _ in range(15))
+            await client.request(
+                "POST",
+                "/trees",
+                {"values": values, "balanced": True, "tree_type": "AVL tree"},
+            )
+        await client.request("DELETE", "/sessions")
+    finally:
+        await client.close()
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Return the value below which the given fraction of sorted values fall."""
+    return sorted_values[
+        min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    ]
+
+
+def report(
+    latencies: Dict[str, List[float]], errors: List[str], elapsed: float
+) -> None:
+    """Print each route's latency percentiles and the overall throughput."""
+    print(
+        f"{'route':<22}{'count':>7}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    )
+    for route, times in sorted(latencies.items()):
+        times = sorted(times)
+        print(
+            f"{route:<22}{len(times):>7}"
+            + "".join(
+                f"{value * 1000:>9.1f}"
+                for value in (
+                    statistics.mean(times),
+                    percentile(times, 0.5),
+                    percentile(times, 0.95),
+                    percentile(times, 0.99),
+                    times[-1],
+                )
+            )
+        )
+    total = sum(len(times) for times in latencies.values())
+    print(
+        f"{total} requests in {elapsed:.2f}s: {total / elapsed:.1f} requests/s, "
+        f"{len(errors)} errors (latencies in ms)"
+    )
+    for error in sorted(set(errors)):
+        print(f"  {error} x{errors.count(error)}")
+
+
+async def run(port: int, students: int, rounds: int) -> None:
+    """Run every student at once against the service on a port, then print the report."""
+    latencies, errors = {}, []
+    start_time = time.perf_counter()
+    await asyncio.gather(
+        *(
+            run_student(student, port, rounds, latencies, errors)
+            for student in range(students)
+        )
+    )
+    report(latencies, errors, time.perf_counter() - start_time)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the study service.")
+    parser.add_argument("--students", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--workers", type=int, default=16, help="Threads running blocking work."
+    )
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = Database(Path(temp_dir) / "study_tool_db.db", pool_size=args.workers)
+        db.check_database()
+        print(f"Creating {args.students} students...")
+        create_students(db, args.students)
+        port = free_port()
+        start_service(StudyService(db, args.workers), port)
+        asyncio.run(run(port, args.students, args.rounds))
@@ -1,36 +1,31 @@
-from anytree import NodeMixin
-from anytree.exporter import DotExporter
-from pathlib import Path
-from merge_sort import MergeSort
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple
+import itertools
 
 """
 Generates binary search trees alongside their traversals
 """
 
 
-class BinarySearchTreeNode(NodeMixin):
-    """Class representing nodes in a binary search tree."""
+class BinarySearchTreeNode:
+    """
+    Class representing nodes in a binary search tree.
 
-    def __init__(self, value: int, parent: "BinarySearchTreeNode" = None) -> None:
+    Nodes only hold a value and their two children, in slots rather than a __dict__, so large trees stay small.
+    """
+
+    __slots__ = ("value", "left", "right")
+
+    def __init__(self, value: int) -> None:
         """
-        Initialise a BinarySearchTreeNode object.
+        Initialise a BinarySearchTreeNode object as a leaf.
 
         Arguments:
             value (int): Value of the node.
-            parent (BinarySearchTreeNode): Reference to the parent node. Defaults to None.
         """
-        super().__init__()
         self.value = value
-        self.parent = parent
         self.left = None
         self.right = None
 
-    @property
-    def children(self) -> List["BinarySearchTreeNode"]:
-        """Return a list of children nodes."""
-        return [node for node in (self.left, self.right) if node is not None]
-
 
 class BinarySearchTree:
     """Class representing a binary search tree."""
@@ -38,62 +33,384 @@ class BinarySearchTree:
     def __init__(self) -> None:
         """Initialise an empty binary search tree."""
         self.root = None
+        # Rotations made to rebalance the tree, always 0 as a plain binary search tree never rebalances
+        self.rotations = 0
 
     def add_node(self, value: int) -> None:
         """
-        Add a node to the tree.
+        Add a node to the tree. Values already in the tree are ignored.
+
+        The tree is navigated with a loop rather than recursion, so unbalanced trees
+        (such as those built from sorted values) can be any depth.
 
         Arguments:
             value (int): Value to be assigned to the node attribute.
         """
         if not self.root:
             self.root = BinarySearchTreeNode(value)
+            return
+        current_node = self.root
+        while True:
+            if value < current_node.value:
+                if current_node.left is None:
+                    current_node.left = BinarySearchTreeNode(value)
+                    return
+                current_node = current_node.left
+            elif value > current_node.value:
+                if current_node.right is None:
+                    current_node.right = BinarySearchTreeNode(value)
+                    return
+                current_node = current_node.right
+            else:
+                return
+
+    def build_tree(self, values: List[int]) -> None:
+        """Build a tree from a list of values."""
+        for value in values:
+            self.add_node(value)
+
+    # Queries accept an optional trace dictionary, which is filled with the steps taken:
+    #     - 'visited' (List[int]): Values of the nodes visited, in order.
+    #     - 'comparisons' (int): Number of value comparisons made.
+    # Each query has a separate loop for tracing, so queries without a trace do no extra work per node.
+    @staticmethod
+    def _reset_trace(trace: dict) -> None:
+        """Clear a trace dictionary before a query fills it."""
+        trace["visited"] = []
+        trace["comparisons"] = 0
+
+    def _find(
+        self, value: int, trace: dict = None
+    ) -> Tuple[Optional[BinarySearchTreeNode], Optional[BinarySearchTreeNode]]:
+        """
+        Find the node holding a value.
+
+        Returns:
+            Tuple[Optional[BinarySearchTreeNode], Optional[BinarySearchTreeNode]]: The node's parent, and the node
+                                                                                 (None if the value is not in the tree).
+        """
+        parent_node, current_node = None, self.root
+        if trace is None:
+            while current_node is not None and current_node.value != value:
+                parent_node = current_node
+                if value < current_node.value:
+                    current_node = current_node.left
+                else:
+                    current_node = current_node.right
+            return parent_node, current_node
+        while current_node is not None:
+            trace["visited"].append(current_node.value)
+            trace["comparisons"] += 1
+            if current_node.value == value:
+                break
+            trace["comparisons"] += 1
+            parent_node = current_node
+            if value < current_node.value:
+                current_node = current_node.left
+            else:
+                current_node = current_node.right
+        return parent_node, current_node
+
+    def _extreme(
+        self, node: BinarySearchTreeNode, direction: str, trace: dict = None
+    ) -> Tuple[Optional[BinarySearchTreeNode], BinarySearchTreeNode]:
+        """
+        Follow left or right children from a node as far as possible.
+
+        Arguments:
+            node (BinarySearchTreeNode): Node to start from.
+            direction (str): "left" for the smallest value, or "right" for the largest.
+            trace (dict): Optional. Filled with the steps taken.
+
+        Returns:
+            Tuple[Optional[BinarySearchTreeNode], BinarySearchTreeNode]: The last node's parent (None if it is the
+                                                                       starting node), and the last node.
+        """
+        parent_node = None
+        if trace is None:
+            while getattr(node, direction) is not None:
+                parent_node, node = node, getattr(node, direction)
+            return parent_node, node
+        trace["visited"].append(node.value)
+        while getattr(node, direction) is not None:
+            parent_node, node = node, getattr(node, direction)
+            trace["visited"].append(node.value)
+        return parent_node, node
+
+    def search(self, value: int, trace: dict = None) -> bool:
+        """
+        Check if a value is in the tree.
+
+        Arguments:
+            value (int): Value to search for.
+            trace (dict): Optional. Filled with the steps taken.
+
+        Returns:
+            bool: True if the value is in the tree, otherwise False.
+        """
+        if trace is not None:
+            self._reset_trace(trace)
+        return self._find(value, trace)[1] is not None
+
+    def delete(self, value: int, trace: dict = None) -> bool:
+        """
+        Delete a value from the tree.
+
+        Arguments:
+            value (int): Value to delete.
+            trace (dict): Optional. Filled with the steps taken to find the value, and its successor if needed.
+
+        Returns:
+            bool: True if the value was in the tree, otherwise False.
+        """
+        if trace is not None:
+            self._reset_trace(trace)
+        parent_node, current_node = self._find(value, trace)
+        if current_node is None:
+            return False
+        # A node with two children takes its successor's value, and the successor is removed instead
+        if current_node.left is not None and current_node.right is not None:
+            successor_parent, successor = self._extreme(
+                current_node.right, "left", trace
+            )
+            parent_node = successor_parent or current_node
+            current_node.value = successor.value
+            current_node = successor
+        # The removed node has at most one child, which takes its place
+        child = (
+            current_node.left if current_node.left is not None else current_node.right
+        )
+        if parent_node is None:
+            self.root = child
+        elif parent_node.left is current_node:
+            parent_node.left = child
         else:
-            self._add_node_recursive(self.root, value)
+            parent_node.right = child
+        return True
 
-    def _add_node_recursive(
-        self, current_node: BinarySearchTreeNode, value: int
-    ) -> None:
+    def minimum(self, trace: dict = None) -> Optional[int]:
         """
-        Recursively navigate the tree to correctly insert a new node.
+        Return the smallest value in the tree, otherwise None if the tree is empty.
 
         Arguments:
-            current_node (BinarySearchTreeNode): Current node for recursive process.
-            value (int): Value to be assigned to the new node.
+            trace (dict): Optional. Filled with the steps taken.
         """
-        if value < current_node.value:
-            if current_node.left is None:
-                current_node.left = BinarySearchTreeNode(value, parent=current_node)
-            else:
-                self._add_node_recursive(current_node.left, value)
-        elif value > current_node.value:
-            if current_node.right is None:
-                current_node.right = BinarySearchTreeNode(value, parent=current_node)
-            else:
-                self._add_node_recursive(current_node.right, value)
+        if trace is not None:
+            self._reset_trace(trace)
+        if self.root is None:
+            return None
+        return self._extreme(self.root, "left", trace)[1].value
 
-    def build_tree(self, values: List[int]) -> None:
-        """Build a tree from a list of values."""
-        for value in values:
-            self.add_node(value)
+    def maximum(self, trace: dict = None) -> Optional[int]:
+        """
+        Return the largest value in the tree, otherwise None if the tree is empty.
+
+        Arguments:
+            trace (dict): Optional. Filled with the steps taken.
+        """
+        if trace is not None:
+            self._reset_trace(trace)
+        if self.root is None:
+            return None
+        return self._extreme(self.root, "right", trace)[1].value
 
-    def render_as_image(self, filename: str = "binary_search_tree") -> Path:
+    def successor(self, value: int, trace: dict = None) -> Optional[int]:
         """
-        Export the tree as a PNG image using DotExporter.
+        Return the smallest value in the tree greater than a value, which need not be in the tree.
 
         Arguments:
-            filename: Name of the image file. Defaults to "binary_search_tree".
+            value (int): Value to find the successor of.
+            trace (dict): Optional. Filled with the steps taken.
 
         Returns:
-            Path: File path where the image was saved.
+            Optional[int]: The successor, otherwise None if no value in the tree is greater.
         """
-        if not self.root:
+        successor, current_node = None, self.root
+        if trace is None:
+            while current_node is not None:
+                # Greater values are candidates, and any closer successor is to their left
+                if value < current_node.value:
+                    successor, current_node = current_node.value, current_node.left
+                else:
+                    current_node = current_node.right
+            return successor
+        self._reset_trace(trace)
+        while current_node is not None:
+            trace["visited"].append(current_node.value)
+            trace["comparisons"] += 1
+            if value < current_node.value:
+                successor, current_node = current_node.value, current_node.left
+            else:
+                current_node = current_node.right
+        return successor
+
+    def range_query(self, low: int, high: int, trace: dict = None) -> Iterator[int]:
+        """
+        Yield the values between low and high (inclusive) in ascending order, only visiting subtrees which can hold them.
+
+        Arguments:
+            low (int): Smallest value to yield.
+            high (int): Largest value to yield.
+            trace (dict): Optional. Filled with the steps taken, as values are yielded.
+
+        Yields:
+            int: Values in the range.
+        """
+        if trace is not None:
+            yield from self._range_query_traced(low, high, trace)
             return
-        file_path = Path.cwd() / "assets" / f"{filename}.png"
-        DotExporter(self.root, nodenamefunc=lambda n: str(n.value)).to_picture(
-            file_path
-        )
-        return file_path
+        stack, current_node = [], self.root
+        while stack or current_node is not None:
+            # Descend left while smaller values could still be in range
+            while current_node is not None:
+                stack.append(current_node)
+                current_node = current_node.left if low < current_node.value else None
+            current_node = stack.pop()
+            if current_node.value > high:
+                return
+            if current_node.value >= low:
+                yield current_node.value
+            current_node = current_node.right
+
+    def _range_query_traced(self, low: int, high: int, trace: dict) -> Iterator[int]:
+        """Yield the values between low and high as in range_query, recording the steps taken."""
+        self._reset_trace(trace)
+        stack, current_node = [], self.root
+        while stack or current_node is not None:
+            while current_node is not None:
+                stack.append(current_node)
+                trace["visited"].append(current_node.value)
+                trace["comparisons"] += 1
+                current_node = current_node.left if low < current_node.value else None
+            current_node = stack.pop()
+            trace["comparisons"] += 1
+            if current_node.value > high:
+                return
+            trace["comparisons"] += 1
+            if current_node.value >= low:
+                yield current_node.value
+            current_node = current_node.right
+
+    @property
+    def height(self) -> int:
+        """Return the number of levels in the tree, counted level by level rather than recursively."""
+        height = 0
+        level = [self.root] if self.root is not None else []
+        while level:
+            height += 1
+            level = [
+                child
+                for node in level
+                for child in (node.left, node.right)
+                if child is not None
+            ]
+        return height
+
+    def _node_colour(self, node: BinarySearchTreeNode) -> str:
+        """Return the colour to draw a node in."""
+        return "black"
+
+    def render(self, size: int = 500) -> Optional[bytes]:
+        """
+        Draw the tree as a PNG image in memory.
+
+        Arguments:
+            size (int): Length of the image's longer side in pixels. Defaults to 500.
+
+        Returns:
+            Optional[bytes]: The PNG image, otherwise None if the tree is empty.
+        """
+        # PIL is only needed when rendering, so is imported on first use
+        from tree_renderer import TreeRenderer
+
+        return TreeRenderer.render(self.root, size, self._node_colour)
+
+    def structure(self) -> list:
+        """
+        Describe everything drawn by render, so trees which look the same have equal descriptions.
+
+        Returns:
+            list: [value, colour] of each node in pre-order, with None for each empty subtree.
+        """
+        structure = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                structure.append(None)
+                continue
+            structure.append([node.value, self._node_colour(node)])
+            stack.append(node.right)
+            stack.append(node.left)
+        return structure
+
+    def iter_pre_order(self, node: BinarySearchTreeNode = None) -> Iterator[int]:
+        """
+        Yield node values in pre-order, using a stack rather than recursion.
+
+        Arguments:
+            node: Optional parameter, references a node object. Defaults to the root.
+
+        Yields:
+            int: Node values in order of pre-order traversal.
+        """
+        node = node if node is not None else self.root
+        stack = [node] if node is not None else []
+        while stack:
+            node = stack.pop()
+            yield node.value
+            # Right is pushed first, so left is visited first
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+
+    def iter_in_order(self, node: BinarySearchTreeNode = None) -> Iterator[int]:
+        """
+        Yield node values in-order (ascending), using a stack rather than recursion.
+
+        Arguments:
+            node: Optional parameter, references a node object. Defaults to the root.
+
+        Yields:
+            int: Node values in order of in-order traversal.
+        """
+        node = node if node is not None else self.root
+        stack = []
+        while stack or node is not None:
+            # Descend as far left as possible, then visit and move to the right subtree
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value
+            node = node.right
+
+    def iter_post_order(self, node: BinarySearchTreeNode = None) -> Iterator[int]:
+        """
+        Yield node values in post-order, using a stack rather than recursion.
+
+        Arguments:
+            node: Optional parameter, references a node object. Defaults to the root.
+
+        Yields:
+            int: Node values in order of post-order traversal.
+        """
+        node = node if node is not None else self.root
+        stack = []
+        last_visited = None
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            top = stack[-1]
+            # Visit the right subtree first, unless it is empty or has just been visited
+            if top.right is not None and top.right is not last_visited:
+                node = top.right
+            else:
+                stack.pop()
+                yield top.value
+                last_visited = top
 
     def pre_order_traversal(self, node: BinarySearchTreeNode = None) -> List[int]:
         """
@@ -105,14 +422,7 @@ class BinarySearchTree:
         Returns:
             List[int]: Node values in order of pre-order traversal.
         """
-        if node is None:
-            node = self.root
-        result = [node.value]
-        if node.left:
-            result.extend(self.pre_order_traversal(node.left))
-        if node.right:
-            result.extend(self.pre_order_traversal(node.right))
-        return result
+        return list(self.iter_pre_order(node))
 
     def in_order_traversal(self, node: BinarySearchTreeNode = None) -> List[int]:
         """
@@ -124,15 +434,7 @@ class BinarySearchTree:
         Returns:
             List[int]: Node values in order of in-order traversal.
         """
-        if node is None:
-            node = self.root
-        result = []
-        if node.left:
-            result.extend(self.in_order_traversal(node.left))
-        result.append(node.value)
-        if node.right:
-            result.extend(self.in_order_traversal(node.right))
-        return result
+        return list(self.iter_in_order(node))
 
     def post_order_traversal(self, node: BinarySearchTreeNode = None) -> List[int]:
         """
@@ -144,42 +446,91 @@ class BinarySearchTree:
         Returns:
             List[int]: Node values in order of post-order traversal.
         """
-        if node is None:
-            node = self.root
-        result = []
-        if node.left:
-            result.extend(self.post_order_traversal(node.left))
-        if node.right:
-            result.extend(self.post_order_traversal(node.right))
-        result.append(node.value)
-        return result
+        return list(self.iter_post_order(node))
 
-    def build_balanced_tree(self, values: List[int]) -> None:
+    def build_balanced_tree(self, values: Iterable[int]) -> None:
         """
-        Build a balanced tree from a sorted list of values.
+        Build a balanced tree from values in any order. Duplicate values are ignored.
+
+        Values are sorted once, and not at all if they are already in ascending order.
 
         Arguments:
-            values (List[int]): Sorted list of values.
+            values (Iterable[int]): Values for the tree.
         """
-        values = list(set(values))
-        sorted_values = MergeSort.sort(values)
-        self.root = self._build_balanced_tree_recursive(sorted_values)
+        values = list(values)
+        if not all(a < b for a, b in zip(values, itertools.islice(values, 1, None))):
+            values = sorted(set(values))
+        self.root = self._build_balanced_range(values, 0, len(values))
 
-    def _build_balanced_tree_recursive(self, values: List[int]) -> BinarySearchTreeNode:
+    def _build_balanced_range(
+        self, values: List[int], low: int, high: int
+    ) -> Optional[BinarySearchTreeNode]:
         """
-        Recursive method for building a balanced tree from a sorted list of values.
+        Recursively build a balanced subtree from a range of a sorted list, without copying the list.
 
         Arguments:
             values (List[int]): Sorted list of values.
+            low (int): Index of the first value in the range.
+            high (int): Index after the last value in the range.
 
         Returns:
-            BinarySearchTreeNode: Root node of the balanced tree.
+            Optional[BinarySearchTreeNode]: Root node of the subtree, otherwise None if the range is empty.
         """
-        if not values:
+        if low >= high:
             return None
-        mid_index = len(values) // 2
-        root_value = values[mid_index]
-        root = BinarySearchTreeNode(root_value)
-        root.left = self._build_balanced_tree_recursive(values[:mid_index])
-        root.right = self._build_balanced_tree_recursive(values[mid_index + 1 :])
+        mid_index = (low + high) // 2
+        root = BinarySearchTreeNode(values[mid_index])
+        root.left = self._build_balanced_range(values, low, mid_index)
+        root.right = self._build_balanced_range(values, mid_index + 1, high)
         return root
+
+    def build_from_sorted(self, values: Iterable[int], count: int = None) -> None:
+        """
+        Build a balanced tree from values in strictly ascending order, such as rows read from an ordered query.
+
+        Values are consumed one at a time in order, so an iterator is never copied into a list if its count is known.
+
+        Arguments:
+            values (Iterable[int]): Values in strictly ascending order.
+            count (int): Optional. Number of values. Defaults to None, copying the values to count them.
+
+        Raises:
+            ValueError: If the values are not in strictly ascending order, or there are fewer than count.
+        """
+        if count is None:
+            values = list(values)
+            count = len(values)
+        self.root = self._build_from_iterator(iter(values), count, None)[0]
+
+    def _build_from_iterator(
+        self, values: Iterator[int], size: int, previous_value: Optional[int]
+    ) -> Tuple[Optional[BinarySearchTreeNode], Optional[int]]:
+        """
+        Recursively build a balanced subtree of a given size, taking its values from an iterator in order.
+        The tree has the same shape as one built by _build_balanced_range.
+
+        Arguments:
+            values (Iterator[int]): Iterator of the remaining values.
+            size (int): Number of values in the subtree.
+            previous_value (Optional[int]): The last value taken, which the subtree's values must be greater than.
+
+        Returns:
+            Tuple[Optional[BinarySearchTreeNode], Optional[int]]: Root node of the subtree, and the last value taken.
+        """
+        if size == 0:
+            return None, previous_value
+        # The left subtree takes the first values, then the root, then the right subtree
+        left, previous_value = self._build_from_iterator(
+            values, size // 2, previous_value
+        )
+        value = next(values, None)
+        if value is None:
+            raise ValueError("There are fewer values than the count given.")
+        if previous_value is not None and value <= previous_value:
+            raise ValueError("Values must be in strictly ascending order.")
+        root = BinarySearchTreeNode(value)
+        root.left = left
+        root.right, previous_value = self._build_from_iterator(
+            values, size - size // 2 - 1, value
+        )
+        return root, previous_value
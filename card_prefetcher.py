@@ -0,0 +1,145 @@
+import threading
+from cards import CardPack
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Dict
+
+"""
+Prepares upcoming flashcards on a thread pool shared by every pack being studied
+"""
+
+
+class CardPrefetcher:
+    """
+    Look-ahead pipeline which prepares the next cards of a pack for display.
+
+    Up to 'depth' cards ahead of the viewer are kept formatted and ready, so moving to the next card
+    does not wait on formatting. Cards are prepared one at a time on a thread pool shared by every
+    prefetcher, so studying sessions don't each hold a thread.
+    """
+
+    # Shared thread pool, started when the first prefetcher is created
+    workers = 4
+    _shared_executor = None
+    _shared_executor_lock = threading.Lock()
+
+    def __init__(
+        self,
+        card_pack: CardPack,
+        prepare_card: Callable[[dict], dict],
+        depth: int = 3,
+        executor: Executor = None,
+    ) -> None:
+        """
+        Initialise a CardPrefetcher object and start preparing the first cards.
+
+        Arguments:
+            card_pack (CardPack): The card pack being studied.
+            prepare_card (Callable[[dict], dict]): Function formatting a card's data for display.
+            depth (int): Number of cards to prepare ahead of the viewer. Defaults to 3.
+            executor (Executor): Optional. Executor preparing the cards. Defaults to the shared thread pool.
+        """
+        self._card_pack = card_pack
+        self._prepare_card = prepare_card
+        self._depth = max(depth, 0)
+        self._executor = executor if executor is not None else self.shared_executor()
+        self._prepared = {}
+        self._next_index = 0
+        self._hits = 0
+        self._misses = 0
+        self._running = True
+        # Whether a card of this pack is queued or being prepared on the executor
+        self._scheduled = False
+        self._lock = threading.Lock()
+        with self._lock:
+            self._schedule()
+
+    @classmethod
+    def shared_executor(cls) -> ThreadPoolExecutor:
+        """Return the thread pool shared by every prefetcher, starting it on first use."""
+        with cls._shared_executor_lock:
+            if cls._shared_executor is None:
+                cls._shared_executor = ThreadPoolExecutor(
+                    max_workers=cls.workers, thread_name_prefix="prefetch"
+                )
+            return cls._shared_executor
+
+    def _next_missing_index(self) -> int:
+        """Return the index of the closest card inside the look-ahead window that isn't prepared, otherwise -1."""
+        end_index = min(self._next_index + self._depth, len(self._card_pack.cards_list))
+        for index in range(self._next_index, end_index):
+            if index not in self._prepared:
+                return index
+        return -1
+
+    def _schedule(self) -> None:
+        """Queue the next missing card for preparation, unless one is already queued. Call while holding the lock."""
+        if self._running and not self._scheduled and self._next_missing_index() != -1:
+            self._scheduled = True
+            self._executor.submit(self._prefetch_next)
+
+    def _prefetch_next(self) -> None:
+        """Prepare one card on the executor, then queue the next, so packs being studied take turns."""
+        with self._lock:
+            index = self._next_missing_index() if self._running else -1
+            if index == -1:
+                self._scheduled = False
+                return
+        # Formatting happens outside the lock so the viewer is never blocked by it
+        card = self._prepare_card(self._card_pack.card_info(index))
+        with self._lock:
+            # Discard the card if the viewer has already moved past it
+            if self._running and index >= self._next_index:
+                self._prepared[index] = card
+            self._scheduled = False
+            self._schedule()
+
+    def get_card(self, index: int) -> dict:
+        """
+        Return the prepared data for a card, preparing it immediately on a miss.
+
+        Arguments:
+            index (int): Index of the card in the card pack.
+
+        Returns:
+            dict: The card's data, formatted for display.
+        """
+        with self._lock:
+            card = self._prepared.pop(index, None)
+            if card is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            # Move the look-ahead window and drop cards behind the viewer
+            self._next_index = index + 1
+            for stale_index in [i for i in self._prepared if i < self._next_index]:
+                del self._prepared[stale_index]
+            self._schedule()
+        if card is None:
+            card = self._prepare_card(self._card_pack.card_info(index))
+        return card
+
+    def set_depth(self, depth: int) -> None:
+        """Change the number of cards prepared ahead of the viewer."""
+        with self._lock:
+            self._depth = max(depth, 0)
+            self._schedule()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the prefetch counters.
+
+        Returns:
+            Dict[str, int]:
+                - 'hits' (int): Cards which were ready when requested.
+                - 'misses' (int): Cards which had to be prepared on request.
+                - 'depth' (int): Current look-ahead depth.
+        """
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "depth": self._depth}
+
+    def stop(self) -> None:
+        """Stop preparing cards and release prepared cards."""
+        with self._lock:
+            self._running = False
+            self._prepared = {}
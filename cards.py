@@ -1,10 +1,16 @@
-from typing import Union
+from typing import Dict, List, Optional, Union
+import re
 
 """
 Contains card packs and card variants
 """
 
 
+def normalise_text(text: str) -> str:
+    """Return text in a canonical form for comparisons (case-folded, single spaced)."""
+    return " ".join(str(text).casefold().split())
+
+
 class Card:
     def __init__(self) -> None:
         """Initialise a Card object."""
@@ -69,6 +75,8 @@ class MultipleChoiceCard(Card):
             "correct": None,
             "all": [],
         }
+        # Normalised text of each choice, for constant time duplicate checks
+        self._choice_index = set()
         self._question_type = "Multiple Choice"
 
     @property
@@ -89,6 +97,11 @@ class MultipleChoiceCard(Card):
     def add_choice(self, answer: str) -> None:
         """Add an answer choice to the multiple-choice card."""
         self._answer_choices["all"].append(answer)
+        self._choice_index.add(normalise_text(answer))
+
+    def has_choice(self, answer: str) -> bool:
+        """Check if the multiple-choice card already has an answer choice (ignoring case and spacing)."""
+        return normalise_text(answer) in self._choice_index
 
     def set_answer(self, answer: str) -> None:
         """Set the correct answer of the multiple-choice card."""
@@ -107,6 +120,9 @@ class MultipleChoiceCard(Card):
         self._question = question
         self._points = points
         self._answer_choices = answers if answers is not None else self._answer_choices
+        self._choice_index = {
+            normalise_text(answer) for answer in self._answer_choices["all"]
+        }
 
 
 class RevealCard(Card):
@@ -123,6 +139,9 @@ class RevealCard(Card):
 
 
 class CardPack:
+    # Words ignored when looking for similar questions
+    _similarity_stop_words = {"a", "an", "the", "is", "are", "of", "to", "in", "what"}
+
     def __init__(self, name: str, UID: int) -> None:
         """
         Initialise a CardPack object.
@@ -135,6 +154,20 @@ class CardPack:
         self._name = name
         self._UID = UID
         self._current_card_index = -1
+        # Edits since the pack was loaded or saved. Added cards map to the order they were added in,
+        # so they can be found and removed in constant time
+        self._added_cards = {}
+        self._added_count = 0
+        self._removed_cards = []
+        self._changed_cards = {}
+        # Cards by normalised question, and by similarity key, kept up to date as cards change
+        self._question_index = {}
+        self._similarity_index = {}
+
+    @staticmethod
+    def valid_name(name: str) -> bool:
+        """Check a pack name is between 3 and 30 characters and alphanumeric (spaces allowed)."""
+        return bool(3 <= len(name) <= 30 and re.match("^[a-zA-Z0-9 ]*$", name))
 
     @property
     def name(self) -> str:
@@ -154,6 +187,142 @@ class CardPack:
             card (Card): The card object to be added to the card pack.
         """
         self._cards_list.append(card)
+        self._added_cards[card] = self._added_count
+        self._added_count += 1
+        self._index_card(card)
+
+    @classmethod
+    def _similarity_key(cls, question: str) -> str:
+        """
+        Return a key shared by questions which only differ by punctuation, word order or filler words.
+
+        Arguments:
+            question (str): The question of a card.
+        """
+        words = set(re.findall(r"[a-z0-9]+", str(question).casefold()))
+        return " ".join(sorted(words - cls._similarity_stop_words))
+
+    def _index_card(self, card: Card) -> None:
+        """Add a card to the question indexes."""
+        self._question_index.setdefault(normalise_text(card.question), []).append(card)
+        self._similarity_index.setdefault(
+            self._similarity_key(card.question), []
+        ).append(card)
+
+    def _unindex_card(self, card: Card) -> None:
+        """Remove a card from the question indexes."""
+        for index, key in (
+            (self._question_index, normalise_text(card.question)),
+            (self._similarity_index, self._similarity_key(card.question)),
+        ):
+            cards = index.get(key, [])
+            if card in cards:
+                cards.remove(card)
+            if not cards:
+                index.pop(key, None)
+
+    def has_question(self, question: str, ignore_card: Card = None) -> bool:
+        """
+        Check if a card in the pack has a question (ignoring case and spacing).
+
+        Arguments:
+            question (str): The question to look for.
+            ignore_card (Card): Optional. A card to leave out of the check, such as the card being edited.
+
+        Returns:
+            bool: True if another card has the question, otherwise False.
+        """
+        cards = self._question_index.get(normalise_text(question), [])
+        return any(card is not ignore_card for card in cards)
+
+    def similar_question(
+        self, question: str, ignore_card: Card = None
+    ) -> Optional[str]:
+        """
+        Find a card whose question is similar to a question, but not identical.
+
+        Arguments:
+            question (str): The question to look for.
+            ignore_card (Card): Optional. A card to leave out of the check, such as the card being edited.
+
+        Returns:
+            Optional[str]: The question of the similar card, otherwise None.
+        """
+        normalised_question = normalise_text(question)
+        for card in self._similarity_index.get(self._similarity_key(question), []):
+            if (
+                card is not ignore_card
+                and normalise_text(card.question) != normalised_question
+            ):
+                return card.question
+        return None
+
+    def remove_card(self, index: int) -> Card:
+        """
+        Remove a card from the card pack.
+
+        Arguments:
+            index (int): Index of the card in the card pack.
+
+        Returns:
+            Card: The removed card object.
+        """
+        card = self._cards_list.pop(index)
+        self._unindex_card(card)
+        # Cards added since the last save were never stored, so are simply forgotten
+        if card in self._added_cards:
+            del self._added_cards[card]
+        else:
+            self._changed_cards.pop(card.card_id, None)
+            self._removed_cards.append(card)
+        return card
+
+    def replace_card(self, index: int, card: Card) -> None:
+        """
+        Replace a card in the card pack with an edited card.
+
+        Arguments:
+            index (int): Index of the card in the card pack.
+            card (Card): The edited card object.
+        """
+        old_card = self._cards_list[index]
+        self._cards_list[index] = card
+        self._unindex_card(old_card)
+        self._index_card(card)
+        if old_card in self._added_cards:
+            # The edited card takes the place of the old one in the order cards were added
+            self._added_cards[card] = self._added_cards.pop(old_card)
+        else:
+            card.set_card_id(old_card.card_id)
+            self._changed_cards[old_card.card_id] = card
+
+    @property
+    def pending_changes(self) -> Dict[str, List[Card]]:
+        """
+        Return the cards edited since the pack was loaded or last saved.
+
+        Returns:
+            Dict[str, List[Card]]:
+                - 'added' (List[Card]): Cards not yet stored.
+                - 'removed' (List[Card]): Stored cards which have been removed.
+                - 'changed' (List[Card]): Stored cards which have been edited, keeping their card ID.
+        """
+        return {
+            "added": sorted(self._added_cards, key=self._added_cards.get),
+            "removed": list(self._removed_cards),
+            "changed": list(self._changed_cards.values()),
+        }
+
+    @property
+    def has_changes(self) -> bool:
+        """Check if the card pack has been edited since it was loaded or last saved."""
+        return bool(self._added_cards or self._removed_cards or self._changed_cards)
+
+    def clear_changes(self) -> None:
+        """Mark the current cards as stored, clearing tracked edits."""
+        self._added_cards = {}
+        self._removed_cards = []
+        self._changed_cards = {}
 
     @property
     def next_card(self) -> Union[dict, bool]:
@@ -164,10 +333,31 @@ class CardPack:
             dict or bool: A dictionary containing the details of the next card,
                           or False if there are no more cards.
         """
-        self._current_card_index += 1
-        if self._current_card_index == len(self._cards_list):
+        if not self.move_to_next_card():
             return False
-        card_obj = self._cards_list[self._current_card_index]
+        return self.card_info(self._current_card_index)
+
+    def move_to_next_card(self) -> bool:
+        """
+        Move to the next card in the pack without reading its data.
+
+        Returns:
+            bool: True if there is a next card, otherwise False.
+        """
+        self._current_card_index += 1
+        return self._current_card_index < len(self._cards_list)
+
+    def card_info(self, index: int) -> dict:
+        """
+        Return the data of a card without moving the current card index.
+
+        Arguments:
+            index (int): Index of the card in the card pack.
+
+        Returns:
+            dict: A dictionary containing the details of the card.
+        """
+        card_obj = self._cards_list[index]
         if card_obj.question_type == "Multiple Choice":
             answer = card_obj.answer_choices
         else:
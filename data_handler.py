@@ -1,17 +1,24 @@
 from database_access import Database
-from binary_search_tree import BinarySearchTree
 from queues import *
 from cards import *
-from graphs import *
-from address_fetcher import AddressSearch
-from PIL import Image
+from postcode_gazetteer import PostcodeGazetteer
+from card_prefetcher import CardPrefetcher
+from job_executor import JobExecutor
+from sessions import Session
+from render_cache import RenderCache
+from pathlib import Path
 from io import BytesIO
 import textwrap
 import re
 import random
 import json
-import numpy as np
-from typing import Dict, Optional, Tuple
+import math
+from typing import Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+
+# Images (PIL), graphs (networkx, matplotlib) and address lookups (requests)
+# are slow to import, so are imported on first use rather than at startup
+if TYPE_CHECKING:
+    from address_fetcher import AddressService
 
 """
 Bridges the GUI to other modules.
@@ -24,30 +31,52 @@ class DataHandler:
     Handle events and values from the GUI and perform respective operations.
     """
 
-    def __init__(self) -> None:
+    # Address service shared by every DataHandler in the process (created on first use)
+    _shared_address_service = None
+    # Trees offered by the trees demo, the first being the default
+    tree_types = ["Binary search tree", "AVL tree", "Red-black tree"]
+    # Queries the trees demo can run on a tree
+    tree_operations = ["Search", "Minimum", "Maximum", "Successor", "Range"]
+    # Length of the longer side of tree and graph images, in pixels
+    image_size = 500
+    # Tree and graph images shared by every DataHandler in the process, keyed by what they show
+    render_cache = RenderCache()
+    # Resized images, keyed by the image they were made from, their size and format
+    thumbnail_cache = RenderCache(16 * 1024 * 1024)
+
+    def __init__(self, db: Database = None, session: Session = None) -> None:
         """
         Initialise a DataHandler object, additionally instantiating a Database object.
-        """
-        self.db = Database(Path.cwd() / "database" / "study_tool_db.db")
-        # Confirm database state, correcting issues if possible
-        self.db.check_database()
+
+        Arguments:
+            db (Database): Optional. An existing, checked Database to share with other DataHandler objects,
+                           such as one per user session in the study service. Defaults to None, creating a new Database.
+            session (Session): Optional. The user state to act on, such as one held by a SessionStore.
+                               Defaults to None, creating a new Session.
+        """
+        if db is None:
+            db = Database(Path.cwd() / "database" / "study_tool_db.db")
+            # Confirm database state, correcting issues if possible
+            db.check_database()
+        self.db = db
+        self._session = session if session is not None else Session()
         self._topics_dict = self.db.get_topics_rows()
-        self._cur_UID = None
-        self._cur_first_name = ""
-        self._user_library = None
-        self._prev_file_path = None
-        self._tree = None
-        self._queue_max_size = 6
-        self._queue = None
-        self._adjacency_list = {}
-        self._adj_matrix = []
-        self._current_card_pack = None
-        self._current_card = None
-        self._correct_card_ids = []
-        self._leaderboard_data = []
-        self._topic_id = None
-        self._topic_theory_list = []
-        self._topic_page = -1
+        self._job_executor = None
+        # Postcodes are resolved offline where possible, falling back to the address service
+        self._gazetteer = PostcodeGazetteer.shared(
+            Path.cwd() / "assets" / "postcode_gazetteer.txt"
+        )
+
+    @property
+    def session(self) -> Session:
+        return self._session
+
+    @property
+    def job_executor(self) -> JobExecutor:
+        """Return the executor the GUI runs slow operations (hashing, address lookups and rendering) on."""
+        if self._job_executor is None:
+            self._job_executor = JobExecutor()
+        return self._job_executor
 
     # Account management
     def _val_create_username(self, username: str) -> List[Union[str, None]]:
@@ -155,6 +184,7 @@ class DataHandler:
     def val_create_address(self, house_number: int, postcode: str) -> dict:
         """
         Validate address for account creation. An address is valid if:
+            - The postcode is found in the offline gazetteer, or
             - Can be used with address_fetcher to retrieve a postcode, town and country
 
         Arguments:
@@ -173,12 +203,74 @@ class DataHandler:
                 "err_msg"
             ] = "Please ensure to meet the following criteria:\nLength of house number must be between 1 and 25 characters.\nLength of postcode must be between 1 and 8 characters."
             return result
-        if self.validate_integer(house_number):
-            result = AddressSearch.get_address_details(house_number, postcode)
-        else:
+        if not self.validate_integer(house_number):
             result["err_msg"] = "Please enter an integer house number."
+            return result
+        result = self._gazetteer_address(house_number, postcode)
+        if not result["result"]:
+            result = self.address_service.lookup(house_number, postcode)
         return result
 
+    @property
+    def address_service(self) -> "AddressService":
+        """Return the address service, creating it on first use."""
+        if DataHandler._shared_address_service is None:
+            from address_fetcher import AddressCache, AddressService
+
+            DataHandler._shared_address_service = AddressService(
+                AddressCache(Path.cwd() / "database" / "address_cache.db")
+            )
+        return DataHandler._shared_address_service
+
+    def _gazetteer_address(self, house_number: str, postcode: str) -> dict:
+        """Resolve an address with the offline gazetteer, formatted as in val_create_address."""
+        result = {"result": False, "err_msg": "", "address": {}}
+        entry = self._gazetteer.lookup(postcode)
+        if entry is not None:
+            formatted_postcode = self._gazetteer.format_postcode(postcode)
+            result["result"] = True
+            result["address"] = {
+                "postcode": formatted_postcode.replace(" ", ""),
+                "city": entry["city"],
+                "country": entry["country"],
+                "house_number": house_number,
+                "label": f"{house_number}, {entry['city']} {formatted_postcode}, {entry['country']}",
+            }
+        return result
+
+    def val_create_addresses(self, addresses: List[Tuple[str, str]]) -> List[dict]:
+        """
+        Validate many addresses at once, such as when provisioning accounts for a class.
+        Addresses the gazetteer cannot resolve are looked up concurrently, within the API rate limit.
+
+        Arguments:
+            addresses (List[Tuple[str, str]]): House number and postcode of each address.
+
+        Returns:
+            List[dict]: Results in the same order as the addresses, formatted as in val_create_address.
+        """
+        results = []
+        # Indexes of addresses which need the address service
+        remote_indexes = []
+        for house_number, postcode in addresses:
+            if not self.validate_integer(house_number):
+                result = {
+                    "result": False,
+                    "err_msg": "Please enter an integer house number.",
+                    "address": {},
+                }
+            else:
+                result = self._gazetteer_address(house_number, postcode)
+                if not result["result"]:
+                    remote_indexes.append(len(results))
+            results.append(result)
+        remote_results = self.address_service.lookup_batch(
+            [addresses[index] for index in remote_indexes]
+        )
+        for index, result in zip(remote_indexes, remote_results):
+            results[index] = result
+        return results
+
     def _val_create_credentials(
         self, username: str, password: str, first_name: str, email: str
     ) -> dict:
@@ -271,7 +363,25 @@ class DataHandler:
 
     def authenticate_user(self, username: str, password: str) -> dict:
         """
-        Authenticate a user using a username and password.
+        Authenticate a user using a username and password, signing them in if successful.
+
+        Arguments:
+            username (str): Username entered by the user.
+            password (str): Password entered by the user.
+
+        Returns:
+            dict: A dictionary containing authentication result and error message.
+                - "auth" (bool): True if the authentication is successful, otherwise False.
+                - "err_msg" (str): An error message if authentication fails, otherwise empty if authenticated.
+        """
+        auth_result = self.check_credentials(username, password)
+        self.sign_in(auth_result)
+        return {"auth": auth_result["auth"], "err_msg": auth_result["err_msg"]}
+
+    def check_credentials(self, username: str, password: str) -> dict:
+        """
+        Check a username and password without changing the session, so it is safe to run on a worker
+        thread whose result may be discarded.
 
         Arguments:
             username (str): Username entered by the user.
@@ -281,32 +391,42 @@ class DataHandler:
             dict: A dictionary containing authentication result and error message.
                 - "auth" (bool): True if the authentication is successful, otherwise False.
                 - "err_msg" (str): An error message if authentication fails, otherwise empty if authenticated.
+                - "UID" (int): User ID if authenticated, otherwise None.
+                - "first_name" (str): First name of the user if authenticated, otherwise an empty string.
         """
         # Presence check on username and password
         if len(username) == 0 or len(password) == 0:
-            return {"auth": False, "err_msg": "Please complete all fields."}
+            return {
+                "auth": False,
+                "err_msg": "Please complete all fields.",
+                "UID": None,
+                "first_name": "",
+            }
         # Authenticate login with database
         auth_result = self.db.auth_login(username, password)
-        if auth_result["auth"]:
-            self._cur_UID = auth_result["UID"]
-            self._cur_first_name = self.db.get_first_name(self._cur_UID)
-        del auth_result["UID"]
+        auth_result["first_name"] = (
+            self.db.get_first_name(auth_result["UID"]) if auth_result["auth"] else ""
+        )
         return auth_result
 
+    def sign_in(self, auth_result: dict) -> None:
+        """
+        Sign in the user whose credentials were checked by check_credentials, if they were correct.
+
+        Arguments:
+            auth_result (dict): Result of check_credentials.
+        """
+        if auth_result["auth"]:
+            self._session.cur_UID = auth_result["UID"]
+            self._session.cur_first_name = auth_result["first_name"]
+
     def clear_user_data(self) -> None:
-        """Reset specific data upon logout."""
-        self._cur_UID = None
-        self._user_library = None
-        self._prev_file_path = None
-        self._tree = None
-        self._adjacency_list = {}
-        self._leaderboard_data = []
-        self._topic_id = None
-        self._topic_theory_list = []
+        """Reset user data upon logout, keeping settings."""
+        self._session.reset()
 
     @property
     def cur_name(self) -> str:
-        return self._cur_first_name
+        return self._session.cur_first_name
 
     # Study notes management
     @property
@@ -318,7 +438,7 @@ class DataHandler:
     def calc_revised_percent(self) -> int:
         """Return the percentage of topics revised by a user."""
         return int(
-            len(self.db.get_completed_topics(self._cur_UID))
+            len(self.db.get_completed_topics(self._session.cur_UID))
             / len(self._topics_dict)
             * 100
         )
@@ -333,16 +453,16 @@ class DataHandler:
     def load_topic_id(self, topic_id: int) -> None:
         """Load the topic's theory contents"""
         # Resetting variables
-        self._topic_id = topic_id
-        self._topic_page = -1
-        self._topic_theory_list = []
+        self._session.topic_id = topic_id
+        self._session.topic_page = -1
+        self._session.topic_theory_list = []
         # Get directory and read JSON file
         subpath = self.db.get_theory_path(topic_id)
         with open(Path.cwd() / Path(*subpath.split("\\")), "r") as file:
             contents = json.load(file)
         for heading, items in contents.items():
             for item in items:
-                self._topic_theory_list.append({heading: item})
+                self._session.topic_theory_list.append({heading: item})
 
     @property
     def topic_name(self) -> Optional[str]:
@@ -356,7 +476,7 @@ class DataHandler:
             (
                 topic["topic_name"]
                 for topic in self._topics_dict
-                if topic["topic_id"] == self._topic_id
+                if topic["topic_id"] == self._session.topic_id
             ),
             None,
         )
@@ -365,7 +485,7 @@ class DataHandler:
     @property
     def total_theory_pages(self) -> int:
         """Return total amount of pages in the current topic."""
-        return len(self._topic_theory_list)
+        return len(self._session.topic_theory_list)
 
     def get_next_theory_page(self, next_page: bool = True) -> Union[Dict, bool]:
         """
@@ -382,13 +502,15 @@ class DataHandler:
                         "body" str: Text to be displayed.
                         "image_dir" Union[Path, str]: Path if an image is present, otherwise an empty string.
         """
-        page_index = self._topic_page + 1 if next_page else self._topic_page - 1
-        if page_index not in range(len(self._topic_theory_list)):
+        page_index = (
+            self._session.topic_page + 1 if next_page else self._session.topic_page - 1
+        )
+        if page_index not in range(len(self._session.topic_theory_list)):
             return False
-        if page_index == len(self._topic_theory_list) - 1:
-            self.db.complete_topic(self._cur_UID, self._topic_id)
-        self._topic_page = page_index
-        current_page = self._topic_theory_list[self._topic_page]
+        if page_index == len(self._session.topic_theory_list) - 1:
+            self.db.complete_topic(self._session.cur_UID, self._session.topic_id)
+        self._session.topic_page = page_index
+        current_page = self._session.topic_theory_list[self._session.topic_page]
         key = next(iter(current_page))
         sub_dir = current_page[key]["image_dir"]
         image_dir = Path.cwd() / Path(*sub_dir.split("\\")) if len(sub_dir) != 0 else ""
@@ -396,7 +518,7 @@ class DataHandler:
         lines_wrapped = [textwrap.fill(line, width=70) for line in lines]
         return {
             "heading": key,
-            "page_number": self._topic_page + 1,
+            "page_number": self._session.topic_page + 1,
             "body": "\n\n".join(lines_wrapped),
             "image_dir": image_dir,
         }
@@ -405,8 +527,8 @@ class DataHandler:
     @property
     def user_library_list(self) -> List[str]:
         """Return the list of flashcard packs in a user's library"""
-        self._user_library = self.db.get_user_library(self._cur_UID)
-        list = [pack["pack_name"] for pack in self._user_library]
+        self._session.user_library = self.db.get_user_library(self._session.cur_UID)
+        list = [pack["pack_name"] for pack in self._session.user_library]
         return list
 
     def selected_pack_id(self, index: int) -> int:
@@ -414,7 +536,14 @@ class DataHandler:
         Return the pack id of a card pack.
         This should be used in conjunction with the user_library_list method to provide an accurate index.
         """
-        return self._user_library[index]["pack_id"]
+        return self._session.user_library[index]["pack_id"]
+
+    def selected_pack_details(self, index: int) -> Dict[str, Union[int, str, bool]]:
+        """
+        Return the library metadata of a card pack (name, share id, owner, card count, points and completion).
+        This should be used in conjunction with the user_library_list method to provide an accurate index.
+        """
+        return self._session.user_library[index]
 
     def load_pack_data(self, pack_id: int) -> None:
         """
@@ -423,11 +552,31 @@ class DataHandler:
         Arguments:
             pack_id (int): The ID of the card pack.
         """
-        # Clear correct card ids
-        self._correct_card_ids = []
+        # Clear correct card ids and any cards prepared for the previous pack
+        self._session.correct_card_ids = []
+        self._session.stop_prefetcher()
+        self._session.editing_pack_id = None
+        self._session.current_card_pack = self._read_card_pack(pack_id)
+        # Start preparing the first cards while the viewer is loading
+        self._session.card_prefetcher = CardPrefetcher(
+            self._session.current_card_pack,
+            self._prepare_card,
+            self._session.prefetch_depth,
+        )
+
+    def _read_card_pack(self, pack_id: int) -> CardPack:
+        """
+        Create a CardPack object from a card pack in the database.
+
+        Arguments:
+            pack_id (int): The ID of the card pack.
+
+        Returns:
+            CardPack: The card pack, with no tracked edits.
+        """
         # Fetch pack data from database module
         pack_name, cards_list = self.db.get_pack_data(pack_id)
-        self._current_card_pack = CardPack(pack_name, self._cur_UID)
+        card_pack = CardPack(pack_name, self._session.cur_UID)
         for card in cards_list:
             if card["question_type"] == "Reveal":
                 new_card = RevealCard()
@@ -441,26 +590,34 @@ class DataHandler:
                 answers = json.loads(card["answer"])
                 new_card.write_to_card(card["question"], card["points"], answers)
             new_card.set_card_id(card["card_id"])
-            self._current_card_pack.add_card(new_card)
+            card_pack.add_card(new_card)
+        # Cards read from the database are already stored
+        card_pack.clear_changes()
+        return card_pack
 
     @property
     def current_pack_name(self) -> str:
-        return self._current_card_pack.name
+        return self._session.current_card_pack.name
+
+    @property
+    def pack_loaded(self) -> bool:
+        """Return True if a card pack is loaded."""
+        return self._session.current_card_pack is not None
 
     @property
     def pack_cards_count(self) -> int:
         """Return the count of cards in the active card pack."""
-        return len(self._current_card_pack.cards_list)
+        return len(self._session.current_card_pack.cards_list)
 
     @property
     def current_card_number(self) -> int:
         """Return the current card number the user is on."""
-        return self._current_card_pack._current_card_index + 1
+        return self._session.current_card_pack._current_card_index + 1
 
     @property
     def current_card_answer(self) -> str:
         """Return the correct answer for the current card."""
-        card_obj = self._current_card_pack.current_card_obj
+        card_obj = self._session.current_card_pack.current_card_obj
         return card_obj.answer
 
     def check_answer(
@@ -481,12 +638,12 @@ class DataHandler:
         if user_answer == "":
             return False
         if use_index:
-            card_obj = self._current_card_pack.current_card_obj
+            card_obj = self._session.current_card_pack.current_card_obj
             user_answer = card_obj.answer_choices["all"][int(user_answer) - 1]
         card_answer = self.current_card_answer
         if user_answer == str(card_answer):
-            self._correct_card_ids.append(
-                self._current_card_pack.current_card_obj.card_id
+            self._session.correct_card_ids.append(
+                self._session.current_card_pack.current_card_obj.card_id
             )
             return True
         else:
@@ -499,11 +656,46 @@ class DataHandler:
 
         Returns:
             dict or bool: A dictionary containing the details of the next card, otherwise False if there are no more cards.
+                Multiple choice cards additionally contain:
+                - 'choice_numbers' (List[str]): Numbers for each answer choice.
+                - 'choices_text' (str): Numbered string of the answer choices.
         """
-        next_card = self._current_card_pack.next_card
-        if next_card is False:
+        if not self._session.current_card_pack.move_to_next_card():
             return False
-        return next_card
+        index = self._session.current_card_pack.current_card_index
+        if self._session.card_prefetcher is None:
+            return self._prepare_card(self._session.current_card_pack.card_info(index))
+        return self._session.card_prefetcher.get_card(index)
+
+    def _prepare_card(self, card: dict) -> dict:
+        """
+        Format a card's data for the flashcard viewer.
+
+        Arguments:
+            card (dict): Card data from CardPack.card_info.
+
+        Returns:
+            dict: The card data, with formatted answer choices for multiple choice cards.
+        """
+        if card["question_type"] == "Multiple Choice":
+            card["choice_numbers"] = [
+                f"{i+1}" for i in range(len(card["answer"]["all"]))
+            ]
+            card["choices_text"] = self.format_multiple_choice_options(card)
+        return card
+
+    def set_prefetch_depth(self, depth: int) -> None:
+        """Set how many cards are prepared ahead of the flashcard viewer."""
+        self._session.prefetch_depth = depth
+        if self._session.card_prefetcher is not None:
+            self._session.card_prefetcher.set_depth(depth)
+
+    @property
+    def prefetch_stats(self) -> Dict[str, int]:
+        """Return the hit and miss counters of the active card prefetcher."""
+        if self._session.card_prefetcher is None:
+            return {"hits": 0, "misses": 0, "depth": self._session.prefetch_depth}
+        return self._session.card_prefetcher.stats
 
     def format_multiple_choice_options(self, card: dict) -> str:
         """
@@ -520,11 +712,14 @@ class DataHandler:
 
     def toggle_card_reveal(self) -> bool:
         """Toggle and return the state of a reveal card."""
-        card_obj = self._current_card_pack.current_card_obj
+        card_obj = self._session.current_card_pack.current_card_obj
         return card_obj.toggle_revealed_state()
 
     def get_share_id(self, pack_id: int) -> str:
         """Return the share id of a card pack."""
+        for pack in self._session.user_library or []:
+            if pack["pack_id"] == pack_id:
+                return pack["share_id"]
         return self.db.get_share_id(pack_id)
 
     def download_pack(self, share_id: str) -> Dict[bool, str]:
@@ -541,14 +736,86 @@ class DataHandler:
         """
         if not share_id:
             return {"result": False, "err_msg": "Please provide a share ID"}
-        return self.db.download_pack(share_id, self._cur_UID)
+        return self.db.download_pack(share_id, self._session.cur_UID)
+
+    # Pack catalog
+    def load_catalog(self, order_str: str = "Popular") -> List[List]:
+        """
+        Load the first page of the public pack catalog.
+
+        Arguments:
+            order_str (str): "Popular" to rank by downloads, otherwise "Recent". Defaults to "Popular".
+
+        Returns:
+            List[List]: 2D list of catalog rows, each containing pack name, owner, card count and downloads.
+        """
+        self._session.catalog_order = "recent" if order_str == "Recent" else "popular"
+        self._session.catalog_packs, self._session.catalog_cursor = (
+            self.db.get_pack_catalog(self._session.catalog_order)
+        )
+        return self.catalog_rows
+
+    def load_more_catalog(self) -> Union[List[List], bool]:
+        """
+        Load the next page of the pack catalog.
+
+        Returns:
+            Union[List[List], bool]: All loaded catalog rows, otherwise False if there are no more packs.
+        """
+        if self._session.catalog_cursor is None:
+            return False
+        packs, self._session.catalog_cursor = self.db.get_pack_catalog(
+            self._session.catalog_order, self._session.catalog_cursor
+        )
+        self._session.catalog_packs.extend(packs)
+        return self.catalog_rows
+
+    @property
+    def catalog_rows(self) -> List[List]:
+        """Return the loaded catalog packs as a 2D list for displaying in a table."""
+        return [
+            [pack["pack_name"], pack["owner"], pack["card_count"], pack["downloads"]]
+            for pack in self._session.catalog_packs
+        ]
+
+    def download_catalog_pack(self, index: int) -> Dict[bool, str]:
+        """
+        Add a pack from the catalog to the user's library.
+
+        Arguments:
+            index (int): Index of the pack in the loaded catalog rows.
+
+        Returns:
+            dict: Contains the result and error message, as returned by download_pack.
+        """
+        if index not in range(len(self._session.catalog_packs)):
+            return {"result": False, "err_msg": "Please select a pack from the table."}
+        return self.download_pack(self._session.catalog_packs[index]["share_id"])
 
     def clear_current_card(self) -> None:
-        self._current_card = None
+        self._session.current_card = None
+
+    def fork_card_pack(self, pack_id: int, pack_name: str) -> Union[bool, str]:
+        """
+        Create an editable copy of a card pack in the user's library, sharing its cards.
+
+        Arguments:
+            pack_id (int): The ID of the card pack to fork.
+            pack_name (str): Name of the new pack from user input.
+
+        Returns:
+            Union[bool, str]: True if the pack was forked, otherwise a string with an error message.
+        """
+        if not pack_name or not self._val_pack_name(pack_name):
+            return (
+                "Please ensure pack name is between 3 and 30 alphanumeric characters."
+            )
+        result = self.db.fork_card_pack(pack_id, self._session.cur_UID, pack_name)
+        return True if result["result"] else result["err_msg"]
 
     def delete_card_pack(self, pack_id: int) -> str:
         """Attempt to delete a card pack and return the result message (str)."""
-        return self.db.delete_card_pack(pack_id, self._cur_UID)
+        return self.db.delete_card_pack(pack_id, self._session.cur_UID)
 
     # Flashcard creator management
     def validate_pack_name(self, pack_name: str) -> Union[bool, str]:
@@ -562,12 +829,16 @@ class DataHandler:
             Union[bool, str]: True if CardPack object is created, else appropriate error message as string.
         """
         # creates a card pack object
-        # Check if the length is between 3 and 30 characters and alphanumeric
-        if 3 <= len(pack_name) <= 30 and re.match("^[a-zA-Z0-9 ]*$", pack_name):
-            self._current_card_pack = CardPack(pack_name, self._cur_UID)
+        if self._val_pack_name(pack_name):
+            self._session.stop_prefetcher()
+            self._session.current_card_pack = CardPack(pack_name, self._session.cur_UID)
             return True
         return "Please ensure pack name is between 3 and 30 alphanumeric characters."
 
+    def _val_pack_name(self, pack_name: str) -> bool:
+        """Check a pack name is between 3 and 30 characters and alphanumeric (spaces allowed)."""
+        return CardPack.valid_name(pack_name)
+
     def add_card_choice(self, answer: str, is_correct_answer: bool) -> Union[str, bool]:
         """
         Add a choice for a multiple-choice card.
@@ -579,43 +850,46 @@ class DataHandler:
         Returns:
             Union[str, bool]: True if the choice was added, else a string error message if failed.
         """
-        self._current_card = (
-            self._current_card
-            if self._current_card is not None
+        self._session.current_card = (
+            self._session.current_card
+            if self._session.current_card is not None
             else MultipleChoiceCard()
         )
         if self.get_answer_count() == 4:
             return "Maximum amount of answer submitted."
         if (
             self.get_answer_count() == 3
-            and self._current_card.answer_choices["correct"] is None
+            and self._session.current_card.answer_choices["correct"] is None
             and not is_correct_answer
         ):
             return "You must have at least 1 corrct answer."
-        if answer in self._current_card.answer_choices["all"]:
+        if self._session.current_card.has_choice(answer):
             return "You have already added this option."
         if 1 <= len(answer) <= 125:
             if is_correct_answer:
                 # System is set up such that a card can only have one correct answer
-                if self._current_card.answer is None:
-                    self._current_card.set_answer(answer)
+                if self._session.current_card.answer is None:
+                    self._session.current_card.set_answer(answer)
                 else:
                     return "You have already set a correct answer."
-            self._current_card.add_choice(answer)
+            self._session.current_card.add_choice(answer)
             return True
         else:
             return "Please ensure the answer is between 1 and 125 characters."
 
     def get_answer_count(self) -> int:
         """Return the number of choices in the current multiple choice card"""
-        return len(self._current_card.answer_choices["all"])
+        return len(self._session.current_card.answer_choices["all"])
+
+    def duplicate_cards_check(self, question: str, ignore_card: Card = None) -> bool:
+        """Check if a question is duplicate (ignoring case and spacing)"""
+        return self._session.current_card_pack.has_question(question, ignore_card)
 
-    def duplicate_cards_check(self, question: str) -> bool:
-        """Check if a question is duplicate"""
-        for card in self._current_card_pack.cards_list:
-            if question == card.question:
-                return True
-        return False
+    def similar_question_check(self, question: str) -> Union[str, None]:
+        """Return the question of a card similar to the given question, otherwise None"""
+        if self._session.current_card_pack is None:
+            return None
+        return self._session.current_card_pack.similar_question(question)
 
     def add_card(
         self, question_type: str, question: str, answer: str, points: int
@@ -643,31 +917,31 @@ class DataHandler:
         # Reveal card
         if question_type == "Reveal":
             if 1 <= len(answer) <= 125:
-                self._current_card = RevealCard()
+                self._session.current_card = RevealCard()
                 # Points set to 0 for all reveal cards
-                self._current_card.write_to_card(question, answer, 0)
+                self._session.current_card.write_to_card(question, answer, 0)
             else:
                 return "Please ensure the answer is between 1 and 125 characters."
         # Multiple choice card (answers are set sequentially in the add_card_choice method prior to this)
         elif question_type == "Multiple choice":
-            if self._current_card is None:
+            if self._session.current_card is None:
                 return "Please ensure there are at least 2 choices available."
             if (
-                len(self._current_card.answer_choices["all"]) >= 2
-                and self._current_card.answer_choices["correct"] is not None
+                len(self._session.current_card.answer_choices["all"]) >= 2
+                and self._session.current_card.answer_choices["correct"] is not None
             ):
-                self._current_card.write_to_card(question, points)
+                self._session.current_card.write_to_card(question, points)
             else:
                 return "Please ensure there are at least 2 choices available, inlcuding the correct option."
         # Integer card
         elif question_type == "Numerical":
             if self.validate_integer(answer) and 1 <= len(answer) <= 6:
-                self._current_card = Card()
-                self._current_card.write_to_card(question, answer, points)
+                self._session.current_card = Card()
+                self._session.current_card.write_to_card(question, answer, points)
             else:
                 return "Please ensure the answer is an integer between 1 and 6 chracters in length."
         # All validation passed, card is added to the pack and current_card is cleared
-        self._current_card_pack.add_card(self._current_card)
+        self._session.current_card_pack.add_card(self._session.current_card)
         self.clear_current_card()
         return True
 
@@ -678,24 +952,13 @@ class DataHandler:
         Returns:
             Union[bool, str]: True if the card pack was saved, otherwise a string with an error message.
         """
-        if len(self._current_card_pack.cards_list) > 0:
-            card_list = []
-            for card in self._current_card_pack.cards_list:
-                # Reformatting for multiple choice (for database compatiblity)
-                if card.question_type == "Multiple Choice":
-                    answer = json.dumps(card.answer_choices)
-                else:
-                    answer = card.answer
-                card_list.append(
-                    {
-                        "question": card.question,
-                        "answer": answer,
-                        "points": card.points,
-                        "question_type": card.question_type,
-                    }
-                )
+        if len(self._session.current_card_pack.cards_list) > 0:
+            card_list = [
+                self._card_record(card)
+                for card in self._session.current_card_pack.cards_list
+            ]
             self.db.create_flashcard_pack(
-                self._current_card_pack.name, card_list, self._cur_UID
+                self._session.current_card_pack.name, card_list, self._session.cur_UID
             )
             self.clear_current_card()
             self.clear_current_pack()
@@ -703,10 +966,126 @@ class DataHandler:
         else:
             return "Please save add at least one card"
 
+    @staticmethod
+    def _card_record(card: Card) -> Dict[str, Union[int, str]]:
+        """Format a card object as a dictionary for the database."""
+        # Reformatting for multiple choice (for database compatiblity)
+        if card.question_type == "Multiple Choice":
+            answer = json.dumps(card.answer_choices)
+        else:
+            answer = card.answer
+        return {
+            "question": card.question,
+            "answer": answer,
+            "points": card.points,
+            "question_type": card.question_type,
+        }
+
     def clear_current_pack(self) -> None:
-        self._current_card_pack = None
-        self._current_card = None
-        self._correct_card_ids = []
+        self._session.stop_prefetcher()
+        self._session.current_card_pack = None
+        self._session.current_card = None
+        self._session.correct_card_ids = []
+        self._session.editing_pack_id = None
+
+    # Flashcard editor management
+    def load_pack_for_editing(self, pack_id: int) -> None:
+        """
+        Load a card pack so its cards can be edited, added or removed.
+
+        Arguments:
+            pack_id (int): The ID of the card pack.
+        """
+        self.clear_current_pack()
+        self._session.current_card_pack = self._read_card_pack(pack_id)
+        self._session.editing_pack_id = pack_id
+
+    @property
+    def editing_questions(self) -> List[str]:
+        """Return the questions of the cards in the pack being edited."""
+        return [card.question for card in self._session.current_card_pack.cards_list]
+
+    def get_editing_card(self, index: int) -> dict:
+        """Return the data of a card in the pack being edited."""
+        return self._session.current_card_pack.card_info(index)
+
+    def edit_card(
+        self, index: int, question: str, answer: str = None
+    ) -> Union[bool, str]:
+        """
+        Edit a card in the pack being edited.
+
+        Arguments:
+            index (int): Index of the card in the pack.
+            question (str): The new prompt from user input.
+            answer (str, optional): The new answer from user input. Ignored for multiple choice cards, which keep their choices.
+
+        Returns:
+            Union[bool, str]: True if the card was edited, otherwise a string with an error message.
+        """
+        old_card = self._session.current_card_pack.cards_list[index]
+        if not question or not 1 <= len(question) <= 125:
+            return "Please ensure the prompt is between 1 and 125 characters."
+        if self.duplicate_cards_check(question, old_card):
+            return "You already have a card with this question."
+        if old_card.question_type == "Multiple Choice":
+            new_card = MultipleChoiceCard()
+            new_card.write_to_card(
+                question,
+                old_card.points,
+                {
+                    "correct": old_card.answer_choices["correct"],
+                    "all": list(old_card.answer_choices["all"]),
+                },
+            )
+        elif old_card.question_type == "Reveal":
+            if not answer or not 1 <= len(answer) <= 125:
+                return "Please ensure the answer is between 1 and 125 characters."
+            new_card = RevealCard()
+            new_card.write_to_card(question, answer, 0)
+        else:
+            if not (answer and self.validate_integer(answer) and 1 <= len(answer) <= 6):
+                return "Please ensure the answer is an integer between 1 and 6 chracters in length."
+            new_card = Card()
+            new_card.write_to_card(question, answer, old_card.points)
+        self._session.current_card_pack.replace_card(index, new_card)
+        return True
+
+    def remove_card(self, index: int) -> None:
+        """Remove a card from the pack being edited."""
+        self._session.current_card_pack.remove_card(index)
+
+    def save_pack_changes(self) -> Union[bool, str]:
+        """
+        Save the edits made to the pack being edited, only writing the cards which changed.
+
+        Returns:
+            Union[bool, str]: True if the edits were saved, otherwise a string with an error message.
+        """
+        card_pack = self._session.current_card_pack
+        if self._session.editing_pack_id is None:
+            return "No pack is being edited."
+        if len(card_pack.cards_list) == 0:
+            return "Please keep at least one card, or delete the pack instead."
+        if not card_pack.has_changes:
+            return True
+        changes = card_pack.pending_changes
+        result = self.db.apply_pack_changes(
+            self._session.editing_pack_id,
+            self._session.cur_UID,
+            [self._card_record(card) for card in changes["added"]],
+            [card.card_id for card in changes["removed"]],
+            {card.card_id: self._card_record(card) for card in changes["changed"]},
+        )
+        if not result["result"]:
+            return result["err_msg"]
+        # Cards may have been stored under new IDs (new or copied cards)
+        for card, card_id in zip(changes["added"], result["added_ids"]):
+            card.set_card_id(card_id)
+        for card in changes["changed"]:
+            card.set_card_id(result["changed_ids"][card.card_id])
+        card_pack.clear_changes()
+        return True
 
     # Leaderboard management
     def get_leaderboard_data(self) -> Tuple[List[List], Optional[int]]:
@@ -723,10 +1102,10 @@ class DataHandler:
             [index + 1, entry["username"], entry["score"]]
             for index, entry in enumerate(user_data)
         ]
-        self._leaderboard_data = user_data_2d
+        self._session.leaderboard_data = user_data_2d
         user_rank = None
         for index, entry in enumerate(user_data):
-            if entry.get("UID") == self._cur_UID:
+            if entry.get("UID") == self._session.cur_UID:
                 user_rank = index + 1
                 break
         return user_data_2d, user_rank
@@ -734,8 +1113,8 @@ class DataHandler:
     @property
     def leaderboard_data_reverse(self) -> List[List]:
         """Reverse the order of the leaderboard data and return it."""
-        self._leaderboard_data = self._leaderboard_data[::-1]
-        return self._leaderboard_data
+        self._session.leaderboard_data = self._session.leaderboard_data[::-1]
+        return self._session.leaderboard_data
 
     def push_user_scores(self) -> str:
         """
@@ -744,21 +1123,26 @@ class DataHandler:
         Returns:
             str: The number of correct answers and revealed cards out of the total cards.
         """
-        self.db.update_leaderboard(self._cur_UID, self._correct_card_ids)
+        self.db.update_leaderboard(
+            self._session.cur_UID, self._session.correct_card_ids
+        )
         reveal_cards_count = 0
-        for card in self._current_card_pack.cards_list:
+        for card in self._session.current_card_pack.cards_list:
             if card.question_type == "Reveal":
                 reveal_cards_count += 1
-        return f"{len(self._correct_card_ids) + reveal_cards_count }/{self.pack_cards_count}"
+        return f"{len(self._session.correct_card_ids) + reveal_cards_count }/{self.pack_cards_count}"
 
     # Binary tree demo
-    def generate_tree(self, string: str, balanced_bool: bool) -> Dict[bool, str]:
+    def generate_tree(
+        self, string: str, balanced_bool: bool, tree_type: str = "Binary search tree"
+    ) -> Dict[bool, str]:
         """
         Generate a binary search tree from a string of integers (seperated by commas).
 
         Arguments:
             string (str): String of integers, seperated by commas.
-            balanced_bool (bool): Indicates whether to balance the tree.
+            balanced_bool (bool): Indicates whether to balance the tree. AVL and red-black trees are always balanced.
+            tree_type (str): One of tree_types. Defaults to "Binary search tree".
 
         Returns:
             dict: A dictionary containing the result.
@@ -775,37 +1159,146 @@ class DataHandler:
                 result["err_msg"] = "Please only enter integers"
         else:
             result["err_msg"] = "Please enter betweeen 2 and 30 integers"
+        if tree_type not in self.tree_types:
+            result["err_msg"] = "Please select a tree type"
         if result["err_msg"]:
             return result
         # If validation passes, attempts to build tree
         try:
-            self._tree = BinarySearchTree()
+            from binary_search_tree import BinarySearchTree
+            from balanced_trees import AVLTree, RedBlackTree
+
+            tree_classes = dict(
+                zip(self.tree_types, (BinarySearchTree, AVLTree, RedBlackTree))
+            )
+            self._session.tree = tree_classes[tree_type]()
             # Calls to build balanced tree, if balanced_bool is True
             if balanced_bool:
-                self._tree.build_balanced_tree(integers)
+                self._session.tree.build_balanced_tree(integers)
             else:
-                self._tree.build_tree(integers)
-            # Updates the most recent file path
-            self._prev_file_path = self._tree.render_as_image()
+                self._session.tree.build_tree(integers)
+            # Updates the most recent image
+            self._update_image("tree")
             result["result"] = True
         except Exception as error:
             result["err_msg"] = error
         return result
 
-    def resize_image(self, encode_format: str = "PNG") -> bytes:
+    def _update_image(self, source: str) -> bytes:
+        """
+        Make the session's tree or graph its most recent image, only rendering it if it isn't already cached.
+
+        Arguments:
+            source (str): What to draw, one of "tree", "adjacency matrix" or "adjacency list".
+
+        Returns:
+            bytes: The PNG image.
+        """
+        if source == "tree":
+            tree = self._session.tree
+            key = self.render_cache.make_key(source, tree.structure(), self.image_size)
+            image = self.render_cache.get_or_render(
+                key, lambda: tree.render(self.image_size)
+            )
+        else:
+            from graphs import GraphVisualiser
+
+            if source == "adjacency matrix":
+                structure = self._session.adj_matrix
+                render = GraphVisualiser.render_graph_from_adjacency_matrix
+            else:
+                # Neighbour order doesn't change the graph, so it is left out of the key
+                structure = {
+                    node: sorted(neighbours)
+                    for node, neighbours in self._session.adjacency_list.items()
+                }
+                render = GraphVisualiser.render_graph_from_adjacency_list
+            key = self.render_cache.make_key(source, structure, self.image_size)
+            image = self.render_cache.get_or_render(key, lambda: render(structure))
+        self._session.image_key = key
+        self._session.image_source = source
+        return image
+
+    @property
+    def image(self) -> Optional[bytes]:
+        """Return the session's most recent tree or graph image, rendering it again if it was evicted from the cache."""
+        if self._session.image_key is None:
+            return None
+        image = self.render_cache.get(self._session.image_key)
+        if image is None:
+            image = self._update_image(self._session.image_source)
+        return image
+
+    def resize_image(self, encode_format: str = "PNG", size: int = None) -> bytes:
         """
-        Resize an image and encode it into bytes.
+        Resize the most recent tree or graph image and encode it into bytes.
+        Resized images are cached, so showing the same image again returns the cached bytes.
+        Images already the right size and format are returned from the render cache, without a second copy.
 
         Arguments:
             encode_format (str, optional): The encoding format for the image. Defaults to "PNG".
+            size (int, optional): Length of the longer side in pixels. Defaults to image_size.
 
         Returns:
             bytes: The byte representation of the resized image.
         """
-        image = Image.open(self._prev_file_path)
+        size = size if size is not None else self.image_size
+        source_image = self.image
+        if self._is_encoded_at(source_image, size, encode_format):
+            return source_image
+        # The source's key is a hash of what it shows, so also identifies the resized image
+        key = self.thumbnail_cache.make_key(
+            "thumbnail", [self._session.image_key, encode_format], size
+        )
+        return self.thumbnail_cache.get_or_render(
+            key, lambda: self._encode_thumbnail(source_image, size, encode_format)
+        )
+
+    @staticmethod
+    def _is_encoded_at(image_bytes: bytes, size: int, encode_format: str) -> bool:
+        """
+        Check if an encoded image's longer side is a given size and it is in a given format.
+        Only the image's header is read.
+
+        Arguments:
+            image_bytes (bytes): The encoded image.
+            size (int): Length of the longer side in pixels.
+            encode_format (str): The encoding format.
+
+        Returns:
+            bool: True if the image is already that size and format, otherwise False.
+        """
+        from PIL import Image
+
+        with Image.open(BytesIO(image_bytes)) as image:
+            return max(image.size) == size and image.format == encode_format
+
+    @staticmethod
+    def _encode_thumbnail(image_bytes: bytes, size: int, encode_format: str) -> bytes:
+        """
+        Resize an encoded image so its longer side is a given size, and encode it.
+
+        Arguments:
+            image_bytes (bytes): The encoded source image.
+            size (int): Length of the longer side in pixels.
+            encode_format (str): The encoding format for the resized image.
+
+        Returns:
+            bytes: The resized image.
+        """
+        from PIL import Image
+
+        image = Image.open(BytesIO(image_bytes))
         image_size = image.size
-        multiple = 500 / max(image_size)
-        new_image = image.resize([int(size * multiple) for size in image_size])
+        multiple = size / max(image_size)
+        # Bilinear resampling is much faster than the default and sharp enough for a preview,
+        # and large reductions are first made in whole steps, which is faster still
+        resampling = getattr(Image, "Resampling", Image).BILINEAR
+        new_image = image.resize(
+            [max(1, round(length * multiple)) for length in image_size],
+            resample=resampling,
+            reducing_gap=2.0,
+        )
         with BytesIO() as buffer:
             new_image.save(buffer, format=encode_format)
             data = buffer.getvalue()
@@ -819,8 +1312,89 @@ class DataHandler:
         """
         if not new_node or not self.validate_integer(new_node):
             return "Please enter an integer"
-        self._tree.add_node(int(new_node))
-        self._prev_file_path = self._tree.render_as_image()
+        self._session.tree.add_node(int(new_node))
+        self._update_image("tree")
+
+    def delete_tree_node(self, node: str) -> Union[str, None]:
+        """
+        Delete a node from the existing binary tree.
+            - Regenerate image if deleted.
+            - Return error message (str) if node isn't valid or isn't in the tree.
+        """
+        if not node or not self.validate_integer(node):
+            return "Please enter an integer"
+        root = self._session.tree.root
+        if root.left is None and root.right is None and root.value == int(node):
+            return "The tree must keep at least one node"
+        if not self._session.tree.delete(int(node)):
+            return f"{node} is not in the tree"
+        self._update_image("tree")
+
+    def run_tree_operation(self, operation: str, argument: str = "") -> dict:
+        """
+        Run a query on the current tree, describing the nodes it visited.
+
+        Arguments:
+            operation (str): One of tree_operations.
+            argument (str): An integer for "Search" and "Successor", or two integers seperated by a comma for "Range".
+
+        Returns:
+            dict: A dictionary containing the result.
+                - 'result' (bool): True if the query ran, otherwise False.
+                - 'err_msg' (str): Error message if the query did not run.
+                - 'output' (str): The answer and the steps taken, formatted for a popup.
+        """
+        result = {"result": False, "err_msg": "", "output": ""}
+        tree = self._session.tree
+        trace = {}
+        argument = (argument or "").replace(" ", "")
+        if operation in ("Search", "Successor"):
+            if not self.validate_integer(argument):
+                result["err_msg"] = "Please enter an integer"
+                return result
+            if operation == "Search":
+                found = tree.search(int(argument), trace)
+                answer = f"{argument} is {'' if found else 'not '}in the tree"
+            else:
+                successor = tree.successor(int(argument), trace)
+                answer = (
+                    f"Successor of {argument}: {successor}"
+                    if successor is not None
+                    else f"No value is greater than {argument}"
+                )
+        elif operation == "Range":
+            bounds = argument.split(",")
+            if len(bounds) != 2 or not all(self.validate_integer(b) for b in bounds):
+                result["err_msg"] = "Please enter two integers, seperated by a comma"
+                return result
+            low, high = sorted(int(bound) for bound in bounds)
+            values = ", ".join(
+                str(value) for value in tree.range_query(low, high, trace)
+            )
+            answer = f"Values from {low} to {high}: {values or 'none'}"
+        elif operation == "Minimum":
+            answer = f"Minimum: {tree.minimum(trace)}"
+        elif operation == "Maximum":
+            answer = f"Maximum: {tree.maximum(trace)}"
+        else:
+            result["err_msg"] = "Please select an operation from the dropdown"
+            return result
+        visited = ", ".join(str(value) for value in trace["visited"])
+        result["output"] = (
+            f"{answer}\n"
+            f"Nodes visited ({len(trace['visited'])}): {visited}\n"
+            f"Comparisons: {trace['comparisons']}"
+        )
+        result["result"] = True
+        return result
+
+    @property
+    def tree_stats(self) -> str:
+        """Return the height and rotation count of the current tree, formatted for the trees view."""
+        tree = self._session.tree
+        if tree is None:
+            return ""
+        return f"Height: {tree.height}    Rotations: {tree.rotations}"
 
     def get_traversal_order(self, order_str: str) -> str:
         """
@@ -833,34 +1407,35 @@ class DataHandler:
             str: A string with the traversal order.
         """
         traversal_functions = {
-            "preorder": self._tree.pre_order_traversal,
-            "postorder": self._tree.post_order_traversal,
-            "inorder": self._tree.in_order_traversal,
+            "preorder": self._session.tree.iter_pre_order,
+            "postorder": self._session.tree.iter_post_order,
+            "inorder": self._session.tree.iter_in_order,
         }
+        # Values are joined as they are yielded, without building a list first
         traversal_order = traversal_functions[order_str]()
         traversal_order = ", ".join(str(integer) for integer in traversal_order)
         return traversal_order
 
     # Queues demo
     def initialise_queue(self):
-        self._queue = Queue(self._queue_max_size)
+        self._session.queue = Queue(self._session.queue_max_size)
 
     @property
     def queue_max_size(self) -> int:
         """Return the active queues max size."""
-        return self._queue_max_size
+        return self._session.queue_max_size
 
     def switch_queue(self, queue_type: str) -> List[str]:
         """Updates the queue object, dependent on a string input."""
         if queue_type == "queue":
-            self._queue = Queue(self._queue_max_size)
+            self._session.queue = Queue(self._session.queue_max_size)
         if queue_type == "priority":
-            self._queue = PriorityQueue(self._queue_max_size)
+            self._session.queue = PriorityQueue(self._session.queue_max_size)
         if queue_type == "circular":
-            self._queue = CircularQueue(self._queue_max_size)
+            self._session.queue = CircularQueue(self._session.queue_max_size)
         if queue_type == "stack":
-            self._queue = Stack(self._queue_max_size)
-        return self._queue.screen_elements
+            self._session.queue = Stack(self._session.queue_max_size)
+        return self._session.queue.screen_elements
 
     @staticmethod
     def _create_queue_item() -> str:
@@ -873,7 +1448,7 @@ class DataHandler:
 
     def get_queue(self) -> List[str]:
         """Return the queue contents as a list."""
-        queue_contents = self._queue.queue
+        queue_contents = self._session.queue.queue
         if all(isinstance(item, tuple) and len(item) == 2 for item in queue_contents):
             return [item[1] for item in queue_contents]
         return queue_contents
@@ -888,7 +1463,7 @@ class DataHandler:
             - item (str) if enqueued.
         """
         item = self._create_queue_item()
-        return self._queue.enqueue(item)
+        return self._session.queue.enqueue(item)
 
     def queue_push(self) -> Union[bool, T]:
         """
@@ -900,7 +1475,7 @@ class DataHandler:
             - item (str) if pushed successfully.
         """
         item = self._create_queue_item()
-        return self._queue.push(item)
+        return self._session.queue.push(item)
 
     def queue_dequeue(self) -> Union[bool, T]:
         """
@@ -911,7 +1486,7 @@ class DataHandler:
             otherwise,
             - (str) of item if dequeued.
         """
-        return self._queue.dequeue()
+        return self._session.queue.dequeue()
 
     def queue_pop(self) -> Union[bool, T]:
         """
@@ -922,15 +1497,15 @@ class DataHandler:
             otherwise,
             - (str) of item if popped.
         """
-        return self._queue.pop()
+        return self._session.queue.pop()
 
     def queue_is_full(self) -> bool:
         """Check if active queue is full."""
-        return self._queue.is_full()
+        return self._session.queue.is_full()
 
     def queue_is_empty(self) -> bool:
         """Check if active queue is empty."""
-        return self._queue.is_empty()
+        return self._session.queue.is_empty()
 
     def queue_peek(self) -> Union[bool, T]:
         """
@@ -941,19 +1516,19 @@ class DataHandler:
             otherwise,
             - (str) of top item.
         """
-        return self._queue.peek()
+        return self._session.queue.peek()
 
     def queue_size(self) -> int:
         """Return the current size of the queue."""
-        return self._queue.size()
+        return self._session.queue.size()
 
     def queue_front(self) -> int:
         """Return the value of the front pointer."""
-        return self._queue.front
+        return self._session.queue.front
 
     def queue_rear(self) -> int:
         """Return the value of the rear pointer."""
-        return self._queue.rear
+        return self._session.queue.rear
 
     def queue_rear_element(self) -> Union[bool, T]:
         """
@@ -964,18 +1539,17 @@ class DataHandler:
             otherwise,
             - (str) of rear item.
         """
-        return self._queue.rear_item()
+        return self._session.queue.rear_item()
 
     # Graphs demo
     def generate_graph_from_matrix_string(
-        self, adj_matrix_str: str, filename: str = "graph_demo"
+        self, adj_matrix_str: str
     ) -> Union[str, bool]:
         """
         Generate a graph visualisation from an adjacency matrix string.
 
         Arguments:
             adj_matrix_str (str): The adjacency matrix string.
-            filename (str, optional): The filename to save the graph visualisation. Defaults to "graph_demo".
 
         Returns:
             Union[str, bool]: String with an error message, otherwise True if the graph was successfully generated.
@@ -989,7 +1563,7 @@ class DataHandler:
         if any(not self.validate_integer(value) for value in values):
             return "Please ensure to follow the suggested formatting, non-integer values were found."
         # Check if the length of values is a perfect square
-        side_length = int(np.sqrt(len(values)))
+        side_length = math.isqrt(len(values))
         if side_length**2 != len(values):
             return "Invalid adjacency matrix, number of elements does not form a square"
         # Convert the values to integers
@@ -998,24 +1572,20 @@ class DataHandler:
         adj_matrix = [
             adj_list[i : i + side_length] for i in range(0, len(adj_list), side_length)
         ]
-        self._prev_file_path = GraphVisualiser.save_graph_from_adjacency_matrix(
-            adj_matrix, filename
-        )
-        self._adj_matrix = adj_matrix
+        self._session.adj_matrix = adj_matrix
+        self._update_image("adjacency matrix")
         return True
 
     def generate_graph_from_adjacency_list(self) -> Union[str, bool]:
         """
-        Generate graph image using current adjacency list and store the file path.
+        Generate graph image using current adjacency list and store it.
 
         Returns:
             Union[str, bool]: True if graph is generated, string for user if validation fails.
         """
-        if not self._adjacency_list:
+        if not self._session.adjacency_list:
             return "Please add a node first."
-        self._prev_file_path = GraphVisualiser.save_graph_from_adjacency_list(
-            self._adjacency_list
-        )
+        self._update_image("adjacency list")
         return True
 
     def add_adjacency_node(self, node: str) -> Union[str, bool]:
@@ -1033,10 +1603,10 @@ class DataHandler:
             return "Please enter a value for the node."
         if not 1 <= len(node) <= 3:
             return "Please enter a value between 1 and 3 characters in length."
-        if node in self._adjacency_list:
+        if node in self._session.adjacency_list:
             return "A node already exists with this name."
         # Creating the key in adjacency_list
-        self._adjacency_list[node] = []
+        self._session.adjacency_list[node] = []
         return True
 
     def add_edge_adjacency_list(
@@ -1054,29 +1624,32 @@ class DataHandler:
             Union[str, bool]: Either a string indicating an error message, or True if the edge was successfully added.
         """
         # Validate node1 and node2 exist
-        if node1 not in self._adjacency_list or node2 not in self._adjacency_list:
+        if (
+            node1 not in self._session.adjacency_list
+            or node2 not in self._session.adjacency_list
+        ):
             return "Please choose two nodes using the dropdown menus."
         # Check that edge won't generate a self-loop
         if node1 == node2:
             return "Graph does not support self-loops"
         # Check if the edge already exists
-        if node2 in self._adjacency_list[node1] or (
-            not directed_graph and node1 in self._adjacency_list[node2]
+        if node2 in self._session.adjacency_list[node1] or (
+            not directed_graph and node1 in self._session.adjacency_list[node2]
         ):
             return "Edge already exists."
         # Add edges
-        self._adjacency_list[node1].append(node2)
+        self._session.adjacency_list[node1].append(node2)
         if not directed_graph:
-            self._adjacency_list[node2].append(node1)
+            self._session.adjacency_list[node2].append(node1)
         return True
 
     @property
     def adjacency_matrix_table_str(self) -> str:
         """Return the current adjacency list or adjacency matrix as a string representation of an adjacency matrix."""
         # Adjacency matrix
-        if self._adj_matrix:
-            num_rows = len(self._adj_matrix)
-            num_cols = len(self._adj_matrix[0]) if num_rows > 0 else 0
+        if self._session.adj_matrix:
+            num_rows = len(self._session.adj_matrix)
+            num_cols = len(self._session.adj_matrix[0]) if num_rows > 0 else 0
             matrix_string = ""
             # Add column headers
             matrix_string += (
@@ -1085,20 +1658,20 @@ class DataHandler:
             for i in range(num_rows):
                 row = f"N{i+1} "
                 for j in range(num_cols):
-                    row += str(self._adj_matrix[i][j]) + " "
+                    row += str(self._session.adj_matrix[i][j]) + " "
                 # Add row to matrix string
                 matrix_string += row.strip() + "\n"
             return matrix_string
         # Adjacency list
-        elif self._adjacency_list:  # If adjacency list exists
-            nodes = sorted(self._adjacency_list.keys())
+        elif self._session.adjacency_list:  # If adjacency list exists
+            nodes = sorted(self._session.adjacency_list.keys())
             matrix_string = ""
             # Add column headers
             matrix_string += "   " + " ".join(nodes) + "\n"
             for node in nodes:
                 row = node + " "
                 for adj_node in nodes:
-                    if adj_node in self._adjacency_list[node]:
+                    if adj_node in self._session.adjacency_list[node]:
                         row += "1 "
                     else:
                         row += "0 "
@@ -1109,10 +1682,10 @@ class DataHandler:
     @property
     def adjacency_node_names(self) -> List[str]:
         """Return a list of all node names in the current adjacency list."""
-        return list(self._adjacency_list.keys())
+        return list(self._session.adjacency_list.keys())
 
     def clear_adjacency_list(self) -> None:
-        self._adjacency_list = {}
+        self._session.adjacency_list = {}
 
     # Universal data validation
     def validate_integer(self, term) -> bool:
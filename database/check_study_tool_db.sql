@@ -72,4 +72,41 @@ CREATE TABLE IF NOT EXISTS "Users" (
 	"Email"	VARCHAR(256) NOT NULL UNIQUE,
 	PRIMARY KEY("UID" AUTOINCREMENT)
 );
+CREATE TABLE IF NOT EXISTS "PackStats" (
+	"PackID"	INTEGER NOT NULL UNIQUE,
+	"Downloads"	INTEGER NOT NULL DEFAULT 0,
+	PRIMARY KEY("PackID"),
+	FOREIGN KEY("PackID") REFERENCES "CardPacks"("PackID")
+);
+CREATE INDEX IF NOT EXISTS "PackStats_Popularity" ON "PackStats" ("Downloads" DESC, "PackID" DESC);
+CREATE INDEX IF NOT EXISTS "UserLibraries_UID_PackID" ON "UserLibraries" ("UID", "PackID");
+CREATE INDEX IF NOT EXISTS "UserLibraries_PackID" ON "UserLibraries" ("PackID");
+CREATE INDEX IF NOT EXISTS "CardLocations_PackID" ON "CardLocations" ("PackID");
+CREATE INDEX IF NOT EXISTS "CardLocations_CardID" ON "CardLocations" ("CardID");
+CREATE INDEX IF NOT EXISTS "Cards_Content" ON "Cards" ("Question", "Answer", "Points", "QuestionType");
+CREATE TRIGGER IF NOT EXISTS "PackStats_PackCreated" AFTER INSERT ON "CardPacks"
+BEGIN
+	INSERT OR IGNORE INTO "PackStats" ("PackID", "Downloads") VALUES (NEW."PackID", 0);
+END;
+CREATE TRIGGER IF NOT EXISTS "PackStats_PackDeleted" AFTER DELETE ON "CardPacks"
+BEGIN
+	DELETE FROM "PackStats" WHERE "PackID" = OLD."PackID";
+END;
+CREATE TRIGGER IF NOT EXISTS "PackStats_Downloaded" AFTER INSERT ON "UserLibraries"
+	WHEN NEW."UID" != (SELECT "UID" FROM "CardPacks" WHERE "PackID" = NEW."PackID")
+BEGIN
+	UPDATE "PackStats" SET "Downloads" = "Downloads" + 1 WHERE "PackID" = NEW."PackID";
+END;
+CREATE TRIGGER IF NOT EXISTS "PackStats_Removed" AFTER DELETE ON "UserLibraries"
+	WHEN OLD."UID" != (SELECT "UID" FROM "CardPacks" WHERE "PackID" = OLD."PackID")
+BEGIN
+	UPDATE "PackStats" SET "Downloads" = "Downloads" - 1 WHERE "PackID" = OLD."PackID";
+END;
+INSERT INTO "PackStats" ("PackID", "Downloads")
+	SELECT "CardPacks"."PackID", (
+		SELECT COUNT(*) FROM "UserLibraries"
+		WHERE "UserLibraries"."PackID" = "CardPacks"."PackID" AND "UserLibraries"."UID" != "CardPacks"."UID"
+	)
+	FROM "CardPacks"
+	WHERE NOT EXISTS (SELECT 1 FROM "PackStats");
 COMMIT;
@@ -3,24 +3,71 @@ import sqlite3
 import bcrypt
 import string
 import random
-from typing import Union, Dict, List, Tuple
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Union, Dict, List, Optional, Tuple, Iterable, Iterator
 
 """
 Handles all database requests with parameterised SQL
 """
 
 
+class PooledConnection(sqlite3.Connection):
+    """
+    SQLite connection which is returned to its pool when closed, so it can be reused.
+    """
+
+    def close(self) -> None:
+        """Return the connection to its pool, discarding any uncommitted changes, or close it if the pool is full."""
+        if self.in_transaction:
+            self.rollback()
+        self.row_factory = None
+        try:
+            self.pool.put_nowait(self)
+        except queue.Full:
+            super().close()
+
+
 class Database:
-    def __init__(self, path: Path) -> None:
+    def __init__(self, path: Path, pool_size: int = 8) -> None:
         """
         Initialises a database object, defining it's directory
 
         Arguments:
             path (Path): Database file path
+            pool_size (int): Maximum number of idle connections kept open for reuse. Defaults to 8.
         """
         self._database_path = path
+        # Idle connections, shared by every thread using this object
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._insert_batch_size = 500
+        # Library rows cached per UID, invalidated whenever a library changes.
+        # The generation counts invalidations, so a read which overlapped one doesn't cache stale rows.
+        self._library_cache = {}
+        self._library_generation = 0
+        self._library_lock = threading.Lock()
+        # Topics only change when the database is checked, so are read once and shared
+        self._topics_cache = None
 
     # Database management
+    def _connect(self) -> PooledConnection:
+        """
+        Return an idle connection from the pool, or open a new one.
+        Closing the connection returns it to the pool.
+        """
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(
+                self._database_path,
+                factory=PooledConnection,
+                check_same_thread=False,
+                timeout=10,
+            )
+            conn.pool = self._pool
+            return conn
+
     def _populate_tables(self) -> None:
         """
         Internal method to ensure the Topics table is correctly populated.
@@ -36,7 +83,7 @@ class Database:
                 0
             )  # Cursor needs resetting to start of file, or line_count is incorrect
             line_count = sum(1 for line in sql_file)
-        conn = sqlite3.connect(self._database_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute("SELECT COUNT(*) FROM Topics;")
@@ -45,6 +92,7 @@ class Database:
         if entity_count != line_count:
             cur.execute("DELETE FROM Topics;")
             cur.executescript(sql_commands)
+            self._topics_cache = None
         conn.commit()
         cur.close()
         conn.close()
@@ -55,7 +103,7 @@ class Database:
         try:
             with open(sql_file_path, "r") as sql_file:
                 qry = sql_file.read()
-            conn = sqlite3.connect(self._database_path)
+            conn = self._connect()
             cur = conn.cursor()
             cur.executescript(qry)
             cur.close()
@@ -107,7 +155,7 @@ class Database:
                 If the username is available, returns an empty string.
         """
         err_str = ""
-        conn = sqlite3.connect(self._database_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute(
@@ -132,7 +180,7 @@ class Database:
                 If the email is available, returns an empty string.
         """
         err_str = ""
-        conn = sqlite3.connect(self._database_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute("SELECT Email FROM Users WHERE Email = ?;", (email,))
@@ -174,7 +222,7 @@ class Database:
 
     def get_first_name(self, UID) -> str:
         """Return a user's first name, using a UID"""
-        conn = sqlite3.connect(self._database_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute("SELECT FirstName FROM Users WHERE UID = ?;", (UID,))
@@ -201,7 +249,7 @@ class Database:
                 - err_msg (str): Error message if a login fails, for displaying to the user.
         """
         auth_result = {"auth": False, "UID": None, "err_msg": ""}
-        conn = sqlite3.connect(self._database_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         # Check for existence of username in Users
@@ -251,7 +299,7 @@ class Database:
         results_dict = self._val_create_credentials(inp_username, inp_email)
         if results_dict["result"]:
             try:
-                conn = sqlite3.connect(self._database_path)
+                conn = self._connect()
                 conn.row_factory = sqlite3.Row
                 cur = conn.cursor()
                 cur.execute(
@@ -289,7 +337,9 @@ class Database:
                 - 'topic_id' (str): The ID of the topic.
                 - 'theory_directory' (Path): The directory path to the theory contents.
         """
-        conn = sqlite3.connect(self._database_path)
+        if self._topics_cache is not None:
+            return self._topics_cache
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute("SELECT * FROM Topics;")
@@ -306,6 +356,7 @@ class Database:
                     / Path(*entity["TopicContents"].split("/")),
                 }
             )
+        self._topics_cache = topic_dicts
         return topic_dicts
 
     @property
@@ -316,7 +367,7 @@ class Database:
         Returns:
             list[str]: List of topic names.
         """
-        conn = sqlite3.connect(self._database_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute("SELECT TopicName FROM Topics;")
@@ -334,7 +385,7 @@ class Database:
             UID: User's ID.
             topic_id: TopicID.
         """
-        conn = sqlite3.connect(self._database_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         # Check if the entity is not duplicate
@@ -362,7 +413,7 @@ class Database:
         Returns:
             list[str]: List of topic names
         """
-        conn = sqlite3.connect(self._database_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute(
@@ -392,19 +443,24 @@ class Database:
         Returns:
             str: Subpath to the JSON file containing the topic's study pages.
         """
-        conn = sqlite3.connect(self._database_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute("SELECT TopicContents FROM Topics WHERE TopicID = ?", (topic_id,))
-        return cur.fetchone()[0]
+        theory_path = cur.fetchone()[0]
+        cur.close()
+        conn.close()
+        return theory_path
 
     # Flashcard management
-    def _gen_share_id(self, length: int) -> str:
+    def _gen_share_id(self, length: int, cur: sqlite3.Cursor = None) -> str:
         """
         Generate a unique shareID for a flashcard pack.
 
         Arguments:
             length (int): The length of the generated shareID.
+            cur (sqlite3.Cursor): Optional. Cursor of an open transaction, so packs it has inserted are also checked.
+                                  Defaults to None, using a connection from the pool.
 
         Returns:
             str: Unique shareID.
@@ -413,21 +469,28 @@ class Database:
         characters = string.ascii_letters + string.digits
         while unique == False:
             share_id = "".join(random.choice(characters) for i in range(length))
-            conn = sqlite3.connect(self._database_path)
+            if cur is not None:
+                cur.execute(
+                    "SELECT COUNT(*) FROM CardPacks WHERE ShareID = ?;", (share_id,)
+                )
+                unique = cur.fetchone()[0] == 0
+                continue
+            conn = self._connect()
             conn.row_factory = sqlite3.Row
-            cur = conn.cursor()
-            cur.execute(
+            pool_cur = conn.cursor()
+            pool_cur.execute(
                 "SELECT COUNT(*) FROM CardPacks WHERE ShareID = ?;", (share_id,)
             )
-            if cur.fetchone()[0] == 0:
+            if pool_cur.fetchone()[0] == 0:
                 unique = True
-            cur.close()
+            pool_cur.close()
             conn.close()
         return share_id
 
-    def get_user_library(self, UID: int) -> List[Dict[str, int]]:
+    def get_user_library(self, UID: int) -> List[Dict[str, Union[int, str, bool]]]:
         """
-        Retrieves the flashcard library of a user.
+        Retrieves the flashcard library of a user, alongside metadata for each pack.
+        Results are cached per user until the library is changed, and each call returns its own copy.
 
         Argumnets:
             UID: User's ID.
@@ -436,35 +499,92 @@ class Database:
             List of dictionaries, each containing:
                 - 'pack_name' (str): The name of the flashcard pack.
                 - 'pack_id' (int): The ID of the flashcard pack.
+                - 'share_id' (str): The ShareID of the flashcard pack.
+                - 'owner' (str): Username of the pack's creator.
+                - 'card_count' (int): The number of cards in the pack.
+                - 'total_points' (int): The sum of points for all cards in the pack.
+                - 'completed_count' (int): The number of cards the user has scored on the leaderboard.
+                - 'completed' (bool): True if the user has scored every scorable (non-reveal) card.
         """
-        conn = sqlite3.connect(self._database_path)
+        with self._library_lock:
+            cached_library = self._library_cache.get(UID)
+            generation = self._library_generation
+        if cached_library is not None:
+            return [dict(pack) for pack in cached_library]
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute(
             """
             SELECT 
-                UserLibraries.PackID,
-                CardPacks.PackName
+                CardPacks.PackID,
+                CardPacks.PackName,
+                CardPacks.ShareID,
+                Users.Username AS Owner,
+                COUNT(Cards.CardID) AS CardCount,
+                COALESCE(SUM(Cards.Points), 0) AS TotalPoints,
+                COALESCE(SUM(Cards.QuestionType != 'Reveal'), 0) AS ScorableCount,
+                COALESCE(SUM(
+                    EXISTS (
+                        SELECT 1 FROM Leaderboard
+                        WHERE Leaderboard.UID = UserLibraries.UID AND Leaderboard.CardID = Cards.CardID
+                    )
+                ), 0) AS CompletedCount
             FROM
                 UserLibraries
             INNER JOIN
-                CardPacks ON UserLibraries.PackID=CardPacks.PackID
+                CardPacks ON UserLibraries.PackID = CardPacks.PackID
+            LEFT JOIN
+                Users ON CardPacks.UID = Users.UID
+            LEFT JOIN
+                CardLocations ON CardPacks.PackID = CardLocations.PackID
+            LEFT JOIN
+                Cards ON CardLocations.CardID = Cards.CardID
             WHERE 
-                UserLibraries.UID = ?;
+                UserLibraries.UID = ?
+            GROUP BY
+                UserLibraries.LibraryID
+            ORDER BY
+                UserLibraries.LibraryID;
             """,
             (UID,),
         )
         user_library = cur.fetchall()
         cur.close()
         conn.close()
-        if not user_library:
-            return []
         flashcard_packs_list = []
         for pack in user_library:
             flashcard_packs_list.append(
-                {"pack_name": pack["PackName"], "pack_id": pack["PackID"]}
+                {
+                    "pack_name": pack["PackName"],
+                    "pack_id": pack["PackID"],
+                    "share_id": pack["ShareID"],
+                    "owner": pack["Owner"],
+                    "card_count": pack["CardCount"],
+                    "total_points": pack["TotalPoints"],
+                    "completed_count": pack["CompletedCount"],
+                    "completed": pack["ScorableCount"] > 0
+                    and pack["CompletedCount"] >= pack["ScorableCount"],
+                }
             )
-        return flashcard_packs_list
+        with self._library_lock:
+            if self._library_generation == generation:
+                self._library_cache[UID] = flashcard_packs_list
+        return [dict(pack) for pack in flashcard_packs_list]
+
+    def _invalidate_library(self, UID: int = None) -> None:
+        """
+        Discard cached library rows.
+
+        Arguments:
+            UID (int): User whose library changed. Defaults to None, which clears every user's library.
+        """
+        with self._library_lock:
+            self._library_generation += 1
+            if UID is None:
+                self._library_cache.clear()
+            else:
+                self._library_cache.pop(UID, None)
 
     def download_pack(self, inp_share_id: str, UID: int) -> Dict[bool, str]:
         """
@@ -480,7 +600,7 @@ class Database:
                 - 'err_msg' (str): Contains appropriate error message for the user.
         """
         result = {"result": False, "err_msg": ""}
-        conn = sqlite3.connect(self._database_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute("SELECT PackID FROM CardPacks WHERE ShareID = ?;", (inp_share_id,))
@@ -497,6 +617,7 @@ class Database:
                     (UID, pack_id),
                 )
                 conn.commit()
+                self._invalidate_library(UID)
                 result["result"] = True
             else:
                 result["err_msg"] = "You already have this pack."
@@ -506,6 +627,89 @@ class Database:
         conn.close()
         return result
 
+    def get_pack_catalog(
+        self, order: str = "popular", cursor: Tuple[int, ...] = None, limit: int = 20
+    ) -> Tuple[List[Dict[str, Union[int, str]]], Union[Tuple[int, ...], None]]:
+        """
+        Retrieve a page of the public card pack catalog using keyset pagination.
+        Download counts are kept up to date by triggers on UserLibraries, so browsing never recounts them.
+
+        Arguments:
+            order (str): "popular" to rank by downloads, or "recent" to rank by newest pack. Defaults to "popular".
+            cursor (Tuple[int, ...]): Cursor returned with the previous page. Defaults to None (first page).
+            limit (int): Maximum number of packs in the page. Defaults to 20.
+
+        Returns:
+            A tuple containing the page and the cursor for the next page (None if this is the last page).
+            Each pack in the page is a dictionary containing the following keys:
+            - 'pack_id': (int) PackID of the pack.
+            - 'pack_name': (str) Name of the pack.
+            - 'share_id': (str) ShareID of the pack.
+            - 'owner': (str) Username of the pack's creator.
+            - 'downloads': (int) Number of users (excluding the owner) with the pack in their library.
+            - 'card_count': (int) Number of cards in the pack.
+        """
+        select_qry = """
+            SELECT
+                CardPacks.PackID,
+                CardPacks.PackName,
+                CardPacks.ShareID,
+                Users.Username AS Owner,
+                PackStats.Downloads,
+                (SELECT COUNT(*) FROM CardLocations WHERE CardLocations.PackID = CardPacks.PackID) AS CardCount
+            FROM
+                PackStats
+            INNER JOIN
+                CardPacks ON PackStats.PackID = CardPacks.PackID
+            LEFT JOIN
+                Users ON CardPacks.UID = Users.UID
+            """
+        if order == "recent":
+            if cursor is None:
+                where_qry, params = "", ()
+            else:
+                where_qry, params = "WHERE PackStats.PackID < ?", (cursor[0],)
+            order_qry = "ORDER BY PackStats.PackID DESC"
+        else:
+            if cursor is None:
+                where_qry, params = "", ()
+            else:
+                where_qry = "WHERE (PackStats.Downloads, PackStats.PackID) < (?, ?)"
+                params = (cursor[0], cursor[1])
+            order_qry = "ORDER BY PackStats.Downloads DESC, PackStats.PackID DESC"
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cur = conn.cursor()
+        cur.execute(
+            f"{select_qry} {where_qry} {order_qry} LIMIT ?;",
+            (*params, limit + 1),
+        )
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        # One extra row is fetched to know whether another page exists
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            if order == "recent":
+                next_cursor = (last["PackID"],)
+            else:
+                next_cursor = (last["Downloads"], last["PackID"])
+        catalog = []
+        for row in rows:
+            catalog.append(
+                {
+                    "pack_id": row["PackID"],
+                    "pack_name": row["PackName"],
+                    "share_id": row["ShareID"],
+                    "owner": row["Owner"],
+                    "downloads": row["Downloads"],
+                    "card_count": row["CardCount"],
+                }
+            )
+        return catalog, next_cursor
+
     def get_share_id(self, PackID: int) -> str:
         """
         Retrieve the ShareID of a card pack.
@@ -516,7 +720,7 @@ class Database:
         Returns:
             str: ShareID of pack
         """
-        conn = sqlite3.connect(self._database_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute("SELECT ShareID FROM CardPacks WHERE PackID = ?;", (PackID,))
@@ -525,64 +729,309 @@ class Database:
         conn.close()
         return share_id
 
+    def _get_or_insert_card(
+        self, cur: sqlite3.Cursor, card: Dict[str, Union[int, str]]
+    ) -> int:
+        """
+        Return the CardID of an identical card if one exists, otherwise insert the card.
+
+        Arguments:
+            cur (sqlite3.Cursor): Cursor of the open transaction.
+            card (dict): Card data formatted as {"question": str, "answer": str, "points": int, "question_type": str}.
+
+        Returns:
+            int: CardID of the existing or inserted card.
+        """
+        card_values = (
+            card["question"],
+            card["answer"],
+            card["points"],
+            card["question_type"],
+        )
+        cur.execute(
+            "SELECT CardID FROM Cards WHERE Question = ? AND Answer = ? AND Points = ? AND QuestionType = ?;",
+            card_values,
+        )
+        duplicate_card = cur.fetchone()
+        if duplicate_card:
+            return duplicate_card["CardID"]
+        cur.execute(
+            "INSERT INTO Cards (Question, Answer, Points, QuestionType) VALUES (?, ?, ?, ?);",
+            card_values,
+        )
+        return cur.lastrowid
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Run statements in a single transaction, committed when the block finishes.
+        If the block raises an exception, every change made in it is rolled back.
+
+        Yields:
+            sqlite3.Cursor: Cursor of the transaction, returning rows as sqlite3.Row.
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cur = conn.cursor()
+        try:
+            yield cur
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+            conn.close()
+
+    def _insert_pack(
+        self, cur: sqlite3.Cursor, pack_name: str, card_ids: Iterable[int], UID: int
+    ) -> int:
+        """
+        Insert a pack into CardPacks and the user's library, linking it to existing cards.
+        Card IDs are consumed lazily and their locations inserted in batches.
+
+        Arguments:
+            cur (sqlite3.Cursor): Cursor of the open transaction.
+            pack_name (str): Name of the pack.
+            card_ids (Iterable[int]): CardIDs of the pack's cards, in order.
+            UID (int): User ID to be linked to the pack.
+
+        Returns:
+            int: PackID of the new pack.
+        """
+        cur.execute(
+            "INSERT INTO CardPacks (UID, PackName, ShareID) VALUES (?, ?, ?);",
+            (UID, pack_name, self._gen_share_id(6, cur)),
+        )
+        pack_id = cur.lastrowid
+        location_rows = []
+        for card_id in card_ids:
+            location_rows.append((pack_id, card_id))
+            if len(location_rows) == self._insert_batch_size:
+                cur.executemany(
+                    "INSERT INTO CardLocations (PackID, CardID) VALUES (?, ?);",
+                    location_rows,
+                )
+                location_rows = []
+        cur.executemany(
+            "INSERT INTO CardLocations (PackID, CardID) VALUES (?, ?);",
+            location_rows,
+        )
+        cur.execute(
+            "INSERT INTO UserLibraries (UID, PackID) VALUES (?, ?);", (UID, pack_id)
+        )
+        return pack_id
+
     def create_flashcard_pack(
-        self, pack_name: str, cards_list: list[dict], UID: int
-    ) -> None:
+        self, pack_name: str, cards_list: Iterable[dict], UID: int
+    ) -> int:
         """
         Insert entities into CardPacks, Cards and CardLocations tables.
+        Cards are consumed lazily and their locations inserted in batches, in a single transaction.
 
         Arguments:
             pack_name (str): Name of the pack (user input).
-            cards_list (list[dict]): List of dictionaries containing card data.
+            cards_list (Iterable[dict]): List (or any iterable) of dictionaries containing card data.
                 - Dictionaries formatted as: {"question": str, "answer": str, "points": int, "question_type": str}.
             UID (int): User ID to be linked to the pack.
+
+        Returns:
+            int: PackID of the new pack.
+        """
+        with self.transaction() as cur:
+            pack_id = self._insert_pack(
+                cur,
+                pack_name,
+                (self._get_or_insert_card(cur, card) for card in cards_list),
+                UID,
+            )
+        self._invalidate_library(UID)
+        return pack_id
+
+    def fork_card_pack(
+        self, pack_id: int, UID: int, pack_name: str
+    ) -> Dict[str, Union[bool, int, str]]:
         """
-        share_id = self._gen_share_id(6)
-        conn = sqlite3.connect(self._database_path)
+        Create a copy of a card pack for a user, sharing the original pack's cards.
+        Only CardLocations entities are inserted; cards are copied when they're edited in the fork.
+
+        Arguments:
+            pack_id (int): PackID of the pack being forked.
+            UID (int): UID of the user forking the pack (the pack must be in their library).
+            pack_name (str): Name of the new pack.
+
+        Returns:
+            Dictionary with result information:
+                - 'result' (bool): True if the pack was forked, otherwise False.
+                - 'pack_id' (int): PackID of the new pack, None if not forked.
+                - 'err_msg' (str): Contains appropriate error message for the user.
+        """
+        result = {"result": False, "pack_id": None, "err_msg": ""}
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute(
-            "INSERT INTO CardPacks (UID, PackName, ShareID) VALUES (?, ?, ?);",
-            (UID, pack_name, share_id),
+            "SELECT COUNT(*) FROM UserLibraries WHERE UID = ? AND PackID = ?;",
+            (UID, pack_id),
         )
-        cur.execute("SELECT PackID FROM CardPacks WHERE ShareID = ?;", (share_id,))
-        pack_id = cur.fetchone()["PackID"]
-        card_id_list = []
-        for card in cards_list:
+        if cur.fetchone()[0] == 0:
+            result["err_msg"] = "You can only fork packs in your library."
+        else:
             cur.execute(
-                "SELECT CardID FROM Cards WHERE Question = ? AND Answer = ? AND Points = ? AND QuestionType = ?;",
-                (
-                    card["question"],
-                    card["answer"],
-                    card["points"],
-                    card["question_type"],
-                ),
+                "INSERT INTO CardPacks (UID, PackName, ShareID) VALUES (?, ?, ?);",
+                (UID, pack_name, self._gen_share_id(6, cur)),
             )
-            duplicate_card = cur.fetchone()
-            if duplicate_card:
-                card_id_list.append(duplicate_card["CardID"])
-            else:
-                cur.execute(
-                    "INSERT INTO Cards (Question, Answer, Points, QuestionType) VALUES (?, ?, ?, ?);",
-                    (
-                        card["question"],
-                        card["answer"],
-                        card["points"],
-                        card["question_type"],
-                    ),
-                )
-                card_id_list.append(cur.lastrowid)
-        for card_id in card_id_list:
+            fork_id = cur.lastrowid
             cur.execute(
-                "INSERT INTO CardLocations (PackID, CardID) VALUES (?, ?);",
-                (pack_id, card_id),
+                """
+                INSERT INTO CardLocations (PackID, CardID)
+                    SELECT ?, CardID FROM CardLocations WHERE PackID = ? ORDER BY LocationID;
+                """,
+                (fork_id, pack_id),
             )
+            cur.execute(
+                "INSERT INTO UserLibraries (UID, PackID) VALUES (?, ?);",
+                (UID, fork_id),
+            )
+            conn.commit()
+            self._invalidate_library(UID)
+            result["result"], result["pack_id"] = True, fork_id
+        cur.close()
+        conn.close()
+        return result
+
+    def _write_pack_card(
+        self,
+        cur: sqlite3.Cursor,
+        pack_id: int,
+        card_id: int,
+        card: Dict[str, Union[int, str]],
+    ) -> int:
+        """
+        Replace the contents of a card within one pack, copying the card if other packs share it.
+            - Reuse an identical card if one exists.
+            - Update the card in place if only this pack uses it, discarding its scores.
+            - Otherwise insert a new card and point this pack's CardLocations entity at it.
+
+        Arguments:
+            cur (sqlite3.Cursor): Cursor of the open transaction.
+            pack_id (int): PackID of the pack being edited.
+            card_id (int): CardID of the card being replaced.
+            card (dict): New card data formatted as {"question": str, "answer": str, "points": int, "question_type": str}.
+
+        Returns:
+            int: CardID holding the new contents for this pack.
+        """
+        card_values = (
+            card["question"],
+            card["answer"],
+            card["points"],
+            card["question_type"],
+        )
         cur.execute(
-            "INSERT INTO UserLibraries (UID, PackID) VALUES (?, ?);", (UID, pack_id)
+            "SELECT CardID FROM Cards WHERE Question = ? AND Answer = ? AND Points = ? AND QuestionType = ?;",
+            card_values,
+        )
+        identical_card = cur.fetchone()
+        if identical_card and identical_card["CardID"] == card_id:
+            return card_id
+        cur.execute("SELECT COUNT(*) FROM CardLocations WHERE CardID = ?;", (card_id,))
+        shared = cur.fetchone()[0] > 1
+        if identical_card is None and not shared:
+            cur.execute(
+                "UPDATE Cards SET Question = ?, Answer = ?, Points = ?, QuestionType = ? WHERE CardID = ?;",
+                (*card_values, card_id),
+            )
+            # Scores were earned on the card's old contents
+            cur.execute("DELETE FROM Leaderboard WHERE CardID = ?;", (card_id,))
+            return card_id
+        if identical_card is None:
+            cur.execute(
+                "INSERT INTO Cards (Question, Answer, Points, QuestionType) VALUES (?, ?, ?, ?);",
+                card_values,
+            )
+            new_card_id = cur.lastrowid
+        else:
+            new_card_id = identical_card["CardID"]
+        cur.execute(
+            "UPDATE CardLocations SET CardID = ? WHERE PackID = ? AND CardID = ?;",
+            (new_card_id, pack_id, card_id),
+        )
+        # The old card is no longer used by any pack
+        if not shared:
+            cur.execute("DELETE FROM Cards WHERE CardID = ?;", (card_id,))
+            cur.execute("DELETE FROM Leaderboard WHERE CardID = ?;", (card_id,))
+        return new_card_id
+
+    def apply_pack_changes(
+        self,
+        pack_id: int,
+        UID: int,
+        added: List[Dict[str, Union[int, str]]],
+        removed: List[int],
+        changed: Dict[int, Dict[str, Union[int, str]]],
+    ) -> Dict[str, Union[bool, str, list, dict]]:
+        """
+        Persist the edits made to a card pack in one transaction, leaving unchanged cards untouched.
+            - Remove entities in CardLocations for removed cards, deleting cards (and their Leaderboard entities) no other pack uses.
+            - Write changed cards, copying any card shared with other packs.
+            - Insert (or reuse) added cards and link them to the pack.
+
+        Arguments:
+            pack_id (int): PackID of the pack being edited.
+            UID (int): UID of user for confirming they are the owner of the pack.
+            added (List[dict]): Cards to add, formatted as in create_flashcard_pack.
+            removed (List[int]): CardIDs of cards to remove from the pack.
+            changed (Dict[int, dict]): New card data for edited cards, by CardID.
+
+        Returns:
+            Dictionary with result information:
+                - 'result' (bool): True if the changes were saved, otherwise False.
+                - 'err_msg' (str): Contains appropriate error message for the user.
+                - 'added_ids' (List[int]): CardIDs of the added cards, in order.
+                - 'changed_ids' (Dict[int, int]): CardID now holding each changed card's contents, by previous CardID.
+        """
+        result = {"result": False, "err_msg": "", "added_ids": [], "changed_ids": {}}
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT COUNT(*) FROM CardPacks WHERE PackID = ? AND UID = ?;",
+            (pack_id, UID),
+        )
+        if cur.fetchone()[0] == 0:
+            result["err_msg"] = "Failed to save, you are not the owner of this pack."
+            cur.close()
+            conn.close()
+            return result
+        for card_id in removed:
+            cur.execute(
+                "DELETE FROM CardLocations WHERE PackID = ? AND CardID = ?;",
+                (pack_id, card_id),
+            )
+            cur.execute(
+                "SELECT COUNT(*) FROM CardLocations WHERE CardID = ?;", (card_id,)
+            )
+            if cur.fetchone()[0] == 0:
+                cur.execute("DELETE FROM Cards WHERE CardID = ?;", (card_id,))
+                cur.execute("DELETE FROM Leaderboard WHERE CardID = ?;", (card_id,))
+        for card_id, card in changed.items():
+            result["changed_ids"][card_id] = self._write_pack_card(
+                cur, pack_id, card_id, card
+            )
+        for card in added:
+            result["added_ids"].append(self._get_or_insert_card(cur, card))
+        cur.executemany(
+            "INSERT INTO CardLocations (PackID, CardID) VALUES (?, ?);",
+            [(pack_id, card_id) for card_id in result["added_ids"]],
         )
         conn.commit()
         cur.close()
         conn.close()
+        # Card counts and points change for every library holding the pack
+        self._invalidate_library()
+        result["result"] = True
+        return result
 
     def delete_card_pack(self, pack_id: int, UID: int) -> str:
         """
@@ -600,50 +1049,50 @@ class Database:
         Returns:
             str: Message containing the deletion result
         """
-        conn = sqlite3.connect(self._database_path)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        # Check if user owns card pack
-        cur.execute(
-            "SELECT COUNT(*) FROM CardPacks WHERE PackID = ? AND UID = ?;",
-            (pack_id, UID),
-        )
-        # If user owns card pack
-        if cur.fetchone()[0] == 1:
-            _, card_list = self.get_pack_data(pack_id)
-            for card in card_list:
-                # Check how many packs the card exists in
-                cur.execute(
-                    "SELECT COUNT(*) FROM CardLocations WHERE CardID = ?;",
-                    (card["card_id"],),
-                )
-                # Delete the card if it only exists in the pack being deleted
-                exists_once = False
-                if cur.fetchone()[0] == 1:
+        with self.transaction() as cur:
+            # Check if user owns card pack
+            cur.execute(
+                "SELECT COUNT(*) FROM CardPacks WHERE PackID = ? AND UID = ?;",
+                (pack_id, UID),
+            )
+            # If user owns card pack
+            owner = cur.fetchone()[0] == 1
+            if owner:
+                _, card_list = self.get_pack_data(pack_id)
+                for card in card_list:
+                    # Check how many packs the card exists in
                     cur.execute(
-                        "DELETE FROM Cards WHERE CardID = ?;", (card["card_id"],)
+                        "SELECT COUNT(*) FROM CardLocations WHERE CardID = ?;",
+                        (card["card_id"],),
                     )
-                    exists_once = True
-                # Delete entity in CardLocations, bridging the Card to the CardPack entity
-                cur.execute(
-                    "DELETE FROM CardLocations WHERE CardID = ? AND PackID = ?;",
-                    (card["card_id"], pack_id),
-                )
-                # Delete entity in Leaderboard if the will no longer exist
-                if exists_once:
+                    # Delete the card if it only exists in the pack being deleted
+                    exists_once = False
+                    if cur.fetchone()[0] == 1:
+                        cur.execute(
+                            "DELETE FROM Cards WHERE CardID = ?;", (card["card_id"],)
+                        )
+                        exists_once = True
+                    # Delete entity in CardLocations, bridging the Card to the CardPack entity
                     cur.execute(
-                        "DELETE FROM Leaderboard WHERE CardID = ?;", (card["card_id"],)
+                        "DELETE FROM CardLocations WHERE CardID = ? AND PackID = ?;",
+                        (card["card_id"], pack_id),
                     )
-            # Remove the card pack from all user libraries
-            cur.execute("DELETE FROM UserLibraries WHERE PackID = ?;", (pack_id,))
-            # Delete the CardPacks entity
-            cur.execute("DELETE FROM CardPacks WHERE PackID = ?;", (pack_id,))
-            result_str = "Successfully deleted card pack."
-        else:
-            result_str = "Failed to delete, you are not the owner of this pack."
-        conn.commit()
-        cur.close()
-        conn.close()
+                    # Delete entity in Leaderboard if the will no longer exist
+                    if exists_once:
+                        cur.execute(
+                            "DELETE FROM Leaderboard WHERE CardID = ?;",
+                            (card["card_id"],),
+                        )
+                # Remove the card pack from all user libraries
+                cur.execute("DELETE FROM UserLibraries WHERE PackID = ?;", (pack_id,))
+                # Delete the CardPacks entity
+                cur.execute("DELETE FROM CardPacks WHERE PackID = ?;", (pack_id,))
+                result_str = "Successfully deleted card pack."
+            else:
+                result_str = "Failed to delete, you are not the owner of this pack."
+        # The pack is removed from every library it was in, once the deletes are committed
+        if owner:
+            self._invalidate_library()
         return result_str
 
     def get_pack_data(
@@ -664,30 +1113,83 @@ class Database:
             - 'question_type': (str) Type of the question.
             - 'points': (int) Points assigned to the card.
         """
-        conn = sqlite3.connect(self._database_path)
+        return self.get_pack_name(pack_id), list(self.iter_pack_cards(pack_id))
+
+    def get_pack_name(self, pack_id: int) -> Optional[str]:
+        """Return the name of a card pack using a PackID, otherwise None if no pack has that PackID."""
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute("SELECT PackName FROM CardPacks WHERE PackID = ?", (pack_id,))
-        pack_name = cur.fetchone()[0]
-        cur.execute(
-            "SELECT Cards.* FROM Cards INNER JOIN CardLocations ON Cards.CardID = CardLocations.CardID WHERE CardLocations.PackID = ?;",
-            (pack_id,),
-        )
-        cards_table = cur.fetchall()
+        row = cur.fetchone()
         cur.close()
         conn.close()
-        cards_list = []
-        for row in cards_table:
-            cards_list.append(
-                {
+        return row[0] if row is not None else None
+
+    def iter_pack_cards(self, pack_id: int) -> Iterator[Dict[str, Union[int, str]]]:
+        """
+        Yield the cards of a flashcard pack one at a time, in the order they were added.
+        Rows are streamed from the cursor, so memory use does not grow with the size of the pack.
+
+        Arguments:
+            pack_id (int): PackID of the flashcard pack.
+
+        Yields:
+            Dictionaries formatted as in get_pack_data.
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cur = conn.cursor()
+        try:
+            cur.execute(
+                "SELECT Cards.* FROM Cards INNER JOIN CardLocations ON Cards.CardID = CardLocations.CardID WHERE CardLocations.PackID = ? ORDER BY CardLocations.LocationID;",
+                (pack_id,),
+            )
+            for row in cur:
+                yield {
                     "card_id": row["CardID"],
                     "question": row["Question"],
                     "answer": row["Answer"],
                     "question_type": row["QuestionType"],
                     "points": row["Points"],
                 }
+        finally:
+            cur.close()
+            conn.close()
+
+    def iter_cards_in_packs(
+        self, pack_ids: List[int]
+    ) -> Iterator[Dict[str, Union[int, str]]]:
+        """
+        Yield every card used by any of a set of packs once, in order of CardID.
+        Rows are streamed from the cursor, so memory use does not grow with the number of cards.
+
+        Arguments:
+            pack_ids (List[int]): PackIDs of the packs.
+
+        Yields:
+            Dictionaries formatted as in get_pack_data.
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cur = conn.cursor()
+        placeholders = ", ".join("?" for _ in pack_ids)
+        try:
+            cur.execute(
+                f"SELECT * FROM Cards WHERE CardID IN (SELECT CardID FROM CardLocations WHERE PackID IN ({placeholders})) ORDER BY CardID;",
+                list(pack_ids),
             )
-        return pack_name, cards_list
+            for row in cur:
+                yield {
+                    "card_id": row["CardID"],
+                    "question": row["Question"],
+                    "answer": row["Answer"],
+                    "question_type": row["QuestionType"],
+                    "points": row["Points"],
+                }
+        finally:
+            cur.close()
+            conn.close()
 
     # Leaderboard management
     def get_leaderboard(self) -> List[Dict[str, Union[int, str]]]:
@@ -701,7 +1203,7 @@ class Database:
             - 'username': (str) Username.
             - 'score': (int) Total score.
         """
-        conn = sqlite3.connect(self._database_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute(
@@ -744,7 +1246,7 @@ class Database:
             UID (int): The ID of the user completing the cards.
             card_list (list[int]): A list of card IDs completed by the user.
         """
-        conn = sqlite3.connect(self._database_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         for card_id in card_ids:
@@ -768,3 +1270,5 @@ class Database:
         conn.commit()
         cur.close()
         conn.close()
+        # Completion status in the user's library depends on the leaderboard
+        self._invalidate_library(UID)
@@ -1,6 +1,10 @@
 import networkx as nx
+import matplotlib
+
+# Graphs are only drawn to images, possibly from worker threads, so no GUI backend is needed
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
-from pathlib import Path
+from io import BytesIO
 from typing import List
 
 """
@@ -9,36 +13,47 @@ Visualises graphs through multiple input methods
 
 
 class GraphVisualiser:
-    def save_graph_from_adjacency_list(
-        adj_list: dict, filename: str = "graph_demo"
-    ) -> Path:
+    # Seed for the spring layout, so the same graph is always drawn the same way
+    layout_seed = 1
+
+    def _png_bytes() -> bytes:
+        """Encode the current figure as a PNG image in memory, then close it."""
+        with BytesIO() as buffer:
+            plt.savefig(buffer, format="PNG")
+            plt.close()
+            return buffer.getvalue()
+
+    def render_graph_from_adjacency_list(adj_list: dict) -> bytes:
         """
-        Generate and save a graph image from an adjacency list.
+        Generate a graph image from an adjacency list.
 
         Arguments:
             adj_list (dict): Adjacency list representing the graph.
 
         Returns:
-            Path directory for image
+            bytes: The PNG image.
         """
-        G = nx.DiGraph(adj_list)
-        nx.draw(G, with_labels=True, arrows=True)
-        file_path = Path.cwd() / "assets" / f"{filename}.png"
-        plt.savefig(file_path, format="PNG")
-        plt.close()
-        return file_path
-
-    def save_graph_from_adjacency_matrix(
-        adj_matrix: List[List[int]], filename: str = "graph_demo"
-    ) -> Path:
+        # Nodes and edges are added in sorted order, so the layout only depends on the graph's structure
+        G = nx.DiGraph()
+        G.add_nodes_from(sorted(adj_list))
+        G.add_edges_from(
+            (node, neighbour)
+            for node in sorted(adj_list)
+            for neighbour in sorted(adj_list[node])
+        )
+        pos = nx.spring_layout(G, seed=GraphVisualiser.layout_seed)
+        nx.draw(G, pos, with_labels=True, arrows=True)
+        return GraphVisualiser._png_bytes()
+
+    def render_graph_from_adjacency_matrix(adj_matrix: List[List[int]]) -> bytes:
         """
-        Generate and save a graph image from an adjacency matrix.
+        Generate a graph image from an adjacency matrix.
 
         Arguments:
             adj_matrix (2D list): Adjacency matrix representing the graph.
 
         Returns:
-            Path directory for image
+            bytes: The PNG image.
         """
         G = nx.Graph()
         num_nodes = len(adj_matrix)
@@ -46,12 +61,8 @@ class GraphVisualiser:
             for j in range(num_nodes):
                 if adj_matrix[i][j] != 0:
                     G.add_edge(i, j, weight=adj_matrix[i][j])
-        pos = nx.spring_layout(G)
+        pos = nx.spring_layout(G, seed=GraphVisualiser.layout_seed)
         nx.draw(G, pos, with_labels=True)
         edge_labels = nx.get_edge_attributes(G, "weight")
         nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels)
-        # Save image
-        file_path = Path.cwd() / "assets" / f"{filename}.png"
-        plt.savefig(file_path, format="PNG")
-        plt.close()
-        return file_path
+        return GraphVisualiser._png_bytes()
@@ -1,7 +1,11 @@
 import PySimpleGUI as sg
 from pathlib import Path
 from data_handler import DataHandler
-from typing import List, Any, Union
+from asset_atlas import AssetAtlas
+from job_executor import JobExecutor
+from typing import Dict, List, Any, Callable, Union
+import sys
+import time
 
 """
 Displays the GUI
@@ -9,10 +13,13 @@ Displays the GUI
 
 
 class GUI:
-    def __init__(self) -> None:
+    def __init__(self, profile_events: bool = False) -> None:
         """
         Initialise a GUI object, creating the DataHandler object for supporting
         functions and define variables for styling.
+
+        Arguments:
+            profile_events (bool): Optional. Time each event handler, printing a report when the GUI closes. Defaults to False.
         """
         sg.theme("LightBlue3")
         # Styling
@@ -34,111 +41,56 @@ class GUI:
         self.drop_size = (28, 1)
         self.small_drop_size = (23, 1)
         self.multiline_size = (32, 5)
+        # Pointer icons shown beside each slot of the queues demo
+        self.pointer_icons = {
+            "blank": Path("assets") / "blank_pointer.png",
+            "front": Path("assets") / "right_arrow.png",
+            "rear": Path("assets") / "left_arrow.png",
+        }
+        # What each slot of the queues demo shows, as (element, front pointer, rear pointer)
+        self._queue_slots = []
+        # Time taken by each step of starting the GUI, in seconds
+        self._startup_timings = {}
+        start_time = time.perf_counter()
         self.data_handler = DataHandler()
-        # Layout containing all screens within column elements
+        self._startup_timings["DataHandler"] = time.perf_counter() - start_time
+        # Functions called with the result of each running background job, by job ID
+        self._job_handlers = {}
+        # Screen currently displayed, and the handlers for events on each screen
+        self._active_screen = "-login_layout-"
+        self._event_handlers = self.event_handlers
+        self.profile_events = profile_events
+        # Handler timings by event key, as [calls, total seconds, slowest seconds]
+        self._event_timings = {}
+        # Screens are built the first time they are shown, then kept hidden in the container when not in use
+        self._built_screens = set()
+        start_time = time.perf_counter()
         self.layout = [
             [sg.VPush()],
             [
                 sg.Column(
-                    self.login_layout,
-                    key="-login_layout-",
-                    visible=True,
-                    justification="c",
-                    element_justification="c",
-                ),
-                sg.Column(
-                    self.create_account_layout,
-                    key="-create_account_layout-",
-                    visible=False,
-                    justification="c",
-                    element_justification="c",
-                ),
-                sg.Column(
-                    self.study_menu_layout,
-                    key="-study_menu_layout-",
-                    visible=False,
-                    justification="c",
-                    element_justification="c",
-                ),
-                sg.Column(
-                    self.flashcard_menu_layout,
-                    key="-flashcard_menu_layout-",
-                    visible=False,
-                    justification="c",
-                    element_justification="c",
-                ),
-                sg.Column(
-                    self.flashcard_creator_title_layout,
-                    key="-flashcard_creator_title_layout-",
-                    visible=False,
-                    justification="c",
-                    element_justification="c",
-                ),
-                sg.Column(
-                    self.flashcard_creator_cards_layout,
-                    key="-flashcard_creator_cards_layout-",
-                    visible=False,
-                    justification="c",
-                    element_justification="c",
-                ),
-                sg.Column(
-                    self.flashcard_viewer_layout,
-                    key="-flashcard_viewer_layout-",
-                    visible=False,
-                    justification="c",
-                    element_justification="c",
-                ),
-                sg.Column(
-                    self.trees_demo_layout,
-                    key="-trees_demo_layout-",
-                    visible=False,
-                    justification="c",
-                    element_justification="c",
-                ),
-                sg.Column(
-                    self.trees_view_layout,
-                    key="-trees_view_layout-",
-                    visible=False,
-                    justification="c",
-                    element_justification="c",
-                ),
-                sg.Column(
-                    self.queues_demo_layout,
-                    key="-queues_demo_layout-",
-                    visible=False,
-                    justification="c",
-                    element_justification="c",
-                ),
-                sg.Column(
-                    self.graphs_demo_layout,
-                    key="-graphs_demo_layout-",
-                    visible=False,
-                    justification="c",
-                    element_justification="c",
-                ),
-                sg.Column(
-                    self.graphs_view_layout,
-                    key="-graphs_view_layout-",
-                    visible=False,
-                    justification="c",
-                    element_justification="c",
-                ),
-                sg.Column(
-                    self.leaderboard_layout,
-                    key="-leaderboard_layout-",
-                    visible=False,
+                    [[self._screen_column("-login_layout-", visible=True)]],
+                    key="-screens-",
                     justification="c",
                     element_justification="c",
+                )
+            ],
+            [sg.VPush()],
+            # Progress of background jobs, shown on every screen
+            [
+                sg.Text(
+                    "",
+                    key="-job_status-",
+                    font=(self.font, self.small_text_size),
                 ),
-                sg.Column(
-                    self.topics_layout,
-                    key="-topics_layout-",
+                sg.Button(
+                    "Cancel",
+                    key="-job_cancel-",
+                    font=(self.font, self.button_text_size),
+                    size=(self.xsmall_button_size),
                     visible=False,
-                    justification="c",
-                    element_justification="c",
                 ),
             ],
-            [sg.VPush()],
         ]
         self.window = sg.Window(
             "Study Tool",
@@ -147,7 +99,62 @@ class GUI:
             element_justification="c",
             icon=Path.cwd() / "assets" / "cccc.ico",
             size=(950, 950),
+            finalize=True,
+        )
+        self._startup_timings["Window"] = time.perf_counter() - start_time
+        self.data_handler.job_executor.set_window(self.window)
+        # Pointer icons are decoded now, and other images the first time they are shown
+        start_time = time.perf_counter()
+        self.assets = AssetAtlas(self.window.TKroot)
+        self.assets.preload(self.pointer_icons.values())
+        self._startup_timings["Assets"] = time.perf_counter() - start_time
+        if self.profile_events:
+            self.print_startup_timings()
+
+    def _screen_column(self, screen_key: str, visible: bool = False) -> sg.Column:
+        """
+        Build the column element of a screen from its layout property, recording the time taken.
+
+        Arguments:
+            screen_key (str): Key of the screen, formatted as "-<screen_name>_layout-".
+            visible (bool): Optional. Whether the screen is shown once built. Defaults to False.
+
+        Returns:
+            sg.Column: Column element containing the screen.
+        """
+        start_time = time.perf_counter()
+        column = sg.Column(
+            getattr(self, screen_key.strip("-")),
+            key=screen_key,
+            visible=visible,
+            justification="c",
+            element_justification="c",
         )
+        self._built_screens.add(screen_key)
+        self._startup_timings[screen_key] = time.perf_counter() - start_time
+        return column
+
+    def _ensure_screen(self, screen_key: str) -> None:
+        """Build a screen into the window, if it has not been shown before."""
+        if screen_key not in self._built_screens:
+            self.window.extend_layout(
+                self.window["-screens-"], [[self._screen_column(screen_key)]]
+            )
+
+    @property
+    def startup_timings(self) -> Dict[str, float]:
+        """
+        Return the time taken by each step of starting the GUI, and building each screen.
+
+        Returns:
+            Dict[str, float]: Seconds taken, by step name or screen key, in the order they happened.
+        """
+        return dict(self._startup_timings)
+
+    def print_startup_timings(self) -> None:
+        """Print the time taken by each step of starting the GUI."""
+        for step, seconds in self._startup_timings.items():
+            print(f"{step}: {seconds * 1000:.1f} ms")
 
     """
     Individual screen layouts.
@@ -439,6 +446,30 @@ class GUI:
                 ),
             ],
             [sg.Sizer(0, self.xsmall_sizer)],
+            [
+                sg.Button(
+                    "Browse packs",
+                    key="-flashcard_menu_browse-",
+                    font=(self.font, self.button_text_size),
+                    size=(self.medium_button_size),
+                )
+            ],
+            [sg.Sizer(0, self.xsmall_sizer)],
+            [
+                sg.Button(
+                    "Fork pack",
+                    key="-flashcard_menu_fork-",
+                    font=(self.font, self.button_text_size),
+                    size=(self.small_button_size),
+                ),
+                sg.Button(
+                    "Edit pack",
+                    key="-flashcard_menu_edit_pack-",
+                    font=(self.font, self.button_text_size),
+                    size=(self.small_button_size),
+                ),
+            ],
+            [sg.Sizer(0, self.xsmall_sizer)],
             [
                 sg.Button(
                     "Delete pack",
@@ -489,6 +520,16 @@ class GUI:
                     font=(self.font, self.body_size),
                 )
             ],
+            [
+                sg.Drop(
+                    self.data_handler.tree_types,
+                    key="-trees_demo_type_drop-",
+                    size=self.drop_size,
+                    font=(self.font, self.body_size),
+                    default_value=self.data_handler.tree_types[0],
+                    readonly=True,
+                )
+            ],
             [
                 sg.Checkbox(
                     "Balanced tree",
@@ -543,6 +584,13 @@ class GUI:
                     background_color="black",
                 )
             ],
+            [
+                sg.Text(
+                    "",
+                    key="-trees_view_stats-",
+                    font=(self.font, self.small_text_size),
+                )
+            ],
             [sg.Sizer(0, self.medium_sizer)],
             [
                 sg.Combo(
@@ -561,13 +609,36 @@ class GUI:
                 ),
             ],
             [sg.Sizer(0, self.xsmall_sizer)],
+            [
+                sg.Combo(
+                    self.data_handler.tree_operations,
+                    default_value="Operations",
+                    key="-trees_view_operations_drop-",
+                    size=self.small_drop_size,
+                    font=(self.font, self.body_size),
+                    readonly=True,
+                ),
+                sg.Button(
+                    "Run",
+                    key="-trees_view_operation-",
+                    font=(self.font, self.button_text_size),
+                    size=(self.small_button_size),
+                ),
+            ],
+            [sg.Sizer(0, self.xsmall_sizer)],
             [
                 sg.Button(
                     "Add node",
                     key="-trees_view_add_node-",
                     font=(self.font, self.button_text_size),
                     size=(self.medium_button_size),
-                )
+                ),
+                sg.Button(
+                    "Delete node",
+                    key="-trees_view_delete_node-",
+                    font=(self.font, self.button_text_size),
+                    size=(self.medium_button_size),
+                ),
             ],
             [sg.Sizer(0, self.medium_sizer)],
             [
@@ -1347,7 +1418,8 @@ class GUI:
         ]
 
     def _screen_switch(self, cur_screen_key: str, new_screen_key: str) -> None:
-        """Change displayed layout, loading data when needed."""
+        """Change displayed layout, building it on first use and loading data when needed."""
+        self._ensure_screen(new_screen_key)
         # Load % revised for study menu and greeting with first name
         if new_screen_key == "-study_menu_layout-":
             self.window["-study_menu_revised_percent-"].update(
@@ -1366,6 +1438,7 @@ class GUI:
             self.window["-trees_view_image-"].update(
                 data=self.data_handler.resize_image()
             )
+            self.window["-trees_view_stats-"].update(self.data_handler.tree_stats)
         # Initialise a queue
         elif new_screen_key == "-queues_demo_layout-":
             self.data_handler.initialise_queue()
@@ -1396,6 +1469,7 @@ class GUI:
         # Switch screen
         self.window[cur_screen_key].update(visible=False)
         self.window[new_screen_key].update(visible=True)
+        self._active_screen = new_screen_key
 
     def show_queue_buttons(self, visible_keys: List[str]) -> None:
         """
@@ -1462,15 +1536,12 @@ class GUI:
             self.window["-flashcard_viewer_numerical_column-"].update(visible=True)
         elif top_card["question_type"] == "Multiple Choice":
             # Updating choices drop (answering)
-            numbered_answers = [
-                f"{i+1}" for i, answer in enumerate(top_card["answer"]["all"])
-            ]
             self.window["-flashcard_viewer_choice_drop-"].update(
-                values=numbered_answers
+                values=top_card["choice_numbers"]
             )
-            # Displaying answer options (text)
+            # Displaying answer options (text), prepared ahead by the data handler
             self.window["-flashcard_viewer_multiple_choice_field-"].update(
-                self.data_handler.format_multiple_choice_options(top_card)
+                top_card["choices_text"]
             )
             self.window["-flashcard_viewer_multiple_choice_column-"].update(
                 visible=True
@@ -1502,6 +1573,212 @@ class GUI:
                 text_color=self.text_error_colour,
             )
 
+    def browse_catalog(self) -> bool:
+        """
+        Display the public pack catalog in a separate window, allowing the user to download packs.
+
+        Returns:
+            bool: True if any pack was added to the user's library, otherwise False.
+        """
+        pack_added = False
+        layout = [
+            [
+                sg.Text("Sort by", font=(self.font, self.small_text_size)),
+                sg.Combo(
+                    ["Popular", "Recent"],
+                    default_value="Popular",
+                    key="-catalog_order-",
+                    enable_events=True,
+                    readonly=True,
+                    font=(self.font, self.small_text_size),
+                ),
+            ],
+            [
+                sg.Table(
+                    values=self.data_handler.load_catalog("Popular"),
+                    headings=["Pack", "Owner", "Cards", "Downloads"],
+                    auto_size_columns=False,
+                    col_widths=[25, 20, 8, 10],
+                    justification="c",
+                    key="-catalog_table-",
+                    font=(self.font, self.small_text_size),
+                    select_mode=sg.TABLE_SELECT_MODE_BROWSE,
+                    size=(10, 15),
+                )
+            ],
+            [
+                sg.Button(
+                    "Load more",
+                    key="-catalog_more-",
+                    font=(self.font, self.button_text_size),
+                    size=(self.small_button_size),
+                ),
+                sg.Button(
+                    "Download",
+                    key="-catalog_download-",
+                    font=(self.font, self.button_text_size),
+                    size=(self.small_button_size),
+                ),
+                sg.Button(
+                    "Close",
+                    key="-catalog_close-",
+                    font=(self.font, self.button_text_size),
+                    size=(self.small_button_size),
+                ),
+            ],
+        ]
+        window = sg.Window("Browse packs", layout, modal=True)
+        while True:
+            event, values = window.read()
+            if event in (sg.WINDOW_CLOSED, "-catalog_close-"):
+                break
+            # Re-rank catalog
+            if event == "-catalog_order-":
+                window["-catalog_table-"].update(
+                    values=self.data_handler.load_catalog(values["-catalog_order-"])
+                )
+            # Next page of catalog
+            elif event == "-catalog_more-":
+                rows = self.data_handler.load_more_catalog()
+                if rows is False:
+                    sg.popup_auto_close(
+                        "No more packs to show.",
+                        title="Browse packs",
+                        font=(self.font, self.small_text_size),
+                    )
+                else:
+                    window["-catalog_table-"].update(values=rows)
+            # Add selected pack to library
+            elif event == "-catalog_download-":
+                selected = values["-catalog_table-"]
+                result = self.data_handler.download_catalog_pack(
+                    selected[0] if selected else -1
+                )
+                if result["result"]:
+                    pack_added = True
+                    sg.popup_auto_close(
+                        "Pack added successfully!",
+                        title="Download pack",
+                        font=(self.font, self.small_text_size),
+                    )
+                else:
+                    sg.popup_error(
+                        result["err_msg"],
+                        title="Download pack",
+                        font=(self.font, self.small_text_size),
+                        text_color=self.text_error_colour,
+                    )
+        window.close()
+        return pack_added
+
+    def edit_pack(self) -> None:
+        """
+        Display the cards of the loaded pack in a separate window, allowing the user to
+        edit or remove cards and save only the changes.
+        """
+        layout = [
+            [
+                sg.Listbox(
+                    self.data_handler.editing_questions,
+                    key="-edit_pack_cards-",
+                    size=(50, 12),
+                    font=(self.font, self.small_text_size),
+                )
+            ],
+            [
+                sg.Button(
+                    "Edit card",
+                    key="-edit_pack_edit-",
+                    font=(self.font, self.button_text_size),
+                    size=(self.small_button_size),
+                ),
+                sg.Button(
+                    "Remove card",
+                    key="-edit_pack_remove-",
+                    font=(self.font, self.button_text_size),
+                    size=(self.small_button_size),
+                ),
+            ],
+            [
+                sg.Button(
+                    "Save",
+                    key="-edit_pack_save-",
+                    font=(self.font, self.button_text_size),
+                    size=(self.small_button_size),
+                ),
+                sg.Button(
+                    "Cancel",
+                    key="-edit_pack_cancel-",
+                    font=(self.font, self.button_text_size),
+                    size=(self.small_button_size),
+                ),
+            ],
+        ]
+        window = sg.Window("Edit pack", layout, modal=True)
+        while True:
+            event, values = window.read()
+            if event in (sg.WINDOW_CLOSED, "-edit_pack_cancel-"):
+                break
+            selected = window["-edit_pack_cards-"].get_indexes()
+            # Edit the selected card
+            if event == "-edit_pack_edit-" and selected:
+                card = self.data_handler.get_editing_card(selected[0])
+                question = sg.popup_get_text(
+                    "Prompt: ",
+                    title="Edit card",
+                    default_text=card["question"],
+                    font=(self.font, self.small_text_size),
+                )
+                if question is None:
+                    continue
+                answer = None
+                if card["question_type"] != "Multiple Choice":
+                    answer = sg.popup_get_text(
+                        "Answer: ",
+                        title="Edit card",
+                        default_text=card["answer"],
+                        font=(self.font, self.small_text_size),
+                    )
+                    if answer is None:
+                        continue
+                result = self.data_handler.edit_card(selected[0], question, answer)
+                if result != True:
+                    sg.popup_error(
+                        result,
+                        title="Error",
+                        font=(self.font, self.small_text_size),
+                        text_color=self.text_error_colour,
+                    )
+            # Remove the selected card
+            elif event == "-edit_pack_remove-" and selected:
+                self.data_handler.remove_card(selected[0])
+            # Save changes
+            elif event == "-edit_pack_save-":
+                result = self.data_handler.save_pack_changes()
+                if result == True:
+                    sg.popup_auto_close(
+                        "Pack saved successfully!",
+                        title="Edit pack",
+                        font=(self.font, self.small_text_size),
+                    )
+                    break
+                sg.popup_error(
+                    result,
+                    title="Error",
+                    font=(self.font, self.small_text_size),
+                    text_color=self.text_error_colour,
+                )
+            elif event in ("-edit_pack_edit-", "-edit_pack_remove-"):
+                sg.popup_error(
+                    "Please select a card from the list.",
+                    title="Error",
+                    font=(self.font, self.small_text_size),
+                    text_color=self.text_error_colour,
+                )
+            window["-edit_pack_cards-"].update(self.data_handler.editing_questions)
+        window.close()
+        self.data_handler.clear_current_pack()
+
     def update_topic_page(self, next_page: bool = True) -> bool:
         """
         Update the topic page elements displayed contents.
@@ -1531,7 +1808,9 @@ class GUI:
             self.window["-topics_image-"].update(visible=False)
             self.window["-topics_image_border-"].update(visible=False)
         else:
-            self.window["-topics_image-"].update(filename=image_dir, visible=True)
+            self.window["-topics_image-"].update(
+                data=self.assets.get(image_dir), visible=True
+            )
             self.window["-topics_image_border-"].update(visible=True)
         return True
 
@@ -1550,788 +1829,1165 @@ class GUI:
             rear_index (int): The index of the rear pointer. Defaults to -1.
         """
         max_queue_size = self.data_handler.queue_max_size
-        # Update the display for each element in the queue
+        # Update only the slots whose element or pointers have changed since the last update
         for i in range(max_queue_size):
-            try:
-                # Update the text for the queue element
-                if queue_elements[i]:
-                    self.window[f"-queue_demo_queue_elem_{i}-"].update(
-                        queue_elements[i]
+            element = queue_elements[i] if i < len(queue_elements) else None
+            slot = (element or "", i == front_index, i == rear_index)
+            shown = self._queue_slots[i] if i < len(self._queue_slots) else None
+            if slot == shown:
+                continue
+            if shown is None or slot[0] != shown[0]:
+                self.window[f"-queue_demo_queue_elem_{i}-"].update(slot[0])
+            if shown is None or slot[1] != shown[1]:
+                self.window[f"-queue_demo_front_pointer_{i}-"].update(
+                    data=self.assets.get(
+                        self.pointer_icons["front" if slot[1] else "blank"]
                     )
-                else:
-                    self.window[f"-queue_demo_queue_elem_{i}-"].update("")
-            except:
-                # If an exception occurs (index out of range), update with an empty string
-                self.window[f"-queue_demo_queue_elem_{i}-"].update("")
-            # Clear the front and rear pointers
-            self.window[f"-queue_demo_front_pointer_{i}-"].update(
-                filename="assets/blank_pointer.png"
-            )
-            self.window[f"-queue_demo_rear_pointer_{i}-"].update(
-                filename="assets/blank_pointer.png"
-            )
-        # Display the front and rear pointers
-        if front_index in range(max_queue_size):
-            self.window[f"-queue_demo_front_pointer_{front_index}-"].update(
-                filename="assets/right_arrow.png"
-            )
-        if rear_index in range(max_queue_size):
-            self.window[f"-queue_demo_rear_pointer_{rear_index}-"].update(
-                filename="assets/left_arrow.png"
-            )
+                )
+            if shown is None or slot[2] != shown[2]:
+                self.window[f"-queue_demo_rear_pointer_{i}-"].update(
+                    data=self.assets.get(
+                        self.pointer_icons["rear" if slot[2] else "blank"]
+                    )
+                )
+            if i < len(self._queue_slots):
+                self._queue_slots[i] = slot
+            else:
+                self._queue_slots.append(slot)
 
-    def run(self) -> None:
-        """Display the GUI, responding to events and passing values."""
-        while True:
-            event, values = self.window.read()
+    def start_job(
+        self, name: str, on_done: Callable, function: Callable, *args
+    ) -> None:
+        """
+        Run a slow function in the background, keeping the GUI responsive.
 
-            # Close the GUI
-            if (
-                event == sg.WINDOW_CLOSED
-                or event == "-login_exit-"
-                or event == "-create_account_exit-"
-            ):
-                break
+        Arguments:
+            name (str): Description of the job, shown while it runs. Only one job of each name runs at once.
+            on_done (Callable): Called with the function's result once it finishes.
+            function (Callable): The function to run.
+            *args: Arguments for the function.
+        """
+        if self.data_handler.job_executor.is_running(name):
+            return
+        job_id = self.data_handler.job_executor.submit(name, function, *args)
+        self._job_handlers[job_id] = on_done
+        self.update_job_status()
 
-            # Login screen
-            if self.window["-login_layout-"].Widget.winfo_ismapped():
-                # Go to create account screen
-                if event == "-login_create_account-":
-                    self.window["-login_error_message-"].update("")
-                    self._screen_switch("-login_layout-", "-create_account_layout-")
-                # Attempt to login
-                elif event == "-login_login-":
-                    auth_result = self.data_handler.authenticate_user(
-                        values["-login_username-"], values["-login_password-"]
-                    )
-                    if auth_result["auth"]:
-                        self.window["-login_error_message-"].update("")
-                        self._screen_switch("-login_layout-", "-study_menu_layout-")
-                    else:
-                        self.window["-login_error_message-"].update(
-                            auth_result["err_msg"]
-                        )
-
-            # Create account screen
-            elif self.window["-create_account_layout-"].Widget.winfo_ismapped():
-                # Return to login screen
-                if event == "-create_account_login-":
-                    self.window["-create_account_error_message-"].update("")
-                    self._screen_switch("-create_account_layout-", "-login_layout-")
-                # Attempt to create account
-                elif event == "-create_account_create_account-":
-                    account_creation = False
-                    result = self.data_handler.val_create_address(
-                        values["-create_account_house_number-"],
-                        values["-create_account_postcode-"],
-                    )
-                    if result["result"]:
-                        address_label = result["address"]["label"]
-                        confirm_address = sg.popup_yes_no(
-                            f"Is this your address?\n{address_label}",
-                            title="Confirm your address",
-                            font=(self.font, self.small_text_size),
-                        )
-                        address_dict = result["address"]
-                        if confirm_address == "Yes":
-                            result = self.data_handler.create_account(
-                                values["-create_account_username-"],
-                                values["-create_account_password-"],
-                                values["-create_account_first_name-"],
-                                values["-create_account_email-"],
-                                address_dict,
-                            )
-                            account_creation = result["result"]
-                    if account_creation:
-                        self.window["-create_account_error_message-"].update(
-                            "Account successfully created!", text_color="green"
-                        )
-                    else:
-                        self.window["-create_account_error_message-"].update(
-                            result["err_msg"],
-                            text_color=self.text_error_colour,
-                        )
-
-            # Study menu
-            elif self.window["-study_menu_layout-"].Widget.winfo_ismapped():
-                # Log out
-                if event == "-study_menu_logout-":
-                    self.data_handler.clear_user_data()
-                    self._screen_switch("-study_menu_layout-", "-login_layout-")
-                # Go to leaderboard screen (unfinished)
-                elif event == "-study_menu_leaderboard-":
-                    self._screen_switch("-study_menu_layout-", "-leaderboard_layout-")
-                # Go to flashcard menu
-                elif event == "-study_menu_flashcards-":
-                    self._screen_switch(
-                        "-study_menu_layout-", "-flashcard_menu_layout-"
-                    )
-                # Study topic from drop
-                elif event == "-study_menu_study-":
-                    if (
-                        values["-study_menu_topics_drop-"]
-                        in self.data_handler.topics_list
-                    ):
-                        # Load topic data to data handler
-                        topic_id = self.data_handler.selected_topic_id(
-                            self.window["-study_menu_topics_drop-"].widget.current()
-                        )
-                        self.data_handler.load_topic_id(topic_id)
-                        self._screen_switch("-study_menu_layout-", "-topics_layout-")
-                    else:
-                        sg.popup_error(
-                            "Please select a topic from the dropdown.",
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                # Launch demo
-                elif event == "-study_menu_launch_demo-":
-                    if (
-                        values["-study_menu_topics_drop-"]
-                        in self.data_handler.topics_list
-                    ):
-                        self._screen_switch(
-                            "-study_menu_layout-",
-                            "-{0}_demo_layout-".format(
-                                values["-study_menu_topics_drop-"].lower()
-                            ),
-                        )
-                    else:
-                        sg.popup_error(
-                            "Please select a topic from the dropdown.",
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-
-            # Topic pages
-            elif self.window["-topics_layout-"].Widget.winfo_ismapped():
-                # Next page
-                if event == "-topics_next-":
-                    if not self.update_topic_page():
-                        launch_demo = sg.popup_yes_no(
-                            "No pages this way! Launch demo?",
-                            title="Launch demo",
-                            font=(self.font, self.small_text_size),
-                        )
-                        if launch_demo == "Yes":
-                            self._screen_switch(
-                                "-topics_layout-",
-                                f"-{self.data_handler.topic_name.lower()}_demo_layout-",
-                            )
-                # Previous page
-                elif event == "-topics_previous-":
-                    if not self.update_topic_page(next_page=False):
-                        launch_demo = sg.popup_yes_no(
-                            "No pages this way! Launch demo?",
-                            title="Launch demo",
-                            font=(self.font, self.small_text_size),
-                        )
-                        if launch_demo == "Yes":
-                            self._screen_switch(
-                                "-topics_layout-",
-                                f"-{self.data_handler.topic_name.lower()}_demo_layout-",
-                            )
-                # Return to study menu
-                elif event == "-topics_exit-":
-                    self._screen_switch("-topics_layout-", "-study_menu_layout-")
-
-            # Flashcard menu
-            elif self.window["-flashcard_menu_layout-"].Widget.winfo_ismapped():
-                # Open flashcard pack
-                if event == "-flashcard_menu_study_pack-":
-                    if (
-                        values["-flashcard_menu_packs_drop-"]
-                        in self.data_handler.user_library_list
-                    ):
-                        pack_id = self.data_handler.selected_pack_id(
-                            self.window["-flashcard_menu_packs_drop-"].widget.current()
-                        )
-                        # Load data for pack then switch screen
-                        self.data_handler.load_pack_data(pack_id)
-                        self._screen_switch(
-                            "-flashcard_menu_layout-", "-flashcard_viewer_layout-"
-                        )
-                    else:
-                        sg.popup_error(
-                            "Please select a pack from the dropdown",
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                # Share pack (get share id)
-                elif event == "-flashcard_menu_share-":
-                    if (
-                        values["-flashcard_menu_packs_drop-"]
-                        in self.data_handler.user_library_list
-                    ):
-                        pack_id = self.data_handler.selected_pack_id(
-                            self.window["-flashcard_menu_packs_drop-"].widget.current()
-                        )
-                        sg.popup(
-                            "Your Share ID for {0} is:\n> {1}".format(
-                                values["-flashcard_menu_packs_drop-"],
-                                self.data_handler.get_share_id(pack_id),
-                            ),
-                            title="Share ID",
-                            font=(self.font, self.small_text_size),
-                        )
-                    else:
-                        sg.popup_error(
-                            "Please select a pack from the dropdown",
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                # Download pack
-                elif event == "-flashcard_menu_download-":
-                    download_result = self.data_handler.download_pack(
-                        sg.popup_get_text(
-                            "Please enter the share ID: ",
-                            title="Download Pack",
-                            font=(self.font, self.small_text_size),
-                        )
-                    )
-                    if download_result["result"]:
-                        sg.popup_auto_close(
-                            "Pack added successfully!",
-                            title="Download pack",
-                            font=(self.font, self.small_text_size),
-                        )
-                        self._screen_switch(
-                            "-flashcard_menu_layout-", "-flashcard_menu_layout-"
-                        )
-                    else:
-                        sg.popup_error(
-                            download_result["err_msg"],
-                            title="Download pack",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                # Delete pack
-                elif event == "-flashcard_menu_delete_pack-":
-                    # If pack not selected
-                    if not values["-flashcard_menu_packs_drop-"]:
-                        sg.popup_error(
-                            "Please select a card pack.",
-                            title="Pack deletion",
-                            font=(self.font, self.small_text_size),
-                        )
-                    else:
-                        pack_id = self.data_handler.selected_pack_id(
-                            self.window["-flashcard_menu_packs_drop-"].widget.current()
-                        )
-                        # Confirm user would like to delete card pack
-                        confirmed_delete = sg.popup_yes_no(
-                            "Deleting is irreversible, are you sure?",
-                            title="Warning",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                        if confirmed_delete == "Yes":
-                            result = self.data_handler.delete_card_pack(pack_id)
-                            sg.popup(
-                                result,
-                                title="Pack deletion",
-                                font=(self.font, self.small_text_size),
-                            )
-                            self._screen_switch(
-                                "-flashcard_menu_layout-", "-flashcard_menu_layout-"
-                            )
-                # Start creating a pack
-                elif event == "-flashcard_menu_create-":
-                    self._screen_switch(
-                        "-flashcard_menu_layout-", "-flashcard_creator_title_layout-"
-                    )
-                # Return to study menu
-                elif event == "-flashcard_menu_back-":
-                    self._screen_switch(
-                        "-flashcard_menu_layout-", "-study_menu_layout-"
-                    )
+    def finish_job(self, job_id: int, result: Any) -> None:
+        """Pass the result of a finished background job to its handler."""
+        on_done = self._job_handlers.pop(job_id, None)
+        self.update_job_status()
+        if on_done is None:
+            return
+        if isinstance(result, Exception):
+            sg.popup_error(
+                f"An error occurred: {result}",
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+        else:
+            on_done(result)
 
-            # Flashcard creator (title)
-            elif self.window[
-                "-flashcard_creator_title_layout-"
-            ].Widget.winfo_ismapped():
-                # Set name
-                if event == "-flashcard_creator_title_set_name-":
-                    result = self.data_handler.validate_pack_name(
-                        values["flashcard_creator_title_name-"]
-                    )
-                    if result != True:
-                        sg.popup_error(
-                            result,
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                    else:
-                        self._screen_switch(
-                            "-flashcard_creator_title_layout-",
-                            "-flashcard_creator_cards_layout-",
-                        )
-                # Return to flashcard menu
-                elif event == "-flashcard_creator_title_cancel-":
-                    self._screen_switch(
-                        "-flashcard_creator_title_layout-", "-flashcard_menu_layout-"
-                    )
+    def cancel_jobs(self) -> None:
+        """
+        Cancel all background jobs, discarding their results.
+        Jobs which change the session, such as signing in, should leave that to their handler, which isn't called.
+        """
+        for job_id in list(self._job_handlers):
+            self.data_handler.job_executor.cancel(job_id)
+            del self._job_handlers[job_id]
+        self.update_job_status()
 
-            # Flashcard creator (cards)
-            elif self.window[
-                "-flashcard_creator_cards_layout-"
-            ].Widget.winfo_ismapped():
-                # Updating question type
-                if event == "-flashcard_creator_cards_question_type-":
-                    self.data_handler.clear_current_card()
-                    if (
-                        values["-flashcard_creator_cards_question_type-"]
-                        == "Multiple choice"
-                    ):
-                        self.window["-flashcard_creator_cards_add_choice-"].update(
-                            disabled=False
-                        )
-                        self.window["-flashcard_creator_cards_total_choices-"].update(
-                            "Add answer [0/4]", text_color="black"
-                        )
-                        self.window["-flashcard_creator_cards_is_correct-"].update(
-                            disabled=False
-                        )
-                    else:
-                        self.window["-flashcard_creator_cards_add_choice-"].update(
-                            disabled=True
-                        )
-                        self.window["-flashcard_creator_cards_total_choices-"].update(
-                            "Add answer [-/4]", text_color="gray"
-                        )
-                        self.window["-flashcard_creator_cards_is_correct-"].update(
-                            disabled=True
-                        )
-                # Save card
-                elif event == "-flashcard_creator_cards_add_card-":
-                    result = self.data_handler.add_card(
-                        values["-flashcard_creator_cards_question_type-"],
-                        values["-flashcard_creator_cards_prompt-"],
-                        values["-flashcard_creator_cards_answer-"],
-                        values["-flashcard_creator_cards_points-"],
-                    )
-                    if result == True:
-                        self.window["-flashcard_creator_cards_total_choices-"].update(
-                            "Add answer [0/4]"
-                        )
-                        sg.Popup(
-                            "Card added successfully!",
-                            title="New card",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_success_colour,
-                        )
-                    else:
-                        sg.popup_error(
-                            result,
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                # Add answer (multiple choice)
-                elif event == "-flashcard_creator_cards_add_choice-":
-                    result = self.data_handler.add_card_choice(
-                        values["-flashcard_creator_cards_answer-"],
-                        values["-flashcard_creator_cards_is_correct-"],
-                    )
-                    if result == True:
-                        choice_count = self.data_handler.get_answer_count()
-                        self.window["-flashcard_creator_cards_total_choices-"].update(
-                            f"Add answer [{choice_count}/4]"
-                        )
-                        sg.Popup(
-                            "Choice added successfully!",
-                            title="New choice",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_success_colour,
-                        )
-                    else:
-                        sg.popup_error(
-                            result,
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                # Save pack
-                elif event == "-flashcard_creator_cards_save-":
-                    result = self.data_handler.save_card_pack()
-                    if result == True:
-                        self._screen_switch(
-                            "-flashcard_creator_cards_layout-",
-                            "-flashcard_menu_layout-",
-                        )
-                        sg.Popup(
-                            "Pack saved successfully!",
-                            title="New pack",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_success_colour,
-                        )
-                    else:
-                        sg.popup_error(
-                            result,
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                # Cancel (return to flashcard menu)
-                elif event == "-flashcard_creator_cards_cancel-":
-                    confirmed_cancel = sg.popup_yes_no(
-                        "Cancelling will delete your progress, are you sure?",
-                        title="Warning",
-                        font=(self.font, self.small_text_size),
-                    )
-                    if confirmed_cancel == "Yes":
-                        self.data_handler.clear_current_card()
-                        self.data_handler.clear_current_pack
-                        self._screen_switch(
-                            "-flashcard_creator_cards_layout-",
-                            "-flashcard_menu_layout-",
-                        )
-
-            # Flashcard viewer
-            elif self.window["-flashcard_viewer_layout-"].Widget.winfo_ismapped():
-                # Reveal cards
-                if event == "-flashcard_viewer_reveal-":
-                    visible = self.data_handler.toggle_card_reveal()
-                    text = self.data_handler.current_card_answer if visible else ""
-                    self.window["-flashcard_viewer_reveal_field-"].update(text)
-                elif event == "-flashcard_viewer_next-":
-                    self.show_new_flashcard()
-                # Numerical cards
-                elif event == "-flashcard_viewer_submit_numerical-":
-                    if self.data_handler.validate_integer(
-                        values["-flashcard_viewer_numerical_field-"]
-                    ):
-                        result = self.data_handler.check_answer(
-                            values["-flashcard_viewer_numerical_field-"]
-                        )
-                        self.flashcard_answer_result(result)
-                        self.show_new_flashcard()
-                    else:
-                        sg.popup_error(
-                            "Please ensure your answer is an integer",
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                # Multiple choice cards
-                elif event == "-flashcard_viewer_submit_multiple_choice-":
-                    # Selecting answer from users input
-                    result = self.data_handler.check_answer(
-                        values["-flashcard_viewer_choice_drop-"], use_index=True
-                    )
-                    if not result:
-                        sg.popup_error(
-                            "Please provide an answer",
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                    else:
-                        self.flashcard_answer_result(result)
-                        self.show_new_flashcard()
-                # Exit (to flashcard menu)
-                elif event == "-flashcard_viewer_exit-":
-                    self._screen_switch(
-                        "-flashcard_viewer_layout-", "-flashcard_menu_layout-"
-                    )
+    def update_job_status(self) -> None:
+        """Show the running background jobs and how long they have taken."""
+        jobs = self.data_handler.job_executor.running_jobs
+        if not jobs:
+            self.window["-job_status-"].update("")
+            self.window["-job_cancel-"].update(visible=False)
+            return
+        status = f"{jobs[0]['name']}{'.' * (int(jobs[0]['elapsed'] * 2) % 4)} ({jobs[0]['elapsed']:.0f}s)"
+        if len(jobs) > 1:
+            status += f" and {len(jobs) - 1} more"
+        self.window["-job_status-"].update(status)
+        self.window["-job_cancel-"].update(visible=True)
 
-            # Binary tree input screen
-            elif self.window["-trees_demo_layout-"].Widget.winfo_ismapped():
-                # Return to study menu
-                if event == "-trees_demo_exit-":
-                    self._screen_switch("-trees_demo_layout-", "-study_menu_layout-")
-                # Generate binary tree from list
-                elif event == "-trees_demo_generate-":
-                    generate_result = self.data_handler.generate_tree(
-                        values["-trees_demo_input-"],
-                        values["-trees_demo_balanced_check-"],
-                    )
-                    if generate_result["result"]:
-                        self._screen_switch(
-                            "-trees_demo_layout-", "-trees_view_layout-"
-                        )
-                    else:
-                        sg.popup_error(
-                            generate_result["err_msg"],
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-
-            # Binary tree viewer
-            elif self.window["-trees_view_layout-"].Widget.winfo_ismapped():
-                # View traversal order
-                if event == "-trees_view_traverse-":
-                    if values["-trees_view_traversals_drop-"] in [
-                        "Inorder",
-                        "Preorder",
-                        "Postorder",
-                    ]:
-                        sg.popup(
-                            "{0} traversal: {1}".format(
-                                values["-trees_view_traversals_drop-"],
-                                self.data_handler.get_traversal_order(
-                                    values["-trees_view_traversals_drop-"].lower()
-                                ),
-                            ),
-                            title="Traversal",
-                            font=(self.font, self.small_text_size),
-                        )
-                    else:
-                        sg.popup_error(
-                            "Please select a traversal from the dropdown",
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                # Add node
-                elif event == "-trees_view_add_node-":
-                    add_node_result = self.data_handler.add_tree_node(
-                        sg.popup_get_text(
-                            "Integer for new node: ",
-                            title="Add Node",
-                            font=(self.font, self.small_text_size),
-                        )
-                    )
-                    if not add_node_result:
-                        self.window["-trees_view_image-"].update(
-                            data=self.data_handler.resize_image()
-                        )
-                    else:
-                        sg.popup_error(
-                            add_node_result,
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                # Back (to trees demo)
-                elif event == "-trees_view_back-":
-                    self._screen_switch("-trees_view_layout-", "-trees_demo_layout-")
-
-            # Queues demo
-            elif self.window["-queues_demo_layout-"].Widget.winfo_ismapped():
-                # Queue - enqueue
-                if event == "-queue_demo_enqueue-":
-                    enqueue = self.data_handler.queue_enqueue()
-                    if enqueue:
-                        print(f"Enqueued: {enqueue}")
-                        queue_elements = self.data_handler.get_queue()
-                        front_index, rear_index = (
-                            self.data_handler.queue_front(),
-                            self.data_handler.queue_rear(),
-                        )
-                        self.update_queue_display(
-                            queue_elements, front_index, rear_index
-                        )
-                    else:
-                        print("Queue is full!")
-                # Queue - dequeue
-                elif event == "-queue_demo_dequeue-":
-                    dequeue = self.data_handler.queue_dequeue()
-                    if dequeue:
-                        print(f"Dequeued: {dequeue}")
-                        queue_elements = self.data_handler.get_queue()
-                        front_index, rear_index = (
-                            self.data_handler.queue_front(),
-                            self.data_handler.queue_rear(),
-                        )
-                        self.update_queue_display(
-                            queue_elements, front_index, rear_index
-                        )
-                    else:
-                        print("Queue is empty!")
-                # Queue - peek
-                elif event == "-queue_demo_peek-":
-                    peek = self.data_handler.queue_peek()
-                    if peek:
-                        print(f"The front element is {peek}")
-                    else:
-                        print("The queue is empty!")
-                # Queue - isfull
-                elif event == "-queue_demo_isfull-":
-                    if self.data_handler.queue_is_full():
-                        print("True; Queue is full")
-                    else:
-                        print("False; Queue is not full")
-                # Queue - isempty
-                elif event == "-queue_demo_isempty-":
-                    if self.data_handler.queue_is_empty():
-                        print("True; Queue is empty")
-                    else:
-                        print("False; Queue is not empty")
-                # Queue - size
-                elif event == "-queue_demo_size-":
-                    print(f"Current size: {self.data_handler.queue_size()}")
-                # Change queue type
-                elif event == "-queue_demo_queue_type_combo-":
-                    screen_elements = self.data_handler.switch_queue(
-                        values["-queue_demo_queue_type_combo-"].lower()
-                    )
-                    self.show_queue_buttons(screen_elements)
-                    front_index = self.data_handler.queue_front()
-                    self.update_queue_display(
-                        ["" for _ in range(self.data_handler.queue_max_size)],
-                        front_index,
-                    )
-                # Stack - push
-                elif event == "-queue_demo_push-":
-                    push = self.data_handler.queue_push()
-                    if push:
-                        print(f"Pushed: {push}")
-                        stack_elements = self.data_handler.get_queue()
-                        front_index = self.data_handler.queue_front()
-                        self.update_queue_display(stack_elements, front_index)
-                    else:
-                        print("Stack is full!")
-                # Stack - pop
-                elif event == "-queue_demo_pop-":
-                    pop = self.data_handler.queue_pop()
-                    if pop:
-                        print(f"Popped: {pop}")
-                        stack_elements = self.data_handler.get_queue()
-                        front_index = self.data_handler.queue_front()
-                        self.update_queue_display(stack_elements, front_index)
-                    else:
-                        print("Stack is empty!")
-                # Queue - rear
-                elif event == "-queue_demo_rear-":
-                    rear = self.data_handler.queue_rear_element()
-                    if rear:
-                        print(f"Rear points to: {rear}")
-                    else:
-                        print("Queue is empty!")
-                # Exit (to study menu)
-                elif event == "-queue_demo_exit-":
-                    self._screen_switch("-queues_demo_layout-", "-study_menu_layout-")
-
-            # Graphs demo
-            elif self.window["-graphs_demo_layout-"].Widget.winfo_ismapped():
-                # Change input type
-                if event == "-graphs_demo_input_type-":
-                    graphs_display_map = {
-                        "Adjacency matrix": {
-                            "node_input": True,
-                            "add_node": True,
-                            "node_1": True,
-                            "node_2": True,
-                            "add_edge": True,
-                            "directed_check": True,
-                            "matrix_input": False,
-                        },
-                        "Adjacency list": {
-                            "node_input": False,
-                            "add_node": False,
-                            "node_1": False,
-                            "node_2": False,
-                            "add_edge": False,
-                            "directed_check": False,
-                            "matrix_input": True,
-                        },
-                    }
-                    state = graphs_display_map.get(values["-graphs_demo_input_type-"])
-                    for key, value in state.items():
-                        self.window[f"-graphs_demo_{key}-"].update(disabled=value)
-                    self.data_handler.clear_adjacency_list()
-                    self.window["-graphs_demo_node_1-"].update(values=[])
-                    self.window["-graphs_demo_node_2-"].update(values=[])
-                # Add node to adjacency list
-                elif event == "-graphs_demo_add_node-":
-                    result = self.data_handler.add_adjacency_node(
-                        values["-graphs_demo_node_input-"]
-                    )
-                    if result != True:
-                        sg.popup_error(
-                            result,
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                    else:
-                        # Updating drops (for adding edge) with new node
-                        adjacency_node_names = self.data_handler.adjacency_node_names
-                        self.window["-graphs_demo_node_1-"].update(
-                            values=adjacency_node_names
-                        )
-                        self.window["-graphs_demo_node_2-"].update(
-                            values=adjacency_node_names
-                        )
-                # Add edge to adjacency list
-                elif event == "-graphs_demo_add_edge-":
-                    result = self.data_handler.add_edge_adjacency_list(
-                        values["-graphs_demo_node_1-"],
-                        values["-graphs_demo_node_2-"],
-                        values["-graphs_demo_directed_check-"],
-                    )
-                    if result != True:
-                        sg.popup_error(
-                            result,
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                    else:
-                        sg.popup_auto_close(
-                            "Edge added!",
-                            title="New edge",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_success_colour,
-                        )
-                # Generate graph image
-                elif event == "-graphs_demo_generate_graph-":
-                    if values["-graphs_demo_input_type-"] == "Adjacency matrix":
-                        result = self.data_handler.generate_graph_from_matrix_string(
-                            values["-graphs_demo_matrix_input-"]
-                        )
-                    else:
-                        result = self.data_handler.generate_graph_from_adjacency_list()
-                    if result != True:
-                        sg.popup_error(
-                            result,
-                            title="Error",
-                            font=(self.font, self.small_text_size),
-                            text_color=self.text_error_colour,
-                        )
-                    else:
-                        self._screen_switch(
-                            "-graphs_demo_layout-", "-graphs_view_layout-"
-                        )
-                # Return to study menu
-                elif event == "-graphs_demo_back-":
-                    self._screen_switch("-graphs_demo_layout-", "-study_menu_layout-")
-
-            # Graphs viewer
-            elif self.window["-graphs_view_layout-"].Widget.winfo_ismapped():
-                # Display adjacency matrix
-                if event == "-graphs_view_matrix-":
-                    sg.popup(
-                        self.data_handler.adjacency_matrix_table_str,
-                        title="Adjacency matrix",
-                        font=(self.font, self.small_text_size),
-                    )
-                # Back (to graphs demo)
-                elif event == "-graphs_view_back-":
-                    self._screen_switch("-graphs_view_layout-", "-graphs_demo_layout-")
-
-            # Leaderboard
-            elif self.window["-leaderboard_layout-"].Widget.winfo_ismapped():
-                # Back to study menu
-                if event == "-leaderboard_back-":
-                    self._screen_switch("-leaderboard_layout-", "-study_menu_layout-")
-                # Reverse leaderboard order
-                elif event == "-leaderboard_reverse_order-":
-                    self.window["-leaderboard_table-"].update(
-                        values=self.data_handler.leaderboard_data_reverse
-                    )
+    def _login_done(self, auth_result: dict) -> None:
+        """
+        Finish logging in, once credentials are checked in the background.
+        The user is only signed in here, so a cancelled sign in never changes the session.
+        """
+        if self._active_screen != "-login_layout-":
+            return
+        if auth_result["auth"]:
+            self.data_handler.sign_in(auth_result)
+            self.window["-login_error_message-"].update("")
+            self._screen_switch("-login_layout-", "-study_menu_layout-")
+        else:
+            self.window["-login_error_message-"].update(auth_result["err_msg"])
+
+    def _address_checked(self, result: dict, values: dict) -> None:
+        """Confirm the address found in the background, then create the account in the background."""
+        if result["result"]:
+            address_label = result["address"]["label"]
+            confirm_address = sg.popup_yes_no(
+                f"Is this your address?\n{address_label}",
+                title="Confirm your address",
+                font=(self.font, self.small_text_size),
+            )
+            if confirm_address == "Yes":
+                self.start_job(
+                    "Creating account",
+                    self._account_created,
+                    self.data_handler.create_account,
+                    values["-create_account_username-"],
+                    values["-create_account_password-"],
+                    values["-create_account_first_name-"],
+                    values["-create_account_email-"],
+                    result["address"],
+                )
+        else:
+            self._account_created(result)
+
+    def _account_created(self, result: dict) -> None:
+        """Show the result of creating an account."""
+        if result["result"]:
+            self.window["-create_account_error_message-"].update(
+                "Account successfully created!", text_color="green"
+            )
+        else:
+            self.window["-create_account_error_message-"].update(
+                result["err_msg"],
+                text_color=self.text_error_colour,
+            )
+
+    def _tree_generated(self, generate_result: dict) -> None:
+        """Show the binary tree rendered in the background."""
+        if self._active_screen != "-trees_demo_layout-":
+            return
+        if generate_result["result"]:
+            self._screen_switch("-trees_demo_layout-", "-trees_view_layout-")
+        else:
+            sg.popup_error(
+                generate_result["err_msg"],
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    def _tree_node_added(self, add_node_result: Union[str, None]) -> None:
+        """Show the binary tree re-rendered in the background after adding a node."""
+        if self._active_screen != "-trees_view_layout-":
+            return
+        if not add_node_result:
+            self.window["-trees_view_image-"].update(
+                data=self.data_handler.resize_image()
+            )
+            self.window["-trees_view_stats-"].update(self.data_handler.tree_stats)
+        else:
+            sg.popup_error(
+                add_node_result,
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    def _graph_generated(self, result: Union[str, bool]) -> None:
+        """Show the graph rendered in the background."""
+        if self._active_screen != "-graphs_demo_layout-":
+            return
+        if result != True:
+            sg.popup_error(
+                result,
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+        else:
+            self._screen_switch("-graphs_demo_layout-", "-graphs_view_layout-")
+
+    """
+    Event handlers.
+        - Each handler is named "_on_<event_key>" and takes the values read from the window.
+        - Handlers are registered by screen in event_handlers.
+    """
+
+    # Login screen
+    def _on_login_create_account(self, values: dict) -> None:
+        """Go to create account screen."""
+        self.window["-login_error_message-"].update("")
+        self._screen_switch("-login_layout-", "-create_account_layout-")
+
+    def _on_login_login(self, values: dict) -> None:
+        """Attempt to login."""
+        self.start_job(
+            "Signing in",
+            self._login_done,
+            self.data_handler.check_credentials,
+            values["-login_username-"],
+            values["-login_password-"],
+        )
+
+    # Create account screen
+    def _on_create_account_login(self, values: dict) -> None:
+        """Return to login screen."""
+        self.window["-create_account_error_message-"].update("")
+        self._screen_switch("-create_account_layout-", "-login_layout-")
+
+    def _on_create_account_create_account(self, values: dict) -> None:
+        """Attempt to create account."""
+        self.start_job(
+            "Finding address",
+            lambda result, values=values: self._address_checked(result, values),
+            self.data_handler.val_create_address,
+            values["-create_account_house_number-"],
+            values["-create_account_postcode-"],
+        )
+
+    # Study menu
+    def _on_study_menu_logout(self, values: dict) -> None:
+        """Log out."""
+        self.data_handler.clear_user_data()
+        self._screen_switch("-study_menu_layout-", "-login_layout-")
+
+    def _on_study_menu_leaderboard(self, values: dict) -> None:
+        """Go to leaderboard screen (unfinished)."""
+        self._screen_switch("-study_menu_layout-", "-leaderboard_layout-")
+
+    def _on_study_menu_flashcards(self, values: dict) -> None:
+        """Go to flashcard menu."""
+        self._screen_switch("-study_menu_layout-", "-flashcard_menu_layout-")
+
+    def _on_study_menu_study(self, values: dict) -> None:
+        """Study topic from drop."""
+        if values["-study_menu_topics_drop-"] in self.data_handler.topics_list:
+            # Load topic data to data handler
+            topic_id = self.data_handler.selected_topic_id(
+                self.window["-study_menu_topics_drop-"].widget.current()
+            )
+            self.data_handler.load_topic_id(topic_id)
+            self._screen_switch("-study_menu_layout-", "-topics_layout-")
+        else:
+            sg.popup_error(
+                "Please select a topic from the dropdown.",
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    def _on_study_menu_launch_demo(self, values: dict) -> None:
+        """Launch demo."""
+        if values["-study_menu_topics_drop-"] in self.data_handler.topics_list:
+            self._screen_switch(
+                "-study_menu_layout-",
+                "-{0}_demo_layout-".format(values["-study_menu_topics_drop-"].lower()),
+            )
+        else:
+            sg.popup_error(
+                "Please select a topic from the dropdown.",
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    # Topic pages
+    def _on_topics_next(self, values: dict) -> None:
+        """Next page."""
+        if not self.update_topic_page():
+            launch_demo = sg.popup_yes_no(
+                "No pages this way! Launch demo?",
+                title="Launch demo",
+                font=(self.font, self.small_text_size),
+            )
+            if launch_demo == "Yes":
+                self._screen_switch(
+                    "-topics_layout-",
+                    f"-{self.data_handler.topic_name.lower()}_demo_layout-",
+                )
+
+    def _on_topics_previous(self, values: dict) -> None:
+        """Previous page."""
+        if not self.update_topic_page(next_page=False):
+            launch_demo = sg.popup_yes_no(
+                "No pages this way! Launch demo?",
+                title="Launch demo",
+                font=(self.font, self.small_text_size),
+            )
+            if launch_demo == "Yes":
+                self._screen_switch(
+                    "-topics_layout-",
+                    f"-{self.data_handler.topic_name.lower()}_demo_layout-",
+                )
+
+    def _on_topics_exit(self, values: dict) -> None:
+        """Return to study menu."""
+        self._screen_switch("-topics_layout-", "-study_menu_layout-")
+
+    # Flashcard menu
+    def _on_flashcard_menu_study_pack(self, values: dict) -> None:
+        """Open flashcard pack."""
+        if values["-flashcard_menu_packs_drop-"] in self.data_handler.user_library_list:
+            pack_id = self.data_handler.selected_pack_id(
+                self.window["-flashcard_menu_packs_drop-"].widget.current()
+            )
+            # Load data for pack then switch screen
+            self.data_handler.load_pack_data(pack_id)
+            self._screen_switch("-flashcard_menu_layout-", "-flashcard_viewer_layout-")
+        else:
+            sg.popup_error(
+                "Please select a pack from the dropdown",
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    def _on_flashcard_menu_share(self, values: dict) -> None:
+        """Share pack (get share id)."""
+        if values["-flashcard_menu_packs_drop-"] in self.data_handler.user_library_list:
+            pack = self.data_handler.selected_pack_details(
+                self.window["-flashcard_menu_packs_drop-"].widget.current()
+            )
+            sg.popup(
+                "Your Share ID for {0} is:\n> {1}\n\nCreated by: {2}\nCards: {3} ({4} points)".format(
+                    pack["pack_name"],
+                    pack["share_id"],
+                    pack["owner"],
+                    pack["card_count"],
+                    pack["total_points"],
+                ),
+                title="Share ID",
+                font=(self.font, self.small_text_size),
+            )
+        else:
+            sg.popup_error(
+                "Please select a pack from the dropdown",
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    def _on_flashcard_menu_download(self, values: dict) -> None:
+        """Download pack."""
+        download_result = self.data_handler.download_pack(
+            sg.popup_get_text(
+                "Please enter the share ID: ",
+                title="Download Pack",
+                font=(self.font, self.small_text_size),
+            )
+        )
+        if download_result["result"]:
+            sg.popup_auto_close(
+                "Pack added successfully!",
+                title="Download pack",
+                font=(self.font, self.small_text_size),
+            )
+            self._screen_switch("-flashcard_menu_layout-", "-flashcard_menu_layout-")
+        else:
+            sg.popup_error(
+                download_result["err_msg"],
+                title="Download pack",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    def _on_flashcard_menu_browse(self, values: dict) -> None:
+        """Browse public packs."""
+        if self.browse_catalog():
+            self._screen_switch("-flashcard_menu_layout-", "-flashcard_menu_layout-")
+
+    def _on_flashcard_menu_fork(self, values: dict) -> None:
+        """Fork pack (copy into an editable pack)."""
+        if values["-flashcard_menu_packs_drop-"] in self.data_handler.user_library_list:
+            pack_id = self.data_handler.selected_pack_id(
+                self.window["-flashcard_menu_packs_drop-"].widget.current()
+            )
+            result = self.data_handler.fork_card_pack(
+                pack_id,
+                sg.popup_get_text(
+                    "Name for your copy of the pack: ",
+                    title="Fork pack",
+                    font=(self.font, self.small_text_size),
+                ),
+            )
+            if result == True:
+                sg.popup_auto_close(
+                    "Pack forked successfully!",
+                    title="Fork pack",
+                    font=(self.font, self.small_text_size),
+                )
+                self._screen_switch(
+                    "-flashcard_menu_layout-", "-flashcard_menu_layout-"
+                )
+            else:
+                sg.popup_error(
+                    result,
+                    title="Fork pack",
+                    font=(self.font, self.small_text_size),
+                    text_color=self.text_error_colour,
+                )
+        else:
+            sg.popup_error(
+                "Please select a pack from the dropdown",
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    def _on_flashcard_menu_edit_pack(self, values: dict) -> None:
+        """Edit pack (owner only, checked when saving)."""
+        if values["-flashcard_menu_packs_drop-"] in self.data_handler.user_library_list:
+            pack_id = self.data_handler.selected_pack_id(
+                self.window["-flashcard_menu_packs_drop-"].widget.current()
+            )
+            self.data_handler.load_pack_for_editing(pack_id)
+            self.edit_pack()
+            self._screen_switch("-flashcard_menu_layout-", "-flashcard_menu_layout-")
+        else:
+            sg.popup_error(
+                "Please select a pack from the dropdown",
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    def _on_flashcard_menu_delete_pack(self, values: dict) -> None:
+        """Delete pack."""
+        # If pack not selected
+        if not values["-flashcard_menu_packs_drop-"]:
+            sg.popup_error(
+                "Please select a card pack.",
+                title="Pack deletion",
+                font=(self.font, self.small_text_size),
+            )
+        else:
+            pack_id = self.data_handler.selected_pack_id(
+                self.window["-flashcard_menu_packs_drop-"].widget.current()
+            )
+            # Confirm user would like to delete card pack
+            confirmed_delete = sg.popup_yes_no(
+                "Deleting is irreversible, are you sure?",
+                title="Warning",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+            if confirmed_delete == "Yes":
+                result = self.data_handler.delete_card_pack(pack_id)
+                sg.popup(
+                    result,
+                    title="Pack deletion",
+                    font=(self.font, self.small_text_size),
+                )
+                self._screen_switch(
+                    "-flashcard_menu_layout-", "-flashcard_menu_layout-"
+                )
+
+    def _on_flashcard_menu_create(self, values: dict) -> None:
+        """Start creating a pack."""
+        self._screen_switch(
+            "-flashcard_menu_layout-", "-flashcard_creator_title_layout-"
+        )
+
+    def _on_flashcard_menu_back(self, values: dict) -> None:
+        """Return to study menu."""
+        self._screen_switch("-flashcard_menu_layout-", "-study_menu_layout-")
+
+    # Flashcard creator (title)
+    def _on_flashcard_creator_title_set_name(self, values: dict) -> None:
+        """Set the name of the new pack."""
+        result = self.data_handler.validate_pack_name(
+            values["flashcard_creator_title_name-"]
+        )
+        if result != True:
+            sg.popup_error(
+                result,
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+        else:
+            self._screen_switch(
+                "-flashcard_creator_title_layout-",
+                "-flashcard_creator_cards_layout-",
+            )
+
+    def _on_flashcard_creator_title_cancel(self, values: dict) -> None:
+        """Return to flashcard menu."""
+        self._screen_switch(
+            "-flashcard_creator_title_layout-", "-flashcard_menu_layout-"
+        )
+
+    # Flashcard creator (cards)
+    def _on_flashcard_creator_cards_question_type(self, values: dict) -> None:
+        """Update the inputs for the selected question type."""
+        self.data_handler.clear_current_card()
+        if values["-flashcard_creator_cards_question_type-"] == "Multiple choice":
+            self.window["-flashcard_creator_cards_add_choice-"].update(disabled=False)
+            self.window["-flashcard_creator_cards_total_choices-"].update(
+                "Add answer [0/4]", text_color="black"
+            )
+            self.window["-flashcard_creator_cards_is_correct-"].update(disabled=False)
+        else:
+            self.window["-flashcard_creator_cards_add_choice-"].update(disabled=True)
+            self.window["-flashcard_creator_cards_total_choices-"].update(
+                "Add answer [-/4]", text_color="gray"
+            )
+            self.window["-flashcard_creator_cards_is_correct-"].update(disabled=True)
+
+    def _on_flashcard_creator_cards_add_card(self, values: dict) -> None:
+        """Save card."""
+        # Warn the user if a similar question is already in the pack
+        similar_question = self.data_handler.similar_question_check(
+            values["-flashcard_creator_cards_prompt-"]
+        )
+        if similar_question is not None and (
+            sg.popup_yes_no(
+                f"This question is similar to '{similar_question}', add it anyway?",
+                title="Similar card",
+                font=(self.font, self.small_text_size),
+            )
+            != "Yes"
+        ):
+            return
+        result = self.data_handler.add_card(
+            values["-flashcard_creator_cards_question_type-"],
+            values["-flashcard_creator_cards_prompt-"],
+            values["-flashcard_creator_cards_answer-"],
+            values["-flashcard_creator_cards_points-"],
+        )
+        if result == True:
+            self.window["-flashcard_creator_cards_total_choices-"].update(
+                "Add answer [0/4]"
+            )
+            sg.Popup(
+                "Card added successfully!",
+                title="New card",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_success_colour,
+            )
+        else:
+            sg.popup_error(
+                result,
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    def _on_flashcard_creator_cards_add_choice(self, values: dict) -> None:
+        """Add answer (multiple choice)."""
+        result = self.data_handler.add_card_choice(
+            values["-flashcard_creator_cards_answer-"],
+            values["-flashcard_creator_cards_is_correct-"],
+        )
+        if result == True:
+            choice_count = self.data_handler.get_answer_count()
+            self.window["-flashcard_creator_cards_total_choices-"].update(
+                f"Add answer [{choice_count}/4]"
+            )
+            sg.Popup(
+                "Choice added successfully!",
+                title="New choice",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_success_colour,
+            )
+        else:
+            sg.popup_error(
+                result,
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    def _on_flashcard_creator_cards_save(self, values: dict) -> None:
+        """Save pack."""
+        result = self.data_handler.save_card_pack()
+        if result == True:
+            self._screen_switch(
+                "-flashcard_creator_cards_layout-",
+                "-flashcard_menu_layout-",
+            )
+            sg.Popup(
+                "Pack saved successfully!",
+                title="New pack",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_success_colour,
+            )
+        else:
+            sg.popup_error(
+                result,
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    def _on_flashcard_creator_cards_cancel(self, values: dict) -> None:
+        """Cancel (return to flashcard menu)."""
+        confirmed_cancel = sg.popup_yes_no(
+            "Cancelling will delete your progress, are you sure?",
+            title="Warning",
+            font=(self.font, self.small_text_size),
+        )
+        if confirmed_cancel == "Yes":
+            self.data_handler.clear_current_card()
+            self.data_handler.clear_current_pack
+            self._screen_switch(
+                "-flashcard_creator_cards_layout-",
+                "-flashcard_menu_layout-",
+            )
+
+    # Flashcard viewer
+    def _on_flashcard_viewer_reveal(self, values: dict) -> None:
+        """Toggle the answer of a reveal card."""
+        visible = self.data_handler.toggle_card_reveal()
+        text = self.data_handler.current_card_answer if visible else ""
+        self.window["-flashcard_viewer_reveal_field-"].update(text)
+
+    def _on_flashcard_viewer_next(self, values: dict) -> None:
+        """Show the next card."""
+        self.show_new_flashcard()
+
+    def _on_flashcard_viewer_submit_numerical(self, values: dict) -> None:
+        """Submit the answer of a numerical card."""
+        if self.data_handler.validate_integer(
+            values["-flashcard_viewer_numerical_field-"]
+        ):
+            result = self.data_handler.check_answer(
+                values["-flashcard_viewer_numerical_field-"]
+            )
+            self.flashcard_answer_result(result)
+            self.show_new_flashcard()
+        else:
+            sg.popup_error(
+                "Please ensure your answer is an integer",
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    def _on_flashcard_viewer_submit_multiple_choice(self, values: dict) -> None:
+        """Submit the answer of a multiple choice card."""
+        # Selecting answer from users input
+        result = self.data_handler.check_answer(
+            values["-flashcard_viewer_choice_drop-"], use_index=True
+        )
+        if not result:
+            sg.popup_error(
+                "Please provide an answer",
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+        else:
+            self.flashcard_answer_result(result)
+            self.show_new_flashcard()
+
+    def _on_flashcard_viewer_exit(self, values: dict) -> None:
+        """Exit (to flashcard menu)."""
+        self._screen_switch("-flashcard_viewer_layout-", "-flashcard_menu_layout-")
+
+    # Binary tree input screen
+    def _on_trees_demo_exit(self, values: dict) -> None:
+        """Return to study menu."""
+        self._screen_switch("-trees_demo_layout-", "-study_menu_layout-")
 
+    def _on_trees_demo_generate(self, values: dict) -> None:
+        """Generate binary tree from list."""
+        self.start_job(
+            "Rendering tree",
+            self._tree_generated,
+            self.data_handler.generate_tree,
+            values["-trees_demo_input-"],
+            values["-trees_demo_balanced_check-"],
+            values["-trees_demo_type_drop-"],
+        )
+
+    # Binary tree viewer
+    def _on_trees_view_traverse(self, values: dict) -> None:
+        """View traversal order."""
+        if values["-trees_view_traversals_drop-"] in [
+            "Inorder",
+            "Preorder",
+            "Postorder",
+        ]:
+            sg.popup(
+                "{0} traversal: {1}".format(
+                    values["-trees_view_traversals_drop-"],
+                    self.data_handler.get_traversal_order(
+                        values["-trees_view_traversals_drop-"].lower()
+                    ),
+                ),
+                title="Traversal",
+                font=(self.font, self.small_text_size),
+            )
+        else:
+            sg.popup_error(
+                "Please select a traversal from the dropdown",
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    def _on_trees_view_add_node(self, values: dict) -> None:
+        """Add node."""
+        self.start_job(
+            "Rendering tree",
+            self._tree_node_added,
+            self.data_handler.add_tree_node,
+            sg.popup_get_text(
+                "Integer for new node: ",
+                title="Add Node",
+                font=(self.font, self.small_text_size),
+            ),
+        )
+
+    def _on_trees_view_delete_node(self, values: dict) -> None:
+        """Delete node."""
+        self.start_job(
+            "Rendering tree",
+            self._tree_node_added,
+            self.data_handler.delete_tree_node,
+            sg.popup_get_text(
+                "Integer of node to delete: ",
+                title="Delete Node",
+                font=(self.font, self.small_text_size),
+            ),
+        )
+
+    def _on_trees_view_operation(self, values: dict) -> None:
+        """Run a query on the tree, showing the nodes it visited."""
+        operation = values["-trees_view_operations_drop-"]
+        argument = ""
+        if operation == "Search":
+            argument = sg.popup_get_text(
+                "Integer to search for: ",
+                title=operation,
+                font=(self.font, self.small_text_size),
+            )
+        elif operation == "Successor":
+            argument = sg.popup_get_text(
+                "Integer to find the successor of: ",
+                title=operation,
+                font=(self.font, self.small_text_size),
+            )
+        elif operation == "Range":
+            argument = sg.popup_get_text(
+                "Smallest and largest values, seperated by a comma: ",
+                title=operation,
+                font=(self.font, self.small_text_size),
+            )
+        # Closing the input popup cancels the query
+        if argument is None:
+            return
+        result = self.data_handler.run_tree_operation(operation, argument)
+        if result["result"]:
+            sg.popup(
+                result["output"],
+                title=operation,
+                font=(self.font, self.small_text_size),
+            )
+        else:
+            sg.popup_error(
+                result["err_msg"],
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+
+    def _on_trees_view_back(self, values: dict) -> None:
+        """Back (to trees demo)."""
+        self._screen_switch("-trees_view_layout-", "-trees_demo_layout-")
+
+    # Queues demo
+    def _on_queue_demo_enqueue(self, values: dict) -> None:
+        """Queue - enqueue."""
+        enqueue = self.data_handler.queue_enqueue()
+        if enqueue:
+            print(f"Enqueued: {enqueue}")
+            queue_elements = self.data_handler.get_queue()
+            front_index, rear_index = (
+                self.data_handler.queue_front(),
+                self.data_handler.queue_rear(),
+            )
+            self.update_queue_display(queue_elements, front_index, rear_index)
+        else:
+            print("Queue is full!")
+
+    def _on_queue_demo_dequeue(self, values: dict) -> None:
+        """Queue - dequeue."""
+        dequeue = self.data_handler.queue_dequeue()
+        if dequeue:
+            print(f"Dequeued: {dequeue}")
+            queue_elements = self.data_handler.get_queue()
+            front_index, rear_index = (
+                self.data_handler.queue_front(),
+                self.data_handler.queue_rear(),
+            )
+            self.update_queue_display(queue_elements, front_index, rear_index)
+        else:
+            print("Queue is empty!")
+
+    def _on_queue_demo_peek(self, values: dict) -> None:
+        """Queue - peek."""
+        peek = self.data_handler.queue_peek()
+        if peek:
+            print(f"The front element is {peek}")
+        else:
+            print("The queue is empty!")
+
+    def _on_queue_demo_isfull(self, values: dict) -> None:
+        """Queue - isfull."""
+        if self.data_handler.queue_is_full():
+            print("True; Queue is full")
+        else:
+            print("False; Queue is not full")
+
+    def _on_queue_demo_isempty(self, values: dict) -> None:
+        """Queue - isempty."""
+        if self.data_handler.queue_is_empty():
+            print("True; Queue is empty")
+        else:
+            print("False; Queue is not empty")
+
+    def _on_queue_demo_size(self, values: dict) -> None:
+        """Queue - size."""
+        print(f"Current size: {self.data_handler.queue_size()}")
+
+    def _on_queue_demo_queue_type_combo(self, values: dict) -> None:
+        """Change queue type."""
+        screen_elements = self.data_handler.switch_queue(
+            values["-queue_demo_queue_type_combo-"].lower()
+        )
+        self.show_queue_buttons(screen_elements)
+        front_index = self.data_handler.queue_front()
+        self.update_queue_display(
+            ["" for _ in range(self.data_handler.queue_max_size)],
+            front_index,
+        )
+
+    def _on_queue_demo_push(self, values: dict) -> None:
+        """Stack - push."""
+        push = self.data_handler.queue_push()
+        if push:
+            print(f"Pushed: {push}")
+            stack_elements = self.data_handler.get_queue()
+            front_index = self.data_handler.queue_front()
+            self.update_queue_display(stack_elements, front_index)
+        else:
+            print("Stack is full!")
+
+    def _on_queue_demo_pop(self, values: dict) -> None:
+        """Stack - pop."""
+        pop = self.data_handler.queue_pop()
+        if pop:
+            print(f"Popped: {pop}")
+            stack_elements = self.data_handler.get_queue()
+            front_index = self.data_handler.queue_front()
+            self.update_queue_display(stack_elements, front_index)
+        else:
+            print("Stack is empty!")
+
+    def _on_queue_demo_rear(self, values: dict) -> None:
+        """Queue - rear."""
+        rear = self.data_handler.queue_rear_element()
+        if rear:
+            print(f"Rear points to: {rear}")
+        else:
+            print("Queue is empty!")
+
+    def _on_queue_demo_exit(self, values: dict) -> None:
+        """Exit (to study menu)."""
+        self._screen_switch("-queues_demo_layout-", "-study_menu_layout-")
+
+    # Graphs demo
+    def _on_graphs_demo_input_type(self, values: dict) -> None:
+        """Change input type."""
+        graphs_display_map = {
+            "Adjacency matrix": {
+                "node_input": True,
+                "add_node": True,
+                "node_1": True,
+                "node_2": True,
+                "add_edge": True,
+                "directed_check": True,
+                "matrix_input": False,
+            },
+            "Adjacency list": {
+                "node_input": False,
+                "add_node": False,
+                "node_1": False,
+                "node_2": False,
+                "add_edge": False,
+                "directed_check": False,
+                "matrix_input": True,
+            },
+        }
+        state = graphs_display_map.get(values["-graphs_demo_input_type-"])
+        for key, value in state.items():
+            self.window[f"-graphs_demo_{key}-"].update(disabled=value)
+        self.data_handler.clear_adjacency_list()
+        self.window["-graphs_demo_node_1-"].update(values=[])
+        self.window["-graphs_demo_node_2-"].update(values=[])
+
+    def _on_graphs_demo_add_node(self, values: dict) -> None:
+        """Add node to adjacency list."""
+        result = self.data_handler.add_adjacency_node(
+            values["-graphs_demo_node_input-"]
+        )
+        if result != True:
+            sg.popup_error(
+                result,
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+        else:
+            # Updating drops (for adding edge) with new node
+            adjacency_node_names = self.data_handler.adjacency_node_names
+            self.window["-graphs_demo_node_1-"].update(values=adjacency_node_names)
+            self.window["-graphs_demo_node_2-"].update(values=adjacency_node_names)
+
+    def _on_graphs_demo_add_edge(self, values: dict) -> None:
+        """Add edge to adjacency list."""
+        result = self.data_handler.add_edge_adjacency_list(
+            values["-graphs_demo_node_1-"],
+            values["-graphs_demo_node_2-"],
+            values["-graphs_demo_directed_check-"],
+        )
+        if result != True:
+            sg.popup_error(
+                result,
+                title="Error",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_error_colour,
+            )
+        else:
+            sg.popup_auto_close(
+                "Edge added!",
+                title="New edge",
+                font=(self.font, self.small_text_size),
+                text_color=self.text_success_colour,
+            )
+
+    def _on_graphs_demo_generate_graph(self, values: dict) -> None:
+        """Generate graph image."""
+        if values["-graphs_demo_input_type-"] == "Adjacency matrix":
+            self.start_job(
+                "Rendering graph",
+                self._graph_generated,
+                self.data_handler.generate_graph_from_matrix_string,
+                values["-graphs_demo_matrix_input-"],
+            )
+        else:
+            self.start_job(
+                "Rendering graph",
+                self._graph_generated,
+                self.data_handler.generate_graph_from_adjacency_list,
+            )
+
+    def _on_graphs_demo_back(self, values: dict) -> None:
+        """Return to study menu."""
+        self._screen_switch("-graphs_demo_layout-", "-study_menu_layout-")
+
+    # Graphs viewer
+    def _on_graphs_view_matrix(self, values: dict) -> None:
+        """Display adjacency matrix."""
+        sg.popup(
+            self.data_handler.adjacency_matrix_table_str,
+            title="Adjacency matrix",
+            font=(self.font, self.small_text_size),
+        )
+
+    def _on_graphs_view_back(self, values: dict) -> None:
+        """Back (to graphs demo)."""
+        self._screen_switch("-graphs_view_layout-", "-graphs_demo_layout-")
+
+    # Leaderboard
+    def _on_leaderboard_back(self, values: dict) -> None:
+        """Back to study menu."""
+        self._screen_switch("-leaderboard_layout-", "-study_menu_layout-")
+
+    def _on_leaderboard_reverse_order(self, values: dict) -> None:
+        """Reverse leaderboard order."""
+        self.window["-leaderboard_table-"].update(
+            values=self.data_handler.leaderboard_data_reverse
+        )
+
+    @property
+    def event_handlers(self) -> Dict[str, Dict[str, Callable]]:
+        """
+        Return the event handlers of each screen, as {screen_key: {event_key: handler}}.
+        """
+        return {
+            "-login_layout-": {
+                "-login_create_account-": self._on_login_create_account,
+                "-login_login-": self._on_login_login,
+            },
+            "-create_account_layout-": {
+                "-create_account_login-": self._on_create_account_login,
+                "-create_account_create_account-": self._on_create_account_create_account,
+            },
+            "-study_menu_layout-": {
+                "-study_menu_logout-": self._on_study_menu_logout,
+                "-study_menu_leaderboard-": self._on_study_menu_leaderboard,
+                "-study_menu_flashcards-": self._on_study_menu_flashcards,
+                "-study_menu_study-": self._on_study_menu_study,
+                "-study_menu_launch_demo-": self._on_study_menu_launch_demo,
+            },
+            "-topics_layout-": {
+                "-topics_next-": self._on_topics_next,
+                "-topics_previous-": self._on_topics_previous,
+                "-topics_exit-": self._on_topics_exit,
+            },
+            "-flashcard_menu_layout-": {
+                "-flashcard_menu_study_pack-": self._on_flashcard_menu_study_pack,
+                "-flashcard_menu_share-": self._on_flashcard_menu_share,
+                "-flashcard_menu_download-": self._on_flashcard_menu_download,
+                "-flashcard_menu_browse-": self._on_flashcard_menu_browse,
+                "-flashcard_menu_fork-": self._on_flashcard_menu_fork,
+                "-flashcard_menu_edit_pack-": self._on_flashcard_menu_edit_pack,
+                "-flashcard_menu_delete_pack-": self._on_flashcard_menu_delete_pack,
+                "-flashcard_menu_create-": self._on_flashcard_menu_create,
+                "-flashcard_menu_back-": self._on_flashcard_menu_back,
+            },
+            "-flashcard_creator_title_layout-": {
+                "-flashcard_creator_title_set_name-": self._on_flashcard_creator_title_set_name,
+                "-flashcard_creator_title_cancel-": self._on_flashcard_creator_title_cancel,
+            },
+            "-flashcard_creator_cards_layout-": {
+                "-flashcard_creator_cards_question_type-": self._on_flashcard_creator_cards_question_type,
+                "-flashcard_creator_cards_add_card-": self._on_flashcard_creator_cards_add_card,
+                "-flashcard_creator_cards_add_choice-": self._on_flashcard_creator_cards_add_choice,
+                "-flashcard_creator_cards_save-": self._on_flashcard_creator_cards_save,
+                "-flashcard_creator_cards_cancel-": self._on_flashcard_creator_cards_cancel,
+            },
+            "-flashcard_viewer_layout-": {
+                "-flashcard_viewer_reveal-": self._on_flashcard_viewer_reveal,
+                "-flashcard_viewer_next-": self._on_flashcard_viewer_next,
+                "-flashcard_viewer_submit_numerical-": self._on_flashcard_viewer_submit_numerical,
+                "-flashcard_viewer_submit_multiple_choice-": self._on_flashcard_viewer_submit_multiple_choice,
+                "-flashcard_viewer_exit-": self._on_flashcard_viewer_exit,
+            },
+            "-trees_demo_layout-": {
+                "-trees_demo_exit-": self._on_trees_demo_exit,
+                "-trees_demo_generate-": self._on_trees_demo_generate,
+            },
+            "-trees_view_layout-": {
+                "-trees_view_traverse-": self._on_trees_view_traverse,
+                "-trees_view_add_node-": self._on_trees_view_add_node,
+                "-trees_view_delete_node-": self._on_trees_view_delete_node,
+                "-trees_view_operation-": self._on_trees_view_operation,
+                "-trees_view_back-": self._on_trees_view_back,
+            },
+            "-queues_demo_layout-": {
+                "-queue_demo_enqueue-": self._on_queue_demo_enqueue,
+                "-queue_demo_dequeue-": self._on_queue_demo_dequeue,
+                "-queue_demo_peek-": self._on_queue_demo_peek,
+                "-queue_demo_isfull-": self._on_queue_demo_isfull,
+                "-queue_demo_isempty-": self._on_queue_demo_isempty,
+                "-queue_demo_size-": self._on_queue_demo_size,
+                "-queue_demo_queue_type_combo-": self._on_queue_demo_queue_type_combo,
+                "-queue_demo_push-": self._on_queue_demo_push,
+                "-queue_demo_pop-": self._on_queue_demo_pop,
+                "-queue_demo_rear-": self._on_queue_demo_rear,
+                "-queue_demo_exit-": self._on_queue_demo_exit,
+            },
+            "-graphs_demo_layout-": {
+                "-graphs_demo_input_type-": self._on_graphs_demo_input_type,
+                "-graphs_demo_add_node-": self._on_graphs_demo_add_node,
+                "-graphs_demo_add_edge-": self._on_graphs_demo_add_edge,
+                "-graphs_demo_generate_graph-": self._on_graphs_demo_generate_graph,
+                "-graphs_demo_back-": self._on_graphs_demo_back,
+            },
+            "-graphs_view_layout-": {
+                "-graphs_view_matrix-": self._on_graphs_view_matrix,
+                "-graphs_view_back-": self._on_graphs_view_back,
+            },
+            "-leaderboard_layout-": {
+                "-leaderboard_back-": self._on_leaderboard_back,
+                "-leaderboard_reverse_order-": self._on_leaderboard_reverse_order,
+            },
+        }
+
+    def _record_event_time(self, event: str, seconds: float) -> None:
+        """Add the time taken to handle an event to its timings."""
+        timing = self._event_timings.setdefault(event, [0, 0.0, 0.0])
+        timing[0] += 1
+        timing[1] += seconds
+        timing[2] = max(timing[2], seconds)
+
+    @property
+    def event_timings(self) -> List[Dict[str, Union[str, int, float]]]:
+        """
+        Return the timings of each handled event, slowest on average first.
+
+        Returns:
+            List of dictionaries, each containing:
+                - 'event' (str): The event key.
+                - 'calls' (int): Number of times the event was handled.
+                - 'mean_ms' (float): Average time taken by the handler, in milliseconds.
+                - 'max_ms' (float): Slowest time taken by the handler, in milliseconds.
+        """
+        timings = [
+            {
+                "event": event,
+                "calls": calls,
+                "mean_ms": total * 1000 / calls,
+                "max_ms": slowest * 1000,
+            }
+            for event, (calls, total, slowest) in self._event_timings.items()
+        ]
+        return sorted(timings, key=lambda timing: timing["mean_ms"], reverse=True)
+
+    def run(self) -> None:
+        """Display the GUI, responding to events and passing values."""
+        while True:
+            # Wake up regularly while background jobs run, to show their progress
+            event, values = self.window.read(
+                timeout=100 if self._job_handlers else None
+            )
+
+            # Close the GUI
+            if (
+                event == sg.WINDOW_CLOSED
+                or event == "-login_exit-"
+                or event == "-create_account_exit-"
+            ):
+                break
+
+            # Background jobs
+            if event == sg.TIMEOUT_EVENT:
+                self.update_job_status()
+                continue
+            elif event == JobExecutor.event_key:
+                self.finish_job(*values[event])
+                continue
+            elif event == "-job_cancel-":
+                self.cancel_jobs()
+                continue
+
+            # Pass the event to its handler on the active screen
+            handler = self._event_handlers[self._active_screen].get(event)
+            if handler is None:
+                continue
+            if self.profile_events:
+                start_time = time.perf_counter()
+                handler(values)
+                self._record_event_time(event, time.perf_counter() - start_time)
+            else:
+                handler(values)
+
+        self.data_handler.job_executor.shutdown()
         self.window.close()
+        if self.profile_events:
+            for timing in self.event_timings:
+                print(
+                    "{event}: {calls} call(s), mean {mean_ms:.2f} ms, max {max_ms:.2f} ms".format(
+                        **timing
+                    )
+                )
 
 
 # Initialises and displays the GUI if the module is executed directly
 if __name__ == "__main__":
-    app = GUI()
+    # Run with --profile to print the time taken by each event handler on exit
+    app = GUI(profile_events="--profile" in sys.argv)
     app.run()
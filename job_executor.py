@@ -0,0 +1,122 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+import itertools
+import threading
+import time
+
+"""
+Runs slow operations on worker threads, reporting back to the GUI through window events
+"""
+
+
+class JobExecutor:
+    """
+    Runs jobs on worker threads so the GUI event loop is never blocked.
+
+    When a job finishes, an event is posted to the window with write_event_value.
+    The event's value is a tuple of (job_id, result), where result is the job's return value,
+    or the exception it raised. Cancelled jobs post no event.
+    """
+
+    event_key = "-job_done-"
+
+    def __init__(self, workers: int = 2) -> None:
+        """
+        Initialise a JobExecutor object.
+
+        Arguments:
+            workers (int): Number of worker threads. Defaults to 2.
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="job"
+        )
+        self._window = None
+        self._job_ids = itertools.count(1)
+        # Running jobs by job_id, as {"name": str, "future": Future, "started": float}
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def set_window(self, window: Any) -> None:
+        """Set the window which receives job completion events."""
+        self._window = window
+
+    def submit(self, name: str, function: Callable, *args, **kwargs) -> int:
+        """
+        Run a function on a worker thread.
+
+        Arguments:
+            name (str): Description of the job, shown to the user while it runs.
+            function (Callable): The function to run.
+            *args, **kwargs: Arguments for the function.
+
+        Returns:
+            int: ID of the job, included in its completion event.
+        """
+        job_id = next(self._job_ids)
+        with self._lock:
+            future = self._executor.submit(function, *args, **kwargs)
+            self._jobs[job_id] = {
+                "name": name,
+                "future": future,
+                "started": time.monotonic(),
+            }
+        future.add_done_callback(lambda done: self._job_done(job_id, done))
+        return job_id
+
+    def _job_done(self, job_id: int, future: Future) -> None:
+        """Post the result of a finished job to the window, unless it was cancelled."""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is None or future.cancelled() or self._window is None:
+            return
+        error = future.exception()
+        result = error if error is not None else future.result()
+        self._window.write_event_value(self.event_key, (job_id, result))
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Cancel a job. A job which has not started is never run; a running job is left to
+        finish on its thread, but its result is discarded.
+
+        Returns:
+            bool: True if the job was running or waiting, otherwise False.
+        """
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is None:
+            return False
+        job["future"].cancel()
+        return True
+
+    def is_running(self, name: str) -> bool:
+        """Check if a job with a name is running or waiting."""
+        with self._lock:
+            return any(job["name"] == name for job in self._jobs.values())
+
+    @property
+    def running_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Return the jobs which are running or waiting, oldest first.
+
+        Returns:
+            List of dictionaries, each containing:
+                - 'job_id' (int): ID of the job.
+                - 'name' (str): Description of the job.
+                - 'elapsed' (float): Seconds since the job was submitted.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "job_id": job_id,
+                    "name": job["name"],
+                    "elapsed": now - job["started"],
+                }
+                for job_id, job in self._jobs.items()
+            ]
+
+    def shutdown(self) -> None:
+        """Cancel waiting jobs and stop accepting new ones."""
+        with self._lock:
+            self._jobs = {}
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,232 @@
+from database_access import Database
+from cards import CardPack
+from pathlib import Path
+from typing import Dict, Iterator, List, Union
+import argparse
+import gzip
+import json
+import sqlite3
+
+"""
+Exports and imports card packs as compressed, line-delimited archives
+"""
+
+
+class PackArchive:
+    """
+    Streams card packs to and from gzip-compressed JSON Lines archives.
+
+    Each line of an archive is one JSON object:
+        - {"archive": "study_tool_packs", "version": int} header on the first line.
+        - {"card": int, "question": str, "answer": str, "points": int, "question_type": str}
+          is a card body, written once for every card used by the archive's packs, before the first pack.
+        - {"pack": str} starts a new pack, named by the value.
+        - {"ref": int} adds the card body with that "card" value to the current pack.
+    """
+
+    archive_name = "study_tool_packs"
+    version = 2
+    question_types = ("Integer", "Reveal", "Multiple Choice")
+
+    def __init__(self, db: Database) -> None:
+        """
+        Initialise a PackArchive object.
+
+        Arguments:
+            db (Database): Database to export packs from and import packs into.
+        """
+        self._db = db
+
+    def export_packs(self, pack_ids: List[int], file_path: Path) -> int:
+        """
+        Write card packs to an archive, streaming cards from the database.
+
+        Arguments:
+            pack_ids (List[int]): PackIDs of the packs to export.
+            file_path (Path): Path of the archive to create.
+
+        Returns:
+            int: Number of cards in the exported packs (including repeated cards).
+
+        Raises:
+            ValueError: If a PackID does not belong to a pack. The archive is not created.
+        """
+        pack_names = []
+        for pack_id in pack_ids:
+            pack_name = self._db.get_pack_name(pack_id)
+            if pack_name is None:
+                raise ValueError(f"No pack has the PackID {pack_id}.")
+            pack_names.append(pack_name)
+        card_count = 0
+        with gzip.open(file_path, "wt", encoding="utf-8") as file:
+            file.write(
+                json.dumps({"archive": self.archive_name, "version": self.version})
+                + "\n"
+            )
+            # Each card body is written once, so packs only refer to cards by CardID
+            for card in self._db.iter_cards_in_packs(pack_ids):
+                record = {
+                    "card": card["card_id"],
+                    "question": card["question"],
+                    "answer": card["answer"],
+                    "points": card["points"],
+                    "question_type": card["question_type"],
+                }
+                file.write(json.dumps(record) + "\n")
+            for pack_id, pack_name in zip(pack_ids, pack_names):
+                file.write(json.dumps({"pack": pack_name}) + "\n")
+                for card in self._db.iter_pack_cards(pack_id):
+                    file.write(json.dumps({"ref": card["card_id"]}) + "\n")
+                    card_count += 1
+        return card_count
+
+    def import_packs(self, file_path: Path, UID: int) -> List[int]:
+        """
+        Create card packs from an archive, streaming cards into the database in a single transaction.
+        Card references are resolved through a temporary table, so memory use does not grow with the archive.
+
+        Arguments:
+            file_path (Path): Path of the archive to read.
+            UID (int): User ID the imported packs will belong to.
+
+        Returns:
+            List[int]: PackIDs of the created packs.
+
+        Raises:
+            ValueError: If the archive is not formatted correctly, or a pack name is invalid.
+                        Nothing from the archive is imported.
+        """
+        pack_ids = []
+        with gzip.open(
+            file_path, "rt", encoding="utf-8"
+        ) as file, self._db.transaction() as cur:
+            records = (json.loads(line) for line in file if line.strip())
+            header = next(records, None)
+            if (
+                not isinstance(header, dict)
+                or header.get("archive") != self.archive_name
+                or header.get("version") != self.version
+            ):
+                raise ValueError("File is not a supported card pack archive.")
+            # CardID of each card body in this database, by its "card" value in the archive
+            cur.execute("DROP TABLE IF EXISTS temp.ArchiveCards;")
+            cur.execute(
+                "CREATE TEMP TABLE ArchiveCards (Ref INTEGER PRIMARY KEY, CardID INTEGER NOT NULL);"
+            )
+            record = next(records, None)
+            while record is not None and "pack" not in record:
+                card_id = self._db._get_or_insert_card(cur, self._read_card(record))
+                try:
+                    cur.execute(
+                        "INSERT INTO temp.ArchiveCards (Ref, CardID) VALUES (?, ?);",
+                        (record["card"], card_id),
+                    )
+                except sqlite3.IntegrityError:
+                    raise ValueError("Archive contains a card body twice.")
+                record = next(records, None)
+            while record is not None:
+                pack_name = record["pack"]
+                if not isinstance(pack_name, str) or not CardPack.valid_name(pack_name):
+                    raise ValueError(
+                        "Archive contains a pack name which isn't between 3 and 30 alphanumeric characters."
+                    )
+                # The card ID generator stops at the next pack record and hands it back here
+                next_pack = []
+                pack_ids.append(
+                    self._db._insert_pack(
+                        cur,
+                        pack_name,
+                        self._read_card_ids(records, cur, next_pack),
+                        UID,
+                    )
+                )
+                record = next_pack[0] if next_pack else None
+            cur.execute("DROP TABLE temp.ArchiveCards;")
+        self._db._invalidate_library(UID)
+        return pack_ids
+
+    def _read_card(self, record: dict) -> Dict[str, Union[int, str]]:
+        """
+        Check a card body record, returning the card it describes.
+
+        Returns:
+            Dictionary formatted as {"question": str, "answer": str, "points": int, "question_type": str}.
+
+        Raises:
+            ValueError: If the record is not a valid card body.
+        """
+        card = {
+            "question": record.get("question"),
+            "answer": record.get("answer"),
+            "points": record.get("points"),
+            "question_type": record.get("question_type"),
+        }
+        if (
+            not isinstance(record.get("card"), int)
+            or not isinstance(card["question"], str)
+            or not isinstance(card["answer"], str)
+            or not isinstance(card["points"], int)
+            or card["question_type"] not in self.question_types
+        ):
+            raise ValueError("Archive contains an invalid card.")
+        return card
+
+    @staticmethod
+    def _read_card_ids(
+        records: Iterator[dict], cur: sqlite3.Cursor, next_pack: list
+    ) -> Iterator[int]:
+        """
+        Yield the CardIDs of one pack's cards from the archive records.
+
+        Arguments:
+            records (Iterator[dict]): Remaining records of the archive.
+            cur (sqlite3.Cursor): Cursor of the import's transaction, holding the ArchiveCards table.
+            next_pack (list): Receives the record of the next pack, if there is one.
+
+        Yields:
+            int: CardID of each card in the pack, in order.
+        """
+        for record in records:
+            if "pack" in record:
+                next_pack.append(record)
+                return
+            if "ref" not in record:
+                raise ValueError("Archive contains a card body after the first pack.")
+            cur.execute(
+                "SELECT CardID FROM temp.ArchiveCards WHERE Ref = ?;", (record["ref"],)
+            )
+            row = cur.fetchone()
+            if row is None:
+                raise ValueError("Archive refers to a card it doesn't contain.")
+            yield row["CardID"]
+
+
+# Command line interface, for moving packs between installations
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export or import card packs.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Export packs to an archive.")
+    export_parser.add_argument("file", type=Path, help="Archive to create.")
+    export_parser.add_argument(
+        "pack_ids", type=int, nargs="+", help="PackIDs to export."
+    )
+    import_parser = subparsers.add_parser(
+        "import", help="Import packs from an archive."
+    )
+    import_parser.add_argument("file", type=Path, help="Archive to read.")
+    import_parser.add_argument(
+        "uid", type=int, help="UID of the user receiving the packs."
+    )
+    args = parser.parse_args()
+    db = Database(Path.cwd() / "database" / "study_tool_db.db")
+    db.check_database()
+    archive = PackArchive(db)
+    try:
+        if args.command == "export":
+            card_count = archive.export_packs(args.pack_ids, args.file)
+            print(f"Exported {len(args.pack_ids)} pack(s) with {card_count} card(s).")
+        else:
+            pack_ids = archive.import_packs(args.file, args.uid)
+            print(f"Imported {len(pack_ids)} pack(s): {pack_ids}")
+    except ValueError as error:
+        parser.error(str(error))
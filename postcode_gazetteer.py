@@ -0,0 +1,134 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+import mmap
+import re
+
+"""
+Resolves postcodes to towns and countries offline, from a bundled gazetteer
+"""
+
+
+class PostcodeGazetteer:
+    """
+    Read-only index of postcode prefixes, memory-mapped from a sorted text file.
+
+    Each line of the file is 'PREFIX<TAB>TOWN<TAB>COUNTRY', sorted by prefix. Prefixes may be postcode areas
+    (e.g. 'SW') or more specific outward codes (e.g. 'SW1A'); a lookup uses the longest prefix that matches.
+    """
+
+    postcode_pattern = re.compile(r"^([A-Z]{1,2})([0-9][A-Z0-9]?)([0-9][A-Z]{2})$")
+    # Gazetteers returned by shared, by file path
+    _shared = {}
+
+    def __init__(self, file_path: Path) -> None:
+        """
+        Initialise a PostcodeGazetteer object, mapping the gazetteer file into memory.
+
+        Arguments:
+            file_path (Path): Path of the gazetteer file.
+        """
+        with open(file_path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def shared(cls, file_path: Path) -> "PostcodeGazetteer":
+        """Return a gazetteer for a file, mapping it only once per process."""
+        if file_path not in cls._shared:
+            cls._shared[file_path] = cls(file_path)
+        return cls._shared[file_path]
+
+    @classmethod
+    def format_postcode(cls, postcode: str) -> Optional[str]:
+        """
+        Validate a UK postcode, returning it in the standard format (e.g. 'SW1A 2AA').
+
+        Returns:
+            Optional[str]: The formatted postcode, otherwise None if it is not a valid postcode.
+        """
+        match = cls.postcode_pattern.match(postcode.upper().replace(" ", ""))
+        if match is None:
+            return None
+        return f"{match.group(1)}{match.group(2)} {match.group(3)}"
+
+    def _read_line(self, position: int) -> tuple:
+        """Return the start, end and fields of the line containing a byte position."""
+        start = self._map.rfind(b"\n", 0, position) + 1
+        end = self._map.find(b"\n", start)
+        end = len(self._map) if end == -1 else end
+        return start, end, self._map[start:end].split(b"\t")
+
+    def _first_line_from(self, prefix: bytes) -> int:
+        """Binary search for the byte position of the first line whose prefix is not less than the given prefix."""
+        low, high = 0, len(self._map)
+        while low < high:
+            start, end, fields = self._read_line((low + high) // 2)
+            if fields[0] < prefix:
+                low = end + 1
+            else:
+                high = start
+        return low
+
+    @staticmethod
+    def _entry(fields: List[bytes]) -> Dict[str, str]:
+        """Return the fields of a gazetteer line as a dictionary."""
+        return {
+            "prefix": fields[0].decode("utf-8"),
+            "city": fields[1].decode("utf-8"),
+            "country": fields[2].decode("utf-8"),
+        }
+
+    def _get(self, prefix: str) -> Optional[Dict[str, str]]:
+        """Return the gazetteer entry for an exact prefix, otherwise None."""
+        position = self._first_line_from(prefix.encode("utf-8"))
+        if position >= len(self._map):
+            return None
+        fields = self._read_line(position)[2]
+        return self._entry(fields) if fields[0] == prefix.encode("utf-8") else None
+
+    def lookup(self, postcode: str) -> Optional[Dict[str, str]]:
+        """
+        Find the town and country of a postcode, using the longest matching prefix.
+
+        Arguments:
+            postcode (str): The postcode to resolve.
+
+        Returns:
+            Optional[Dict[str, str]]: Dictionary with 'prefix', 'city' and 'country', otherwise None if not found.
+        """
+        formatted_postcode = self.format_postcode(postcode)
+        if formatted_postcode is None:
+            return None
+        outward_code = formatted_postcode.split(" ")[0]
+        area = self.postcode_pattern.match(formatted_postcode.replace(" ", "")).group(1)
+        # Try the full outward code, then shorter prefixes down to the postcode area
+        for length in range(len(outward_code), len(area) - 1, -1):
+            entry = self._get(outward_code[:length])
+            if entry is not None:
+                return entry
+        return None
+
+    def search(self, prefix: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Find gazetteer entries starting with a prefix, in sorted order.
+
+        Arguments:
+            prefix (str): Start of a postcode.
+            limit (int): Maximum number of entries to return. Defaults to 10.
+
+        Returns:
+            List[Dict[str, str]]: Entries formatted as in lookup.
+        """
+        prefix_bytes = prefix.upper().replace(" ", "").encode("utf-8")
+        position = self._first_line_from(prefix_bytes)
+        entries = []
+        while position < len(self._map) and len(entries) < limit:
+            _, end, fields = self._read_line(position)
+            if not fields[0].startswith(prefix_bytes):
+                break
+            entries.append(self._entry(fields))
+            position = end + 1
+        return entries
+
+    def close(self) -> None:
+        """Unmap the gazetteer file."""
+        self._map.close()
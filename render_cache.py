@@ -0,0 +1,148 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+import hashlib
+import json
+import threading
+
+"""
+Keeps rendered tree and graph images in memory, so the same structure is never drawn twice
+"""
+
+
+class RenderCache:
+    """
+    Thread-safe, least recently used cache of encoded images, keyed by what they show.
+
+    Keys are hashes of a canonical description of a tree or graph and the image size, so sessions
+    building the same structure share one image. Sessions only hold the key of their latest image.
+    When the cached images pass the memory limit, the least recently used are evicted.
+    """
+
+    def __init__(self, memory_limit: int = 64 * 1024 * 1024) -> None:
+        """
+        Initialise a RenderCache object.
+
+        Arguments:
+            memory_limit (int): Bytes the cached images may hold. Defaults to 64 MiB.
+        """
+        self._memory_limit = memory_limit
+        # Images from least to most recently used
+        self._images = OrderedDict()
+        self._total_size = 0
+        # Keys being rendered, so other threads wait for the image rather than render it again
+        self._rendering = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._images
+
+    @staticmethod
+    def make_key(kind: str, structure: Any, size: int) -> str:
+        """
+        Hash a description of an image's contents into a cache key.
+
+        Arguments:
+            kind (str): What is drawn, such as "tree" or "adjacency list".
+            structure (Any): Canonical description of the tree or graph, made of JSON types.
+                             Equal structures must have equal descriptions.
+            size (int): Length of the image's longer side in pixels.
+
+        Returns:
+            str: The key.
+        """
+        description = json.dumps(
+            [kind, size, structure], sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return a cached image, marking it as the most recently used.
+
+        Returns:
+            Optional[bytes]: The image, otherwise None if it is not cached.
+        """
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+
+    def get_or_render(self, key: str, render: Callable[[], bytes]) -> bytes:
+        """
+        Return a cached image, rendering and caching it if it is not cached.
+
+        Arguments:
+            key (str): Key of the image, from make_key.
+            render (Callable[[], bytes]): Draws the image, if no other thread is already drawing it.
+
+        Returns:
+            bytes: The image.
+        """
+        while True:
+            with self._lock:
+                image = self._images.get(key)
+                if image is not None:
+                    self._images.move_to_end(key)
+                    self.hits += 1
+                    return image
+                rendering = self._rendering.get(key)
+                if rendering is None:
+                    rendering = self._rendering[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Another thread is drawing the same image, so wait for it, then look again
+            rendering.wait()
+        try:
+            image = render()
+            with self._lock:
+                self._store(key, image)
+        finally:
+            with self._lock:
+                del self._rendering[key]
+            rendering.set()
+        return image
+
+    def _store(self, key: str, image: bytes) -> None:
+        """Cache an image while holding the lock, evicting least recently used images if over the memory limit."""
+        if image is None:
+            return
+        self._total_size -= len(self._images.pop(key, b""))
+        self._images[key] = image
+        self._total_size += len(image)
+        # Evict least recently used images, never the one just stored
+        while self._total_size > self._memory_limit and len(self._images) > 1:
+            _, evicted = self._images.popitem(last=False)
+            self._total_size -= len(evicted)
+
+    def clear(self) -> None:
+        """Remove every cached image."""
+        with self._lock:
+            self._images.clear()
+            self._total_size = 0
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Return the memory used by cached images.
+
+        Returns:
+            Dict[str, int]:
+                - 'images' (int): Number of cached images.
+                - 'total_bytes' (int): Bytes held by cached images.
+                - 'limit_bytes' (int): The memory limit.
+                - 'hits' (int): Images returned from the cache.
+                - 'misses' (int): Images rendered.
+        """
+        with self._lock:
+            return {
+                "images": len(self._images),
+                "total_bytes": self._total_size,
+                "limit_bytes": self._memory_limit,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,337 @@
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Dict, Optional
+import secrets
+import sys
+import threading
+import time
+import types
+
+"""
+Holds the state of each signed in user, so one process can serve many users
+"""
+
+
+class Session:
+    """
+    State of one user's visit: who they are, and what they are studying or building.
+
+    DataHandler reads and writes this state, so several users can be served by DataHandler objects
+    sharing one Database, each with their own Session.
+    """
+
+    def __init__(self, session_id: str = None) -> None:
+        """
+        Initialise a Session object with no user signed in.
+
+        Arguments:
+            session_id (str): Optional. Unique identifier of the session. Defaults to a new random token.
+        """
+        self.session_id = (
+            session_id if session_id is not None else secrets.token_urlsafe(24)
+        )
+        self.last_used = time.monotonic()
+        # Settings, kept when the user signs out
+        self.queue_max_size = 6
+        self.prefetch_depth = 3
+        self.catalog_order = "popular"
+        self.card_prefetcher = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all user data, such as when the user signs out."""
+        self.stop_prefetcher()
+        # Account
+        self.cur_UID = None
+        self.cur_first_name = ""
+        self.user_library = None
+        # Trees, queues and graphs demos
+        # Key of the most recent tree or graph image in the shared render cache, and what it shows
+        self.image_key = None
+        self.image_source = None
+        self.tree = None
+        self.queue = None
+        self.adjacency_list = {}
+        self.adj_matrix = []
+        # Flashcards
+        self.current_card_pack = None
+        self.current_card = None
+        self.correct_card_ids = []
+        self.editing_pack_id = None
+        self.leaderboard_data = []
+        self.catalog_cursor = None
+        self.catalog_packs = []
+        # Study notes
+        self.topic_id = None
+        self.topic_theory_list = []
+        self.topic_page = -1
+
+    def stop_prefetcher(self) -> None:
+        """Stop preparing cards for the pack being studied."""
+        if self.card_prefetcher is not None:
+            self.card_prefetcher.stop()
+            self.card_prefetcher = None
+
+    def touch(self) -> None:
+        """Record that the session has just been used."""
+        self.last_used = time.monotonic()
+
+    def memory_usage(self) -> int:
+        """
+        Estimate the memory held by the session's state, following references between objects.
+        Functions, classes, modules, executors and thread primitives are not counted, as they are shared.
+
+        Returns:
+            int: Approximate size in bytes.
+        """
+        skipped_types = (
+            type,
+            types.ModuleType,
+            types.FunctionType,
+            types.MethodType,
+            types.BuiltinFunctionType,
+            Executor,
+        )
+        seen = {id(self)}
+        size = sys.getsizeof(self)
+        stack = list(vars(self).values())
+        while stack:
+            obj = stack.pop()
+            if (
+                id(obj) in seen
+                or isinstance(obj, skipped_types)
+                or type(obj).__module__ in ("threading", "_thread")
+            ):
+                continue
+            seen.add(id(obj))
+            size += sys.getsizeof(obj)
+            # Containers are copied before walking them, as worker threads may be changing them,
+            # such as a card prefetcher filling its prepared cards
+            if isinstance(obj, dict):
+                for key, value in list(obj.items()):
+                    stack.extend((key, value))
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                stack.extend(list(obj))
+            else:
+                if hasattr(obj, "__dict__"):
+                    stack.extend(list(vars(obj).values()))
+                # Slotted objects, such as tree nodes, keep attributes in the slots of each class they inherit
+                for cls in type(obj).__mro__:
+                    for slot in cls.__dict__.get("__slots__", ()):
+                        if hasattr(obj, slot):
+                            stack.append(getattr(obj, slot))
+        return size
+
+
+class SessionStore:
+    """
+    Thread-safe store of sessions by session ID.
+
+    Sessions idle for longer than the idle timeout are evicted. When the estimated memory of all sessions
+    passes the memory limit, the least recently used sessions are evicted until it is back under the limit.
+    Requests hold a session with acquire and release, and sessions held by a request are never evicted,
+    measured or cleared until released.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = 30 * 60,
+        memory_limit: int = 256 * 1024 * 1024,
+    ) -> None:
+        """
+        Initialise a SessionStore object.
+
+        Arguments:
+            idle_timeout (float): Seconds a session can go unused before it is evicted. Defaults to 30 minutes.
+            memory_limit (int): Estimated bytes all sessions may hold. Defaults to 256 MiB.
+        """
+        self._idle_timeout = idle_timeout
+        self._memory_limit = memory_limit
+        # Sessions from least to most recently used
+        self._sessions = OrderedDict()
+        # Estimated size of each session, re-estimated by sample_sizes once it has changed
+        self._sizes = {}
+        self._total_size = 0
+        self._changed_ids = set()
+        # Number of requests holding each session
+        self._use_counts = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def add(self, session: Session = None) -> Session:
+        """
+        Store a session.
+
+        Arguments:
+            session (Session): Optional. The session to store, such as one a user has just signed in with.
+                               Defaults to None, creating a new Session.
+
+        Returns:
+            Session: The stored session.
+        """
+        if session is None:
+            session = Session()
+        with self._lock:
+            self._total_size -= self._sizes.get(session.session_id, 0)
+            self._sessions[session.session_id] = session
+            self._sessions.move_to_end(session.session_id)
+            self._sizes[session.session_id] = 0
+            self._changed_ids.add(session.session_id)
+        session.touch()
+        return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """
+        Return a session, marking it as the most recently used.
+
+        Returns:
+            Optional[Session]: The session, otherwise None if it does not exist or has expired.
+        """
+        with self._lock:
+            session = self._get(session_id)
+        if session is not None:
+            session.touch()
+        return session
+
+    def acquire(self, session_id: str) -> Optional[Session]:
+        """
+        Return a session for a request to use, protecting it from eviction until it is released.
+
+        Returns:
+            Optional[Session]: The session, otherwise None if it does not exist or has expired.
+        """
+        with self._lock:
+            session = self._get(session_id)
+            if session is None:
+                return None
+            self._use_counts[session_id] = self._use_counts.get(session_id, 0) + 1
+        session.touch()
+        return session
+
+    def release(self, session: Session) -> None:
+        """
+        Finish using a session returned by acquire, so its size is re-estimated by the next sample.
+        A session removed while in use is cleared once its last request releases it.
+
+        Arguments:
+            session (Session): The session which was acquired.
+        """
+        session_id = session.session_id
+        with self._lock:
+            self._use_counts[session_id] -= 1
+            if self._use_counts[session_id] > 0:
+                return
+            del self._use_counts[session_id]
+            if session_id in self._sessions:
+                self._changed_ids.add(session_id)
+                return
+        session.reset()
+
+    def _get(self, session_id: str) -> Optional[Session]:
+        """Return a session while holding the lock, removing it if it has expired."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        if (
+            time.monotonic() - session.last_used > self._idle_timeout
+            and session_id not in self._use_counts
+        ):
+            self._remove(session_id)
+            return None
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def remove(self, session_id: str) -> None:
+        """Remove a session, clearing its data once no request is using it."""
+        with self._lock:
+            self._remove(session_id)
+
+    def _remove(self, session_id: str) -> None:
+        """Remove a session while holding the lock."""
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._total_size -= self._sizes.pop(session_id, 0)
+            self._changed_ids.discard(session_id)
+            # A request still using the session clears it on release
+            if session_id not in self._use_counts:
+                session.reset()
+
+    def sample_sizes(self) -> int:
+        """
+        Re-estimate the memory of sessions changed since the last sample, then evict the least recently
+        used sessions while over the memory limit. Sessions in use are skipped, and measured next time.
+        Meant to be called on a timer, away from requests, as estimating a session walks all of its state.
+
+        Returns:
+            int: Number of sessions removed.
+        """
+        with self._lock:
+            changed = [
+                self._sessions[session_id]
+                for session_id in self._changed_ids
+                if session_id not in self._use_counts
+            ]
+        for session in changed:
+            size = session.memory_usage()
+            with self._lock:
+                session_id = session.session_id
+                if session_id not in self._sessions or session_id in self._use_counts:
+                    continue
+                self._changed_ids.discard(session_id)
+                self._total_size += size - self._sizes[session_id]
+                self._sizes[session_id] = size
+        evicted_count = 0
+        with self._lock:
+            if self._total_size > self._memory_limit:
+                # Evict from the least recently used, never the most recently used
+                for session_id in list(self._sessions)[:-1]:
+                    if self._total_size <= self._memory_limit:
+                        break
+                    if session_id not in self._use_counts:
+                        self._remove(session_id)
+                        evicted_count += 1
+        return evicted_count
+
+    def evict_idle(self) -> int:
+        """
+        Remove sessions which have not been used within the idle timeout, skipping sessions in use.
+
+        Returns:
+            int: Number of sessions removed.
+        """
+        expiry_time = time.monotonic() - self._idle_timeout
+        with self._lock:
+            # Sessions are ordered by use, so stop at the first one used recently
+            expired_ids = []
+            for session_id, session in self._sessions.items():
+                if session.last_used >= expiry_time:
+                    break
+                if session_id not in self._use_counts:
+                    expired_ids.append(session_id)
+            for session_id in expired_ids:
+                self._remove(session_id)
+        return len(expired_ids)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Return estimated memory usage of the stored sessions.
+
+        Returns:
+            Dict[str, int]:
+                - 'sessions' (int): Number of sessions.
+                - 'total_bytes' (int): Estimated bytes held by all sessions.
+                - 'largest_bytes' (int): Estimated bytes held by the largest session.
+                - 'limit_bytes' (int): The memory limit.
+        """
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "total_bytes": self._total_size,
+                "largest_bytes": max(self._sizes.values(), default=0),
+                "limit_bytes": self._memory_limit,
+            }
@@ -0,0 +1,466 @@
+from database_access import Database
+from data_handler import DataHandler
+from sessions import Session, SessionStore
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+import argparse
+import asyncio
+import json
+import logging
+import re
+import threading
+
+"""
+Serves the study tool's features over HTTP, so many students can share one process
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class StudyService:
+    """
+    Asynchronous JSON-over-HTTP service in front of DataHandler.
+
+    Each signed in student gets a session token, naming a Session in a SessionStore which holds their state.
+    Sessions left idle, or least recently used once the store's memory limit is reached, are signed out,
+    though never while a request is using them. Session memory is estimated on a timer, not per request.
+    Each request is handled by a short-lived DataHandler acting on the session, and every DataHandler
+    shares one Database, and so its connection pool, library cache and topics.
+    Blocking work (hashing, queries and rendering) runs on a thread pool, so the event loop only handles I/O.
+
+    Routes (request and response bodies are JSON unless stated):
+        POST /accounts        {"username", "password", "first_name", "email", "house_number", "postcode"}
+        POST /sessions        {"username", "password"} -> {"token", "first_name"}
+        DELETE /sessions      Sign out.
+        GET /topics           -> {"topics", "revised_percent"}
+        GET /library          -> {"packs"}
+        POST /study           {"pack_id"} -> {"pack_name", "card_count"}
+        GET /study/next       -> {"card"}, where card is null once the pack is finished
+        POST /study/answer    {"answer", "use_index"} -> {"correct", "answer"}
+        POST /study/finish    -> {"score"}
+        GET /leaderboard      -> {"rows", "rank"}
+        POST /trees           {"values", "balanced", "tree_type"} -> PNG image
+        POST /graphs          {"matrix"} -> PNG image
+        GET /status           -> {"sessions", "total_bytes", "largest_bytes", "limit_bytes", "render_cache", "thumbnail_cache"}
+    Every route other than POST /accounts and POST /sessions needs an 'Authorization: Bearer <token>' header.
+    """
+
+    max_body_size = 64 * 1024
+    status_reasons = {
+        200: "OK",
+        201: "Created",
+        400: "Bad Request",
+        401: "Unauthorized",
+        404: "Not Found",
+        405: "Method Not Allowed",
+        413: "Payload Too Large",
+        500: "Internal Server Error",
+    }
+
+    def __init__(
+        self,
+        db: Database,
+        workers: int = 16,
+        idle_timeout: float = 30 * 60,
+        memory_limit: int = 256 * 1024 * 1024,
+    ) -> None:
+        """
+        Initialise a StudyService object.
+
+        Arguments:
+            db (Database): Checked database, shared by every session.
+            workers (int): Number of threads running blocking work. Defaults to 16.
+            idle_timeout (float): Seconds a session can go unused before it is signed out. Defaults to 30 minutes.
+            memory_limit (int): Estimated bytes all sessions may hold. Defaults to 256 MiB.
+        """
+        self._db = db
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="service"
+        )
+        # Handler for requests without a session (signing in and creating accounts)
+        self._anonymous_handler = DataHandler(db)
+        # Sessions by token, with a lock per token so a session's requests are handled one at a time
+        self._sessions = SessionStore(idle_timeout, memory_limit)
+        self._session_locks = {}
+        # Graphs are drawn with matplotlib's shared pyplot state, so only one is drawn at a time
+        self._graph_lock = threading.Lock()
+        # (method, path pattern, function, needs a session)
+        self._routes = [
+            ("POST", re.compile(r"^/accounts$"), self._create_account, False),
+            ("POST", re.compile(r"^/sessions$"), self._sign_in, False),
+            ("DELETE", re.compile(r"^/sessions$"), self._sign_out, True),
+            ("GET", re.compile(r"^/topics$"), self._topics, True),
+            ("GET", re.compile(r"^/library$"), self._library, True),
+            ("POST", re.compile(r"^/study$"), self._start_study, True),
+            ("GET", re.compile(r"^/study/next$"), self._next_card, True),
+            ("POST", re.compile(r"^/study/answer$"), self._answer_card, True),
+            ("POST", re.compile(r"^/study/finish$"), self._finish_study, True),
+            ("GET", re.compile(r"^/leaderboard$"), self._leaderboard, True),
+            ("POST", re.compile(r"^/trees$"), self._render_tree, True),
+            ("POST", re.compile(r"^/graphs$"), self._render_graph, True),
+            ("GET", re.compile(r"^/status$"), self._status, True),
+        ]
+
+    @property
+    def session_count(self) -> int:
+        """Return the number of signed in sessions."""
+        return len(self._sessions)
+
+    @property
+    def session_memory(self) -> Dict[str, int]:
+        """Return the estimated memory held by signed in sessions, formatted as in SessionStore.memory_usage."""
+        return self._sessions.memory_usage()
+
+    # Route functions, run on the thread pool. Each returns (status, body), where body is a dict or PNG bytes.
+    def _create_account(
+        self, handler: DataHandler, body: dict
+    ) -> Tuple[int, Union[dict, bytes]]:
+        address_result = handler.val_create_address(
+            str(body.get("house_number", "")), str(body.get("postcode", ""))
+        )
+        if not address_result["result"]:
+            return 400, {"err_msg": address_result["err_msg"]}
+        result = handler.create_account(
+            str(body.get("username", "")),
+            str(body.get("password", "")),
+            str(body.get("first_name", "")),
+            str(body.get("email", "")),
+            address_result["address"],
+        )
+        if not result["result"]:
+            return 400, {"err_msg": str(result["err_msg"])}
+        return 201, {"address": address_result["address"]}
+
+    def _sign_in(
+        self, handler: DataHandler, body: dict
+    ) -> Tuple[int, Union[dict, bytes]]:
+        session = Session()
+        session_handler = DataHandler(self._db, session)
+        auth_result = session_handler.authenticate_user(
+            str(body.get("username", "")), str(body.get("password", ""))
+        )
+        if not auth_result["auth"]:
+            return 401, {"err_msg": auth_result["err_msg"]}
+        self._sessions.add(session)
+        return 201, {
+            "token": session.session_id,
+            "first_name": session_handler.cur_name,
+        }
+
+    def _sign_out(
+        self, handler: DataHandler, body: dict
+    ) -> Tuple[int, Union[dict, bytes]]:
+        self._sessions.remove(handler.session.session_id)
+        return 200, {}
+
+    def _topics(
+        self, handler: DataHandler, body: dict
+    ) -> Tuple[int, Union[dict, bytes]]:
+        return 200, {
+            "topics": handler.topics_list,
+            "revised_percent": handler.calc_revised_percent,
+        }
+
+    def _library(
+        self, handler: DataHandler, body: dict
+    ) -> Tuple[int, Union[dict, bytes]]:
+        pack_names = handler.user_library_list
+        packs = [handler.selected_pack_details(i) for i in range(len(pack_names))]
+        return 200, {"packs": packs}
+
+    def _start_study(
+        self, handler: DataHandler, body: dict
+    ) -> Tuple[int, Union[dict, bytes]]:
+        pack_names = handler.user_library_list
+        pack_ids = [handler.selected_pack_id(i) for i in range(len(pack_names))]
+        if body.get("pack_id") not in pack_ids:
+            return 404, {"err_msg": "This pack is not in your library."}
+        handler.load_pack_data(body["pack_id"])
+        return 200, {
+            "pack_name": handler.current_pack_name,
+            "card_count": handler.pack_cards_count,
+        }
+
+    def _next_card(
+        self, handler: DataHandler, body: dict
+    ) -> Tuple[int, Union[dict, bytes]]:
+        if not handler.pack_loaded:
+            return 400, {"err_msg": "Please start studying a pack first."}
+        card = handler.next_card_info
+        if not card:
+            return 200, {"card": None}
+        # Answers are only sent for reveal cards; other cards are checked by the service
+        card_data = {
+            "question": card["question"],
+            "question_type": card["question_type"],
+            "points": card["points"],
+        }
+        if card["question_type"] == "Multiple Choice":
+            card_data["choices"] = card["answer"]["all"]
+        elif card["question_type"] == "Reveal":
+            card_data["answer"] = card["answer"]
+        return 200, {"card": card_data}
+
+    def _answer_card(
+        self, handler: DataHandler, body: dict
+    ) -> Tuple[int, Union[dict, bytes]]:
+        if not handler.pack_loaded:
+            return 400, {"err_msg": "Please start studying a pack first."}
+        result = handler.check_answer(
+            str(body.get("answer", "")), bool(body.get("use_index", False))
+        )
+        if result is True:
+            return 200, {"correct": True, "answer": None}
+        return 200, {"correct": False, "answer": result or None}
+
+    def _finish_study(
+        self, handler: DataHandler, body: dict
+    ) -> Tuple[int, Union[dict, bytes]]:
+        if not handler.pack_loaded:
+            return 400, {"err_msg": "Please start studying a pack first."}
+        return 200, {"score": handler.push_user_scores()}
+
+    def _leaderboard(
+        self, handler: DataHandler, body: dict
+    ) -> Tuple[int, Union[dict, bytes]]:
+        rows, rank = handler.get_leaderboard_data()
+        return 200, {"rows": rows, "rank": rank}
+
+    def _render_tree(
+        self, handler: DataHandler, body: dict
+    ) -> Tuple[int, Union[dict, bytes]]:
+        # Trees are drawn in memory, so many can be drawn at once
+        result = handler.generate_tree(
+            str(body.get("values", "")),
+            bool(body.get("balanced", False)),
+            str(body.get("tree_type", DataHandler.tree_types[0])),
+        )
+        if not result["result"]:
+            return 400, {"err_msg": str(result["err_msg"])}
+        return 200, handler.resize_image()
+
+    def _render_graph(
+        self, handler: DataHandler, body: dict
+    ) -> Tuple[int, Union[dict, bytes]]:
+        with self._graph_lock:
+            result = handler.generate_graph_from_matrix_string(
+                str(body.get("matrix", ""))
+            )
+            if result != True:
+                return 400, {"err_msg": result}
+            return 200, handler.resize_image()
+
+    def _status(
+        self, handler: DataHandler, body: dict
+    ) -> Tuple[int, Union[dict, bytes]]:
+        status = dict(self.session_memory)
+        status["render_cache"] = DataHandler.render_cache.memory_usage()
+        status["thumbnail_cache"] = DataHandler.thumbnail_cache.memory_usage()
+        return 200, status
+
+    def _run_for_session(
+        self, function: Callable, session: Session, body: dict
+    ) -> Tuple[int, Union[dict, bytes]]:
+        """Run a route function with a DataHandler acting on a session."""
+        return function(DataHandler(self._db, session), body)
+
+    # HTTP handling, run on the event loop
+    def _find_route(
+        self, method: str, path: str
+    ) -> Tuple[Optional[Callable], bool, bool]:
+        """
+        Find the route function for a request.
+
+        Returns:
+            Tuple[Optional[Callable], bool, bool]: The function (None if not found), whether it needs a session,
+                                                   and whether the path exists for another method.
+        """
+        path_found = False
+        for route_method, pattern, function, needs_session in self._routes:
+            if pattern.match(path):
+                path_found = True
+                if route_method == method:
+                    return function, needs_session, True
+        return None, False, path_found
+
+    async def _dispatch(
+        self, method: str, target: str, headers: Dict[str, str], raw_body: bytes
+    ) -> Tuple[int, Union[dict, bytes]]:
+        """Run the route function for a request, returning its status and body."""
+        path = urlsplit(target).path
+        function, needs_session, path_found = self._find_route(method, path)
+        if function is None:
+            if path_found:
+                return 405, {"err_msg": "Method not allowed."}
+            return 404, {"err_msg": "Not found."}
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+            if not isinstance(body, dict):
+                raise ValueError
+        except ValueError:
+            return 400, {"err_msg": "Request body must be a JSON object."}
+        loop = asyncio.get_running_loop()
+        if not needs_session:
+            return await loop.run_in_executor(
+                self._executor, function, self._anonymous_handler, body
+            )
+        token = headers.get("authorization", "").removeprefix("Bearer ").strip()
+        # The session is held until the request finishes, so it isn't evicted or cleared while in use
+        session = self._sessions.acquire(token)
+        if session is None:
+            self._session_locks.pop(token, None)
+            return 401, {"err_msg": "Please sign in."}
+        try:
+            # A session's requests are handled one at a time, as they change its state
+            async with self._session_locks.setdefault(token, asyncio.Lock()):
+                status, response = await loop.run_in_executor(
+                    self._executor, self._run_for_session, function, session, body
+                )
+        finally:
+            self._sessions.release(session)
+        if function == self._sign_out:
+            self._session_locks.pop(token, None)
+        return status, response
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Read HTTP/1.1 requests from a connection and write their responses, keeping the connection alive."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > self.max_body_size:
+                    await self._write_response(
+                        writer, 413, {"err_msg": "Request too large."}, False
+                    )
+                    break
+                raw_body = await reader.readexactly(length) if length else b""
+                try:
+                    status, response = await self._dispatch(
+                        method, target, headers, raw_body
+                    )
+                except Exception as error:
+                    status, response = 500, {"err_msg": f"An error occurred: {error}"}
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                await self._write_response(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _write_response(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        response: Union[dict, bytes],
+        keep_alive: bool,
+    ) -> None:
+        """Write an HTTP response, encoding dictionaries as JSON."""
+        if isinstance(response, bytes):
+            content_type, payload = "image/png", response
+        else:
+            content_type = "application/json"
+            payload = json.dumps(response, default=str).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {self.status_reasons.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+    async def _evict_sessions(self, interval: float, function: Callable) -> None:
+        """Run a SessionStore eviction function every interval seconds, forgetting the locks of removed sessions."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            # A failed run is logged and retried next interval, so sessions keep being evicted
+            try:
+                await loop.run_in_executor(self._executor, function)
+            except Exception:
+                logger.exception("Session eviction failed")
+            for token in list(self._session_locks):
+                if token not in self._sessions:
+                    del self._session_locks[token]
+
+    async def serve(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        eviction_interval: float = 60,
+        sample_interval: float = 5,
+    ) -> None:
+        """
+        Accept connections until cancelled.
+
+        Arguments:
+            host (str): Address to listen on. Defaults to 127.0.0.1.
+            port (int): Port to listen on. Defaults to 8080.
+            eviction_interval (float): Seconds between evicting idle sessions. Defaults to 60.
+            sample_interval (float): Seconds between re-estimating the memory of changed sessions,
+                                     evicting the least recently used if over the limit. Defaults to 5.
+        """
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        eviction_tasks = [
+            asyncio.create_task(
+                self._evict_sessions(eviction_interval, self._sessions.evict_idle)
+            ),
+            asyncio.create_task(
+                self._evict_sessions(sample_interval, self._sessions.sample_sizes)
+            ),
+        ]
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in eviction_tasks:
+                task.cancel()
+
+
+# Command line interface, for running the service
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the study tool HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on.")
+    parser.add_argument(
+        "--workers", type=int, default=16, help="Threads running blocking work."
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=30,
+        help="Minutes a session can go unused before it is signed out.",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=256,
+        help="MiB all sessions may hold before the least recently used are signed out.",
+    )
+    args = parser.parse_args()
+    db = Database(Path.cwd() / "database" / "study_tool_db.db", pool_size=args.workers)
+    db.check_database()
+    service = StudyService(
+        db, args.workers, args.idle_timeout * 60, args.memory_limit * 1024 * 1024
+    )
+    print(f"Serving on http://{args.host}:{args.port}")
+    asyncio.run(service.serve(args.host, args.port))
@@ -0,0 +1,105 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import json
+import threading
+import time
+
+"""
+Local stand-in for the HERE Geocoding API, for testing and benchmarking address lookups
+"""
+
+
+class GeocodingStubHandler(BaseHTTPRequestHandler):
+    """
+    Answers geocoding requests according to the path:
+        /geocode  an address for the requested house number and postcode.
+        /empty    no addresses.
+        /error    HTTP 500.
+        /invalid  a body which isn't JSON.
+        /slow     an address, after the server's delay.
+        /flaky    HTTP 503 for the server's first failures requests, then an address.
+    """
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        query = parse_qs(url.query).get("qq", [""])[0]
+        fields = dict(field.split("=", 1) for field in query.split(";") if "=" in field)
+        with self.server.lock:
+            self.server.request_times.append(time.monotonic())
+            request_count = len(self.server.request_times)
+        if url.path == "/slow":
+            time.sleep(self.server.delay)
+        if url.path == "/error" or (
+            url.path == "/flaky" and request_count <= self.server.failures
+        ):
+            self._reply(500 if url.path == "/error" else 503, b"{}")
+            return
+        if url.path == "/invalid":
+            self._reply(200, b"Not JSON")
+            return
+        items = []
+        if url.path != "/empty":
+            house_number = fields.get("houseNumber", "")
+            items.append(
+                {
+                    "address": {
+                        "label": f"{house_number} Test Street, Testville",
+                        "city": "Testville",
+                        "countryName": "United Kingdom",
+                    }
+                }
+            )
+        self._reply(200, json.dumps({"items": items}).encode())
+
+    def _reply(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        # Requests are counted instead of logged
+        pass
+
+
+class GeocodingStub:
+    """
+    Runs a GeocodingStubHandler server on a free local port, in a background thread.
+    Use as a context manager, which starts and stops the server.
+    """
+
+    def __init__(self, delay: float = 0, failures: int = 0) -> None:
+        """
+        Initialise a GeocodingStub object.
+
+        Arguments:
+            delay (float): Seconds /slow waits before answering. Defaults to 0.
+            failures (int): Number of requests /flaky fails before answering. Defaults to 0.
+        """
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), GeocodingStubHandler)
+        self._server.daemon_threads = True
+        self._server.lock = threading.Lock()
+        self._server.request_times = []
+        self._server.delay = delay
+        self._server.failures = failures
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def url(self, path: str = "/geocode") -> str:
+        """Return the URL of one of the stub's paths."""
+        host, port = self._server.server_address
+        return f"http://{host}:{port}{path}"
+
+    @property
+    def request_times(self) -> list:
+        """Return the time.monotonic() time each request arrived at."""
+        with self._server.lock:
+            return list(self._server.request_times)
+
+    def __enter__(self) -> "GeocodingStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
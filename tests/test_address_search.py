@@ -0,0 +1,87 @@
+from address_fetcher import AddressCache, AddressSearch
+from pathlib import Path
+from tests.geocoding_stub import GeocodingStub
+import tempfile
+import time
+import unittest
+
+"""
+Checks address lookups against a local stub of the geocoding API, and the address cache's keys
+"""
+
+
+class AddressSearchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stub = GeocodingStub(delay=2)
+        self.stub.__enter__()
+        self.addCleanup(self.stub.__exit__)
+        original_settings = AddressSearch.api_url, AddressSearch.timeout
+        self.addCleanup(setattr, AddressSearch, "api_url", original_settings[0])
+        self.addCleanup(setattr, AddressSearch, "timeout", original_settings[1])
+        AddressSearch.timeout = (1, 0.3)
+
+    def _search(self, path: str) -> dict:
+        AddressSearch.api_url = self.stub.url(path)
+        return AddressSearch.get_address_details(12, "ab1 2cd")
+
+    def test_address_found(self) -> None:
+        result = self._search("/geocode")
+        self.assertTrue(result["result"])
+        self.assertEqual(result["address"]["postcode"], "AB12CD")
+        self.assertEqual(result["address"]["house_number"], 12)
+        self.assertEqual(result["address"]["label"], "12 Test Street, Testville")
+
+    def test_no_address(self) -> None:
+        result = self._search("/empty")
+        self.assertFalse(result["result"])
+        self.assertEqual(result["err_msg"], "No address found.")
+
+    def test_server_error(self) -> None:
+        result = self._search("/error")
+        self.assertFalse(result["result"])
+        self.assertIn("500", result["err_msg"])
+        self.assertEqual(result["address"], {})
+
+    def test_invalid_response(self) -> None:
+        result = self._search("/invalid")
+        self.assertFalse(result["result"])
+        self.assertTrue(result["err_msg"].startswith("An error occurred"))
+
+    def test_read_timeout(self) -> None:
+        start_time = time.monotonic()
+        result = self._search("/slow")
+        # The read timeout, not the stub's delay, decides how long the lookup takes
+        self.assertLess(time.monotonic() - start_time, 1.5)
+        self.assertFalse(result["result"])
+        self.assertIn("timed out", result["err_msg"])
+
+    def test_connection_refused(self) -> None:
+        AddressSearch.api_url = self.stub.url("/geocode")
+        self.stub.__exit__()
+        result = AddressSearch.get_address_details(12, "AB1 2CD")
+        self.assertFalse(result["result"])
+        self.assertTrue(result["err_msg"].startswith("An error occurred"))
+
+
+class AddressCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache = AddressCache(Path(temp_dir.name) / "address_cache.db")
+        self.address = {"postcode": "AB12CD", "house_number": 12, "label": "12 Road"}
+
+    def test_exact_address_only(self) -> None:
+        self.cache.put(12, "AB1 2CD", self.address)
+        self.assertEqual(self.cache.get("12", "ab12cd"), self.address)
+        # Another house at the same postcode was never confirmed, so isn't returned
+        self.assertIsNone(self.cache.get(14, "AB1 2CD"))
+
+    def test_expired_address(self) -> None:
+        self.cache.put(12, "AB1 2CD", self.address)
+        self.cache._ttl = -1
+        self.assertIsNone(self.cache.get(12, "AB1 2CD"))
+        self.assertEqual(self.cache.evict_expired(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
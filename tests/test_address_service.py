@@ -0,0 +1,69 @@
+from address_fetcher import AddressCache, AddressService
+from pathlib import Path
+from tests.geocoding_stub import GeocodingStub
+import tempfile
+import unittest
+
+"""
+Checks AddressService retries, rate limiting and batching against a local stub of the geocoding API
+"""
+
+
+class AddressServiceTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache = AddressCache(Path(temp_dir.name) / "address_cache.db")
+
+    def _service(self, stub: GeocodingStub, path: str, **kwargs) -> AddressService:
+        service = AddressService(
+            self.cache, api_url=stub.url(path), timeout=(1, 1), backoff=0, **kwargs
+        )
+        self.addCleanup(service.close)
+        return service
+
+    def test_retries_take_tokens(self) -> None:
+        rate = 20
+        with GeocodingStub(failures=3) as stub:
+            service = self._service(stub, "/flaky", retries=3, rate=rate, burst=1)
+            result = service.lookup(12, "AB1 2CD")
+            request_times = stub.request_times
+        self.assertTrue(result["result"])
+        self.assertEqual(len(request_times), 4)
+        # Without backoff, only the rate limit spaces out the retries
+        gaps = [
+            later - earlier for earlier, later in zip(request_times, request_times[1:])
+        ]
+        self.assertGreaterEqual(min(gaps), 0.8 / rate)
+
+    def test_gives_up_after_retries(self) -> None:
+        with GeocodingStub() as stub:
+            service = self._service(stub, "/error", retries=2, rate=100)
+            result = service.lookup(12, "AB1 2CD")
+            self.assertEqual(len(stub.request_times), 3)
+        self.assertFalse(result["result"])
+        self.assertIn("500", result["err_msg"])
+
+    def test_not_found_is_not_retried(self) -> None:
+        with GeocodingStub() as stub:
+            service = self._service(stub, "/empty", retries=2, rate=100)
+            result = service.lookup(12, "AB1 2CD")
+            self.assertEqual(len(stub.request_times), 1)
+        self.assertFalse(result["result"])
+
+    def test_batch_looks_up_each_address_once(self) -> None:
+        addresses = [(12, "AB1 2CD"), ("12", "ab12cd"), (14, "AB1 2CD")]
+        with GeocodingStub() as stub:
+            service = self._service(stub, "/geocode", rate=100)
+            results = service.lookup_batch(addresses)
+            self.assertEqual(len(stub.request_times), 2)
+            # The second batch is answered by the cache
+            self.assertEqual(service.lookup_batch(addresses), results)
+            self.assertEqual(len(stub.request_times), 2)
+        self.assertEqual(
+            [result["address"]["house_number"] for result in results], [12, 12, 14]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
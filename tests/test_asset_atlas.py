@@ -0,0 +1,77 @@
+from asset_atlas import AssetAtlas
+from pathlib import Path
+from PIL import Image
+from unittest import mock
+import tempfile
+import unittest
+
+"""
+Checks the asset atlas decodes each image once per size, without needing a display
+"""
+
+
+class PhotoImageStub:
+    """Stands in for tk.PhotoImage, counting the files decoded."""
+
+    decoded = []
+
+    def __init__(self, master=None, file: str = None) -> None:
+        self.decoded.append(file)
+        with Image.open(file) as image:
+            self._size = image.size
+
+    def width(self) -> int:
+        return self._size[0]
+
+    def height(self) -> int:
+        return self._size[1]
+
+
+class AssetAtlasTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name) / "icon.png"
+        Image.new("RGB", (40, 20), "red").save(self.path)
+        PhotoImageStub.decoded = []
+        self.resized = []
+        for target, replacement in (
+            ("asset_atlas.tk.PhotoImage", PhotoImageStub),
+            ("PIL.ImageTk.PhotoImage", self._resized_stub),
+        ):
+            patcher = mock.patch(target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.atlas = AssetAtlas(master=None)
+
+    def _resized_stub(self, image: Image.Image, master=None) -> tuple:
+        self.resized.append(image.size)
+        return ("resized", image.size)
+
+    def test_decoded_once(self) -> None:
+        image = self.atlas.get(self.path)
+        # The same file is only decoded once, however its path is given
+        self.assertIs(self.atlas.get(str(self.path)), image)
+        self.assertIs(self.atlas.get(self.path, (40, 20)), self.atlas.get(self.path))
+        self.assertEqual(PhotoImageStub.decoded, [str(self.path)])
+        self.assertEqual(self.resized, [])
+
+    def test_resized_once_per_size(self) -> None:
+        small = self.atlas.get(self.path, (20, 10))
+        self.assertEqual(small, ("resized", (20, 10)))
+        self.assertIs(self.atlas.get(self.path, [20, 10]), small)
+        self.atlas.get(self.path, (80, 40))
+        self.assertEqual(self.resized, [(20, 10), (80, 40)])
+        # The file is decoded at its own size once, to find its size, and kept
+        self.assertEqual(len(PhotoImageStub.decoded), 1)
+        self.assertEqual(len(self.atlas), 3)
+
+    def test_preloaded_images_not_decoded_again(self) -> None:
+        self.atlas.preload([self.path, self.path])
+        self.assertEqual(len(PhotoImageStub.decoded), 1)
+        self.atlas.get(self.path)
+        self.assertEqual(len(PhotoImageStub.decoded), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+from balanced_trees import AVLTree, AVLTreeNode, RedBlackTree, RedBlackTreeNode
+from typing import Optional
+import random
+import unittest
+
+"""
+Checks AVL and red-black trees keep their balancing invariants through inserts and deletes
+"""
+
+
+def check_avl(node: Optional[AVLTreeNode], low=None, high=None) -> int:
+    """Check a subtree is ordered, its heights are correct and balanced, returning its height."""
+    if node is None:
+        return 0
+    assert low is None or node.value > low, "values out of order"
+    assert high is None or node.value < high, "values out of order"
+    left_height = check_avl(node.left, low, node.value)
+    right_height = check_avl(node.right, node.value, high)
+    assert abs(left_height - right_height) <= 1, f"{node.value} is unbalanced"
+    height = 1 + max(left_height, right_height)
+    assert node.subtree_height == height, f"{node.value} has the wrong height"
+    return height
+
+
+def check_red_black(node: Optional[RedBlackTreeNode], low=None, high=None) -> int:
+    """Check a subtree is ordered and follows the left-leaning red-black rules, returning its black height."""
+    if node is None:
+        return 1
+    assert low is None or node.value > low, "values out of order"
+    assert high is None or node.value < high, "values out of order"
+    assert not (node.right is not None and node.right.red), f"{node.value} leans right"
+    assert not (
+        node.red and node.left is not None and node.left.red
+    ), f"{node.value} has two reds in a row"
+    left_black_height = check_red_black(node.left, low, node.value)
+    right_black_height = check_red_black(node.right, node.value, high)
+    assert (
+        left_black_height == right_black_height
+    ), f"{node.value} has uneven black heights"
+    return left_black_height + (0 if node.red else 1)
+
+
+class BalancedTreesTest(unittest.TestCase):
+    def _check(self, tree, values: set) -> None:
+        if isinstance(tree, AVLTree):
+            check_avl(tree.root)
+        else:
+            self.assertFalse(tree.root is not None and tree.root.red)
+            check_red_black(tree.root)
+        self.assertEqual(tree.in_order_traversal(), sorted(values))
+
+    def _insert_and_delete(self, tree, values: list) -> None:
+        for value in values:
+            tree.add_node(value)
+        self._check(tree, set(values))
+        remaining = set(values)
+        for value in random.sample(values, len(values) // 2):
+            self.assertEqual(tree.delete(value), value in remaining)
+            remaining.discard(value)
+        self._check(tree, remaining)
+        self.assertFalse(tree.delete(-1))
+        for value in list(remaining):
+            tree.delete(value)
+        self.assertIsNone(tree.root)
+
+    def test_random_values(self) -> None:
+        values = [random.randint(0, 5000) for _ in range(3000)]
+        for tree_class in (AVLTree, RedBlackTree):
+            with self.subTest(tree_class.__name__):
+                self._insert_and_delete(tree_class(), values)
+
+    def test_sorted_values(self) -> None:
+        for tree_class in (AVLTree, RedBlackTree):
+            with self.subTest(tree_class.__name__):
+                self._insert_and_delete(tree_class(), list(range(2000)))
+
+    def test_checked_after_every_change(self) -> None:
+        values = random.sample(range(200), 100)
+        for tree_class in (AVLTree, RedBlackTree):
+            with self.subTest(tree_class.__name__):
+                tree, remaining = tree_class(), set()
+                for value in values:
+                    tree.add_node(value)
+                    remaining.add(value)
+                    self._check(tree, remaining)
+                for value in values:
+                    tree.delete(value)
+                    remaining.remove(value)
+                    self._check(tree, remaining)
+
+    def test_height_bounds(self) -> None:
+        # AVL trees are at most about 1.44 log2(n) deep, and red-black trees at most 2 log2(n)
+        count = 2**14
+        for tree_class, bound in ((AVLTree, 1.45 * 14), (RedBlackTree, 2 * 14)):
+            with self.subTest(tree_class.__name__):
+                tree = tree_class()
+                tree.build_tree(range(count))
+                self.assertLessEqual(tree.height, bound)
+
+
+if __name__ == "__main__":
+    unittest.main()
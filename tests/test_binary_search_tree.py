@@ -0,0 +1,62 @@
+from binary_search_tree import BinarySearchTree
+import random
+import sys
+import unittest
+
+"""
+Checks binary search trees are built and traversed correctly, however deep they are,
+and balanced builds give the same shape from any input
+"""
+
+
+class BinarySearchTreeTest(unittest.TestCase):
+    def test_traversals(self) -> None:
+        tree = BinarySearchTree()
+        tree.build_tree([50, 30, 70, 20, 40, 60, 80, 30])
+        self.assertEqual(tree.pre_order_traversal(), [50, 30, 20, 40, 70, 60, 80])
+        self.assertEqual(tree.in_order_traversal(), [20, 30, 40, 50, 60, 70, 80])
+        self.assertEqual(tree.post_order_traversal(), [20, 40, 30, 60, 80, 70, 50])
+
+    def test_random_values_in_order(self) -> None:
+        values = random.sample(range(100000), 5000)
+        tree = BinarySearchTree()
+        tree.build_tree(values)
+        self.assertEqual(tree.in_order_traversal(), sorted(values))
+
+    def test_deeper_than_recursion_limit(self) -> None:
+        count = sys.getrecursionlimit() + 500
+        tree = BinarySearchTree()
+        tree.build_tree(range(count, 0, -1))
+        self.assertEqual(tree.height, count)
+        self.assertEqual(tree.in_order_traversal(), list(range(1, count + 1)))
+        self.assertEqual(tree.pre_order_traversal(), list(range(count, 0, -1)))
+        self.assertEqual(tree.post_order_traversal(), list(range(1, count + 1)))
+
+    def test_balanced_builds_match(self) -> None:
+        values = random.sample(range(10000), 1000)
+        shapes = []
+        for build in (
+            lambda tree: tree.build_balanced_tree(values + values[:10]),
+            lambda tree: tree.build_balanced_tree(sorted(values)),
+            lambda tree: tree.build_from_sorted(sorted(values)),
+            lambda tree: tree.build_from_sorted(iter(sorted(values)), len(values)),
+        ):
+            tree = BinarySearchTree()
+            build(tree)
+            self.assertEqual(tree.height, 10)
+            shapes.append(tree.pre_order_traversal())
+        self.assertEqual(sorted(shapes[0]), sorted(values))
+        self.assertTrue(all(shape == shapes[0] for shape in shapes))
+
+    def test_build_from_sorted_rejects_bad_values(self) -> None:
+        tree = BinarySearchTree()
+        with self.assertRaises(ValueError):
+            tree.build_from_sorted([1, 3, 2])
+        with self.assertRaises(ValueError):
+            tree.build_from_sorted([1, 1, 2])
+        with self.assertRaises(ValueError):
+            tree.build_from_sorted(iter([1, 2]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+from cards import Card, CardPack
+import time
+import unittest
+
+"""
+Checks CardPack tracks edits in order, in time linear in the number of edits
+"""
+
+
+def make_card(question: str) -> Card:
+    card = Card()
+    card.write_to_card(question, "1", 1)
+    return card
+
+
+class CardPackTest(unittest.TestCase):
+    def test_pending_changes_keep_added_order(self) -> None:
+        pack = CardPack("Maths", 1)
+        cards = [make_card(f"Question {i}") for i in range(4)]
+        for card in cards:
+            pack.add_card(card)
+        edited_card = make_card("Question 1 edited")
+        pack.replace_card(1, edited_card)
+        pack.remove_card(2)
+        self.assertEqual(
+            pack.pending_changes["added"], [cards[0], edited_card, cards[3]]
+        )
+        pack.clear_changes()
+        self.assertFalse(pack.has_changes)
+
+    def test_edits_are_linear(self) -> None:
+        timings = []
+        for card_count in (5000, 20000):
+            pack = CardPack("Maths", 1)
+            cards = [make_card(f"Question {i}") for i in range(card_count)]
+            start_time = time.perf_counter()
+            for card in cards:
+                pack.add_card(card)
+            # Edit every card from the back, the worst case when added cards were searched as a list
+            for index in reversed(range(card_count)):
+                pack.replace_card(index, make_card("Replacement"))
+                pack.remove_card(index)
+            timings.append(time.perf_counter() - start_time)
+            self.assertFalse(pack.pending_changes["added"])
+        # Four times the edits should take roughly four times as long, not sixteen
+        self.assertLess(timings[1], timings[0] * 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
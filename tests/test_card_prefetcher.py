@@ -0,0 +1,147 @@
+from card_prefetcher import CardPrefetcher
+from cards import Card, CardPack
+from concurrent.futures import Executor
+import threading
+import unittest
+
+"""
+Checks the card prefetcher's hits and misses, look-ahead depth and stopping, and that prefetchers share threads
+"""
+
+
+class StepExecutor(Executor):
+    """Queues submitted functions until the test runs them, so prefetching happens in a known order."""
+
+    def __init__(self) -> None:
+        self.tasks = []
+
+    def submit(self, function, *args, **kwargs) -> None:
+        self.tasks.append((function, args, kwargs))
+
+    def run_all(self) -> None:
+        while self.tasks:
+            function, args, kwargs = self.tasks.pop(0)
+            function(*args, **kwargs)
+
+
+def make_card_pack(card_count: int) -> CardPack:
+    card_pack = CardPack("Maths", 1)
+    for number in range(card_count):
+        card = Card()
+        card.write_to_card(f"{number} + {number}", str(number * 2), 1)
+        card_pack.add_card(card)
+    return card_pack
+
+
+class CardPrefetcherTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.executor = StepExecutor()
+        # Questions of the cards prepared, in order
+        self.prepared = []
+
+    def _prepare_card(self, card: dict) -> dict:
+        self.prepared.append(card["question"])
+        return dict(card, prepared=True)
+
+    def _prefetcher(self, card_count: int = 10, depth: int = 2) -> CardPrefetcher:
+        prefetcher = CardPrefetcher(
+            make_card_pack(card_count), self._prepare_card, depth, self.executor
+        )
+        self.addCleanup(prefetcher.stop)
+        return prefetcher
+
+    def test_hits_and_misses(self) -> None:
+        prefetcher = self._prefetcher()
+        self.executor.run_all()
+        self.assertEqual(prefetcher.get_card(0)["question"], "0 + 0")
+        self.assertEqual(prefetcher.get_card(1)["question"], "1 + 1")
+        # Cards 2 and 3 are queued but not yet prepared, so card 2 is prepared on request
+        card = prefetcher.get_card(2)
+        self.assertTrue(card["prepared"])
+        self.assertEqual(prefetcher.stats, {"hits": 2, "misses": 1, "depth": 2})
+
+    def test_depth_limits_look_ahead(self) -> None:
+        prefetcher = self._prefetcher(depth=2)
+        self.executor.run_all()
+        self.assertEqual(self.prepared, ["0 + 0", "1 + 1"])
+        prefetcher.set_depth(4)
+        self.executor.run_all()
+        self.assertEqual(self.prepared, ["0 + 0", "1 + 1", "2 + 2", "3 + 3"])
+        prefetcher.set_depth(0)
+        prefetcher.get_card(0)
+        self.executor.run_all()
+        self.assertEqual(len(self.prepared), 4)
+
+    def test_window_stops_at_end_of_pack(self) -> None:
+        prefetcher = self._prefetcher(card_count=3, depth=5)
+        self.executor.run_all()
+        self.assertEqual(len(self.prepared), 3)
+        for index in range(3):
+            prefetcher.get_card(index)
+        self.assertEqual(prefetcher.stats["hits"], 3)
+        self.assertEqual(self.executor.tasks, [])
+
+    def test_cards_behind_viewer_dropped(self) -> None:
+        prefetcher = self._prefetcher(depth=3)
+        self.executor.run_all()
+        # Skipping ahead drops cards 0 to 2, so none of them are hits later
+        prefetcher.get_card(5)
+        self.assertEqual(prefetcher._prepared, {})
+        self.executor.run_all()
+        self.assertEqual(sorted(prefetcher._prepared), [6, 7, 8])
+
+    def test_stop_clears_prepared_cards(self) -> None:
+        prefetcher = self._prefetcher()
+        self.executor.run_all()
+        prefetcher.stop()
+        self.assertEqual(prefetcher._prepared, {})
+        # Queued work does nothing once stopped
+        prefetcher.set_depth(5)
+        prefetcher._prefetch_next()
+        self.assertEqual(len(self.prepared), 2)
+
+    def test_late_result_ignored_after_stop(self) -> None:
+        card_pack = make_card_pack(5)
+
+        def prepare_card(card: dict) -> dict:
+            # The viewer stops studying while this card is being prepared
+            prefetcher.stop()
+            return card
+
+        prefetcher = CardPrefetcher(card_pack, prepare_card, 2, self.executor)
+        self.executor.run_all()
+        self.assertEqual(prefetcher._prepared, {})
+        self.assertEqual(self.executor.tasks, [])
+
+
+class SharedExecutorTest(unittest.TestCase):
+    def test_prefetchers_share_threads(self) -> None:
+        thread_count = threading.active_count()
+        prefetchers = [
+            CardPrefetcher(make_card_pack(5), dict)
+            for _ in range(3 * CardPrefetcher.workers)
+        ]
+        self.assertLessEqual(
+            threading.active_count(), thread_count + CardPrefetcher.workers
+        )
+        for prefetcher in prefetchers:
+            self.assertEqual(prefetcher.get_card(0)["answer"], "0")
+            prefetcher.stop()
+
+    def test_cards_prepared_ahead(self) -> None:
+        prepared = threading.Semaphore(0)
+
+        def prepare_card(card: dict) -> dict:
+            prepared.release()
+            return card
+
+        prefetcher = CardPrefetcher(make_card_pack(10), prepare_card, depth=3)
+        self.addCleanup(prefetcher.stop)
+        for _ in range(3):
+            self.assertTrue(prepared.acquire(timeout=5))
+        self.assertEqual(prefetcher.get_card(0)["question"], "0 + 0")
+        self.assertEqual(prefetcher.stats["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
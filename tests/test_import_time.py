@@ -0,0 +1,66 @@
+from typing import Dict
+import importlib.util
+import subprocess
+import sys
+import unittest
+
+"""
+Checks slow libraries are not imported at startup, by profiling imports with python -X importtime
+"""
+
+# Libraries which must only be imported on first use of the feature needing them
+HEAVY_MODULES = ("networkx", "matplotlib", "PIL", "requests", "urllib3", "numpy")
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """
+    Import a module in a new interpreter, returning the top-level packages it imported.
+
+    Arguments:
+        module (str): Name of the module to import.
+
+    Returns:
+        Dict[str, int]: Cumulative import time of each top-level package, in microseconds.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    # Lines are formatted as "import time: self [us] | cumulative | imported package"
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        package = name.strip().split(".")[0]
+        times[package] = max(times.get(package, 0), int(cumulative))
+    return times
+
+
+class ImportTimeTest(unittest.TestCase):
+    def _check_module(self, module: str) -> None:
+        times = import_times(module)
+        eager_modules = sorted(set(HEAVY_MODULES) & set(times))
+        self.assertEqual(
+            eager_modules,
+            [],
+            f"import {module} imports {', '.join(eager_modules)} at startup",
+        )
+
+    def test_data_handler(self) -> None:
+        self._check_module("data_handler")
+
+    def test_study_service(self) -> None:
+        self._check_module("study_service")
+
+    @unittest.skipIf(
+        importlib.util.find_spec("PySimpleGUI") is None, "PySimpleGUI not installed"
+    )
+    def test_gui(self) -> None:
+        self._check_module("gui")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+from database_access import Database
+from pathlib import Path
+import tempfile
+import unittest
+
+"""
+Checks cached libraries are copied to callers, never replaced by rows read before an invalidation, and follow deleted packs
+"""
+
+
+class LibraryCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.db = Database(Path(temp_dir.name) / "study_tool_db.db")
+        self.db.check_database()
+        card = {
+            "question": "2 + 2",
+            "answer": "4",
+            "points": 1,
+            "question_type": "Integer",
+        }
+        self.pack_id = self.db.create_flashcard_pack("Maths", [card], 1)
+
+    def test_returns_copy(self) -> None:
+        library = self.db.get_user_library(1)
+        library[0]["pack_name"] = "Changed"
+        library.clear()
+        library = self.db.get_user_library(1)
+        self.assertEqual([pack["pack_name"] for pack in library], ["Maths"])
+        # The second call is answered by the cache, which the caller's changes didn't reach
+        library[0]["pack_name"] = "Changed"
+        self.assertEqual(self.db.get_user_library(1)[0]["pack_name"], "Maths")
+
+    def test_read_overlapping_invalidation_is_not_cached(self) -> None:
+        connect = self.db._connect
+
+        def connect_then_invalidate():
+            # The library changes after this read has started
+            conn = connect()
+            self.db._invalidate_library(1)
+            return conn
+
+        self.db._connect = connect_then_invalidate
+        self.db.get_user_library(1)
+        self.db._connect = connect
+        self.assertNotIn(1, self.db._library_cache)
+        self.db.get_user_library(1)
+        self.assertIn(1, self.db._library_cache)
+
+    def test_deleted_pack_leaves_library(self) -> None:
+        self.assertEqual(len(self.db.get_user_library(1)), 1)
+        invalidate = self.db._invalidate_library
+        libraries = []
+
+        def invalidate_then_read(UID=None):
+            # Another reader fetches the library straight after the cache is invalidated
+            invalidate(UID)
+            libraries.append(self.db.get_user_library(1))
+
+        self.db._invalidate_library = invalidate_then_read
+        self.assertEqual(
+            self.db.delete_card_pack(self.pack_id, 1), "Successfully deleted card pack."
+        )
+        self.db._invalidate_library = invalidate
+        self.assertEqual(libraries, [[]])
+        self.assertEqual(self.db.get_user_library(1), [])
+        self.assertEqual(self.db.get_pack_data(self.pack_id)[1], [])
+
+    def test_other_users_pack_not_deleted(self) -> None:
+        self.db.get_user_library(1)
+        self.assertEqual(
+            self.db.delete_card_pack(self.pack_id, 2),
+            "Failed to delete, you are not the owner of this pack.",
+        )
+        # Nothing changed, so the cached library is kept
+        self.assertIn(1, self.db._library_cache)
+        self.assertEqual(len(self.db.get_user_library(1)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
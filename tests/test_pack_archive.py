@@ -0,0 +1,116 @@
+from database_access import Database
+from pack_archive import PackArchive
+from pathlib import Path
+import gzip
+import json
+import tempfile
+import unittest
+
+"""
+Round trips card packs through archives, and checks bad archives import nothing
+"""
+
+
+class PackArchiveTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        self.temp_path = Path(self._temp_dir.name)
+        self.db = Database(self.temp_path / "study_tool_db.db")
+        self.db.check_database()
+        self.archive = PackArchive(self.db)
+        self.shared_card = {
+            "question": "2 + 2",
+            "answer": "4",
+            "points": 1,
+            "question_type": "Integer",
+        }
+        self.pack_ids = [
+            self.db.create_flashcard_pack(
+                "Maths",
+                [
+                    self.shared_card,
+                    {
+                        "question": "Capital of France",
+                        "answer": "Paris",
+                        "points": 2,
+                        "question_type": "Reveal",
+                    },
+                ],
+                1,
+            ),
+            self.db.create_flashcard_pack("More maths", [self.shared_card], 1),
+        ]
+
+    def _write_archive(self, records: list) -> Path:
+        """Write records to an archive, after a valid header."""
+        file_path = self.temp_path / "packs.jsonl.gz"
+        with gzip.open(file_path, "wt", encoding="utf-8") as file:
+            header = {"archive": PackArchive.archive_name, "version": 2}
+            for record in [header] + records:
+                file.write(json.dumps(record) + "\n")
+        return file_path
+
+    def _pack_count(self) -> int:
+        with self.db.transaction() as cur:
+            cur.execute("SELECT COUNT(*) FROM CardPacks;")
+            return cur.fetchone()[0]
+
+    def test_round_trip_writes_each_card_once(self) -> None:
+        file_path = self.temp_path / "export.jsonl.gz"
+        self.assertEqual(self.archive.export_packs(self.pack_ids, file_path), 3)
+        with gzip.open(file_path, "rt", encoding="utf-8") as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual(sum("card" in record for record in records), 2)
+        self.assertEqual(sum("ref" in record for record in records), 3)
+        new_pack_ids = self.archive.import_packs(file_path, 2)
+        self.assertEqual(len(new_pack_ids), 2)
+        for pack_id, new_pack_id in zip(self.pack_ids, new_pack_ids):
+            name, cards = self.db.get_pack_data(pack_id)
+            new_name, new_cards = self.db.get_pack_data(new_pack_id)
+            self.assertEqual(name, new_name)
+            # Identical cards are reused, rather than inserted again
+            self.assertEqual(cards, new_cards)
+        self.assertEqual(len(self.db.get_user_library(2)), 2)
+
+    def test_export_unknown_pack(self) -> None:
+        file_path = self.temp_path / "export.jsonl.gz"
+        with self.assertRaises(ValueError):
+            self.archive.export_packs([self.pack_ids[0], 999], file_path)
+        self.assertFalse(file_path.exists())
+
+    def test_invalid_pack_name_imports_nothing(self) -> None:
+        card = dict(self.shared_card, card=1)
+        for pack_name in ("ab", "x" * 31, "Drop; --", 5):
+            file_path = self._write_archive(
+                [card, {"pack": "Valid name"}, {"ref": 1}, {"pack": pack_name}]
+            )
+            with self.assertRaises(ValueError):
+                self.archive.import_packs(file_path, 2)
+        self.assertEqual(self._pack_count(), 2)
+
+    def test_error_partway_imports_nothing(self) -> None:
+        card = dict(self.shared_card, card=1)
+        bad_archives = [
+            # Reference to a card the archive doesn't contain
+            [card, {"pack": "First pack"}, {"ref": 1}, {"pack": "Second"}, {"ref": 2}],
+            # Card body after the first pack
+            [card, {"pack": "First pack"}, {"ref": 1}, dict(card, card=2)],
+            # Invalid card body
+            [card, dict(card, card=2, points="many"), {"pack": "First pack"}],
+            # Card body given twice
+            [card, card, {"pack": "First pack"}],
+        ]
+        for records in bad_archives:
+            file_path = self._write_archive(records)
+            with self.assertRaises(ValueError):
+                self.archive.import_packs(file_path, 2)
+        self.assertEqual(self._pack_count(), 2)
+        self.assertEqual(self.db.get_user_library(2), [])
+        # A valid archive still imports afterwards, on the same pooled connections
+        file_path = self._write_archive([card, {"pack": "First pack"}, {"ref": 1}])
+        self.assertEqual(len(self.archive.import_packs(file_path, 2)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+from database_access import Database
+from pathlib import Path
+import tempfile
+import unittest
+
+"""
+Checks edited cards keep scores only while their contents are unchanged
+"""
+
+
+class PackChangesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.db = Database(Path(temp_dir.name) / "study_tool_db.db")
+        self.db.check_database()
+        self.card = {
+            "question": "2 + 2",
+            "answer": "4",
+            "points": 1,
+            "question_type": "Integer",
+        }
+        self.pack_id = self.db.create_flashcard_pack("Maths", [self.card], 1)
+        self.card_id = next(self.db.iter_pack_cards(self.pack_id))["card_id"]
+        self.db.update_leaderboard(1, [self.card_id])
+
+    def _score_count(self, card_id: int) -> int:
+        with self.db.transaction() as cur:
+            cur.execute(
+                "SELECT COUNT(*) FROM Leaderboard WHERE CardID = ?;", (card_id,)
+            )
+            return cur.fetchone()[0]
+
+    def test_edit_in_place_discards_scores(self) -> None:
+        edited_card = dict(self.card, answer="5")
+        result = self.db.apply_pack_changes(
+            self.pack_id, 1, [], [], {self.card_id: edited_card}
+        )
+        self.assertTrue(result["result"])
+        self.assertEqual(result["changed_ids"][self.card_id], self.card_id)
+        self.assertEqual(self._score_count(self.card_id), 0)
+
+    def test_edit_shared_card_keeps_original_scores(self) -> None:
+        fork_id = self.db.fork_card_pack(self.pack_id, 1, "Maths copy")["pack_id"]
+        edited_card = dict(self.card, answer="5")
+        result = self.db.apply_pack_changes(
+            fork_id, 1, [], [], {self.card_id: edited_card}
+        )
+        # The fork gets a new card, and the original pack's card keeps its score
+        self.assertNotEqual(result["changed_ids"][self.card_id], self.card_id)
+        self.assertEqual(self._score_count(self.card_id), 1)
+
+    def test_unchanged_card_keeps_scores(self) -> None:
+        self.db.apply_pack_changes(self.pack_id, 1, [], [], {self.card_id: self.card})
+        self.assertEqual(self._score_count(self.card_id), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
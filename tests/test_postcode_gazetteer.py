@@ -0,0 +1,127 @@
+from data_handler import DataHandler
+from database_access import Database
+from pathlib import Path
+from postcode_gazetteer import PostcodeGazetteer
+from unittest import mock
+import tempfile
+import unittest
+
+"""
+Checks gazetteer lookups fall back to shorter prefixes, find every line of the file, and are tried before the address service
+"""
+
+GAZETTEER_PATH = Path(__file__).parent.parent / "assets" / "postcode_gazetteer.txt"
+
+
+class PostcodeGazetteerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.gazetteer = PostcodeGazetteer(GAZETTEER_PATH)
+        self.addCleanup(self.gazetteer.close)
+
+    def test_exact_area(self) -> None:
+        entry = self.gazetteer.lookup("B1 1AA")
+        self.assertEqual(entry["prefix"], "B")
+        self.assertEqual(entry["city"], "Birmingham")
+        self.assertEqual(entry["country"], "United Kingdom")
+
+    def test_falls_back_to_area(self) -> None:
+        # Neither SW1A nor SW1 are in the file, so the SW area is used
+        entry = self.gazetteer.lookup("sw1a2aa")
+        self.assertEqual((entry["prefix"], entry["city"]), ("SW", "London"))
+        # A one letter area isn't used for a two letter one
+        self.assertEqual(self.gazetteer.lookup("S1 1AA")["city"], "Sheffield")
+
+    def test_misses(self) -> None:
+        self.assertIsNone(self.gazetteer.lookup("ZZ"))
+        self.assertIsNone(self.gazetteer.lookup("ZZ1 1AA"))
+        self.assertIsNone(self.gazetteer.lookup("AA1 1AA"))
+
+    def test_first_and_last_lines(self) -> None:
+        lines = GAZETTEER_PATH.read_text(encoding="utf-8").splitlines()
+        for line in (lines[0], lines[-1]):
+            prefix, city, _ = line.split("\t")
+            with self.subTest(prefix):
+                self.assertEqual(self.gazetteer.lookup(f"{prefix}1 1AA")["city"], city)
+
+    def test_every_line_found(self) -> None:
+        for line in GAZETTEER_PATH.read_text(encoding="utf-8").splitlines():
+            prefix, city, country = line.split("\t")
+            self.assertEqual(
+                self.gazetteer._get(prefix),
+                {"prefix": prefix, "city": city, "country": country},
+            )
+
+    def test_search(self) -> None:
+        entries = self.gazetteer.search("s")
+        self.assertEqual(entries[0]["prefix"], "S")
+        self.assertTrue(all(entry["prefix"].startswith("S") for entry in entries))
+        self.assertEqual(len(entries), 10)
+        self.assertEqual(
+            [entry["prefix"] for entry in self.gazetteer.search("S", limit=3)],
+            ["S", "SA", "SE"],
+        )
+        self.assertEqual(
+            [entry["prefix"] for entry in self.gazetteer.search("Z")], ["ZE"]
+        )
+        self.assertEqual(self.gazetteer.search("ZZ"), [])
+
+
+class OutwardCodeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = Path(temp_dir.name) / "postcode_gazetteer.txt"
+        # No newline after the last line
+        path.write_bytes(
+            b"SW\tLondon\tUnited Kingdom\n"
+            b"SW1\tWestminster\tUnited Kingdom\n"
+            b"SW1A\tWhitehall\tUnited Kingdom\n"
+            b"SW2\tBrixton\tUnited Kingdom"
+        )
+        self.gazetteer = PostcodeGazetteer(path)
+        self.addCleanup(self.gazetteer.close)
+
+    def test_longest_prefix_used(self) -> None:
+        self.assertEqual(self.gazetteer.lookup("SW1A 2AA")["city"], "Whitehall")
+        self.assertEqual(self.gazetteer.lookup("SW1P 3BT")["city"], "Westminster")
+        self.assertEqual(self.gazetteer.lookup("SW2 1AA")["city"], "Brixton")
+        self.assertEqual(self.gazetteer.lookup("SW9 9AA")["city"], "London")
+
+    def test_search_outward_codes(self) -> None:
+        self.assertEqual(
+            [entry["prefix"] for entry in self.gazetteer.search("SW1")],
+            ["SW1", "SW1A"],
+        )
+
+
+class CreateAddressTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        db = Database(Path(temp_dir.name) / "study_tool_db.db")
+        db.check_database()
+        self.address_service = mock.Mock()
+        patcher = mock.patch.object(
+            DataHandler, "_shared_address_service", self.address_service
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.handler = DataHandler(db=db)
+
+    def test_gazetteer_used_first(self) -> None:
+        result = self.handler.val_create_address("10", "b1 1aa")
+        self.assertTrue(result["result"])
+        self.assertEqual(result["address"]["postcode"], "B11AA")
+        self.assertEqual(result["address"]["city"], "Birmingham")
+        self.address_service.lookup.assert_not_called()
+
+    def test_unknown_postcode_uses_address_service(self) -> None:
+        self.address_service.lookup.return_value = {"result": False}
+        self.assertEqual(
+            self.handler.val_create_address("10", "ZZ1 1AA"), {"result": False}
+        )
+        self.address_service.lookup.assert_called_once_with("10", "ZZ1 1AA")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+from data_handler import DataHandler
+from database_access import Database
+from pathlib import Path
+from render_cache import RenderCache
+from unittest import mock
+import tempfile
+import threading
+import time
+import unittest
+
+"""
+Checks the render cache's hits, least recently used eviction and sharing of images between sessions
+"""
+
+
+class RenderCacheTest(unittest.TestCase):
+    def test_keys(self) -> None:
+        key = RenderCache.make_key("graph", {"A": ["B"], "B": ["A"]}, 500)
+        self.assertEqual(
+            key, RenderCache.make_key("graph", {"B": ["A"], "A": ["B"]}, 500)
+        )
+        self.assertNotEqual(
+            key, RenderCache.make_key("graph", {"A": ["B"], "B": ["A"]}, 400)
+        )
+        self.assertNotEqual(
+            key, RenderCache.make_key("tree", {"A": ["B"], "B": ["A"]}, 500)
+        )
+
+    def test_hits_and_misses(self) -> None:
+        cache = RenderCache()
+        renders = []
+
+        def render() -> bytes:
+            renders.append(1)
+            return b"image"
+
+        self.assertEqual(cache.get_or_render("a", render), b"image")
+        self.assertEqual(cache.get_or_render("a", render), b"image")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(renders), 1)
+        usage = cache.memory_usage()
+        self.assertEqual((usage["hits"], usage["misses"]), (1, 1))
+        self.assertEqual((usage["images"], usage["total_bytes"]), (1, 5))
+
+    def test_least_recently_used_evicted(self) -> None:
+        cache = RenderCache(memory_limit=10)
+        cache.get_or_render("a", lambda: b"aaaa")
+        cache.get_or_render("b", lambda: b"bbbb")
+        # Using a makes b the least recently used
+        cache.get("a")
+        cache.get_or_render("c", lambda: b"cccc")
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(cache.memory_usage()["total_bytes"], 8)
+        # An image over the limit by itself is still kept, as the only image
+        cache.get_or_render("d", lambda: b"d" * 20)
+        self.assertEqual(len(cache), 1)
+        self.assertIn("d", cache)
+
+    def test_concurrent_renders_share_one(self) -> None:
+        cache = RenderCache()
+        renders = []
+
+        def render() -> bytes:
+            renders.append(1)
+            time.sleep(0.1)
+            return b"image"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_or_render("a", render))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [b"image"] * 8)
+        self.assertEqual(len(renders), 1)
+
+    def test_failed_render_not_cached(self) -> None:
+        cache = RenderCache()
+
+        def render() -> bytes:
+            raise ValueError("cannot draw")
+
+        with self.assertRaises(ValueError):
+            cache.get_or_render("a", render)
+        self.assertNotIn("a", cache)
+        # The next request renders again rather than waiting for the failed render
+        self.assertEqual(cache.get_or_render("a", lambda: b"image"), b"image")
+
+
+class SharedRenderTest(unittest.TestCase):
+    def test_sessions_share_tree_images(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        db = Database(Path(temp_dir.name) / "study_tool_db.db")
+        db.check_database()
+        cache = RenderCache()
+        with mock.patch.object(DataHandler, "render_cache", cache):
+            handlers = [DataHandler(db=db) for _ in range(2)]
+            for handler in handlers:
+                self.assertTrue(handler.generate_tree("5,3,8", False)["result"])
+            self.assertEqual(
+                handlers[0].session.image_key, handlers[1].session.image_key
+            )
+            self.assertEqual(cache.memory_usage()["misses"], 1)
+            # An evicted image is drawn again when next shown
+            cache.clear()
+            self.assertEqual(handlers[0].image[:8], b"\x89PNG\r\n\x1a\n")
+            self.assertEqual(cache.memory_usage()["misses"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
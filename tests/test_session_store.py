@@ -0,0 +1,123 @@
+from database_access import Database
+from pathlib import Path
+from sessions import Session, SessionStore
+from study_service import StudyService
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+
+"""
+Checks sessions in use are never evicted or cleared, sizes are sampled off the request path, and eviction survives errors
+"""
+
+
+class SessionStoreTest(unittest.TestCase):
+    def _signed_in(self, store: SessionStore) -> Session:
+        session = store.add()
+        session.cur_UID = 1
+        return session
+
+    def test_idle_session_in_use_is_kept(self) -> None:
+        store = SessionStore(idle_timeout=0.01)
+        session = self._signed_in(store)
+        store.acquire(session.session_id)
+        time.sleep(0.02)
+        self.assertEqual(store.evict_idle(), 0)
+        self.assertEqual(session.cur_UID, 1)
+        store.release(session)
+        time.sleep(0.02)
+        self.assertEqual(store.evict_idle(), 1)
+        self.assertIsNone(session.cur_UID)
+
+    def test_removed_session_cleared_on_release(self) -> None:
+        store = SessionStore()
+        session = self._signed_in(store)
+        store.acquire(session.session_id)
+        store.acquire(session.session_id)
+        store.remove(session.session_id)
+        self.assertNotIn(session.session_id, store)
+        store.release(session)
+        self.assertEqual(session.cur_UID, 1)
+        store.release(session)
+        self.assertIsNone(session.cur_UID)
+
+    def test_sizes_sampled_after_release(self) -> None:
+        store = SessionStore()
+        session = self._signed_in(store)
+        store.acquire(session.session_id)
+        session.leaderboard_data = ["row"] * 1000
+        # The session is in use, so isn't measured until released
+        store.sample_sizes()
+        self.assertEqual(store.memory_usage()["total_bytes"], 0)
+        store.release(session)
+        store.sample_sizes()
+        self.assertGreater(store.memory_usage()["total_bytes"], 8000)
+
+    def test_memory_limit_skips_sessions_in_use(self) -> None:
+        store = SessionStore(memory_limit=1)
+        sessions = [self._signed_in(store) for _ in range(3)]
+        store.acquire(sessions[0].session_id)
+        store.get(sessions[2].session_id)
+        self.assertEqual(store.sample_sizes(), 1)
+        # The second oldest session is in use and the newest is never evicted
+        self.assertIn(sessions[0].session_id, store)
+        self.assertNotIn(sessions[1].session_id, store)
+        self.assertIn(sessions[2].session_id, store)
+        self.assertEqual(sessions[0].cur_UID, 1)
+
+    def test_size_of_session_changed_by_another_thread(self) -> None:
+        session = Session()
+        session.cards = {}
+        running = True
+
+        def change_cards() -> None:
+            number = 0
+            while running:
+                session.cards[number] = str(number)
+                session.cards.pop(number - 100, None)
+                number += 1
+
+        thread = threading.Thread(target=change_cards)
+        thread.start()
+        try:
+            for _ in range(200):
+                self.assertGreater(session.memory_usage(), 0)
+        finally:
+            running = False
+            thread.join()
+
+
+class EvictionLoopTest(unittest.TestCase):
+    def test_failed_eviction_retried(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        db = Database(Path(temp_dir.name) / "study_tool_db.db")
+        db.check_database()
+        service = StudyService(db, workers=1)
+        self.addCleanup(service._executor.shutdown)
+        calls = []
+
+        def evict() -> None:
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("dictionary changed size during iteration")
+
+        async def run_evictions() -> None:
+            task = asyncio.create_task(service._evict_sessions(0, evict))
+            # Wait for two runs after the failure, unless the loop has stopped
+            for _ in range(500):
+                if len(calls) >= 3 or task.done():
+                    break
+                await asyncio.sleep(0.01)
+            task.cancel()
+
+        with self.assertLogs("study_service", "ERROR") as logs:
+            asyncio.run(run_evictions())
+        self.assertGreaterEqual(len(calls), 3)
+        self.assertEqual(len(logs.records), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+from data_handler import DataHandler
+from database_access import Database
+from job_executor import JobExecutor
+from pathlib import Path
+import tempfile
+import threading
+import unittest
+
+"""
+Checks signing in only changes the session once the result is accepted
+"""
+
+
+class WindowStub:
+    """Records events written by a JobExecutor, in place of a PySimpleGUI window."""
+
+    def __init__(self) -> None:
+        self.events = []
+        self.written = threading.Event()
+
+    def write_event_value(self, key: str, value: tuple) -> None:
+        self.events.append((key, value))
+        self.written.set()
+
+
+class SignInTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        db = Database(Path(temp_dir.name) / "study_tool_db.db")
+        db.check_database()
+        address = {"postcode": "AB12CD", "city": "Testville", "country": "UK"}
+        db.create_account("student1", "Password1!", "Sam", "sam@example.com", address)
+        self.handler = DataHandler(db=db)
+
+    def test_check_credentials_leaves_session(self) -> None:
+        auth_result = self.handler.check_credentials("student1", "Password1!")
+        self.assertTrue(auth_result["auth"])
+        self.assertEqual(auth_result["first_name"], "Sam")
+        self.assertIsNone(self.handler.session.cur_UID)
+        self.handler.sign_in(auth_result)
+        self.assertEqual(self.handler.session.cur_UID, auth_result["UID"])
+        self.assertEqual(self.handler.session.cur_first_name, "Sam")
+
+    def test_wrong_password(self) -> None:
+        auth_result = self.handler.check_credentials("student1", "wrong")
+        self.handler.sign_in(auth_result)
+        self.assertFalse(auth_result["auth"])
+        self.assertIsNone(self.handler.session.cur_UID)
+
+    def test_authenticate_user_signs_in(self) -> None:
+        self.assertEqual(
+            self.handler.authenticate_user("student1", "Password1!"),
+            {"auth": True, "err_msg": ""},
+        )
+        self.assertIsNotNone(self.handler.session.cur_UID)
+
+    def test_cancelled_job_does_not_sign_in(self) -> None:
+        executor = JobExecutor(workers=1)
+        self.addCleanup(executor.shutdown)
+        window = WindowStub()
+        executor.set_window(window)
+        # Block the worker, so the sign in job is cancelled while it waits or runs
+        release = threading.Event()
+        executor.submit("Blocking", release.wait)
+        job_id = executor.submit(
+            "Signing in", self.handler.check_credentials, "student1", "Password1!"
+        )
+        executor.cancel(job_id)
+        release.set()
+        window.written.wait(5)
+        executor.shutdown()
+        self.assertIsNone(self.handler.session.cur_UID)
+        self.assertNotIn(job_id, [value[0] for _, value in window.events])
+
+
+if __name__ == "__main__":
+    unittest.main()
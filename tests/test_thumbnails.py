@@ -0,0 +1,72 @@
+from data_handler import DataHandler
+from database_access import Database
+from io import BytesIO
+from pathlib import Path
+from PIL import Image
+from render_cache import RenderCache
+from unittest import mock
+import tempfile
+import unittest
+
+"""
+Checks resized tree images have the requested size and format, and are only cached when they differ from the source
+"""
+
+
+class ThumbnailTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        db = Database(Path(temp_dir.name) / "study_tool_db.db")
+        db.check_database()
+        self.render_cache = RenderCache()
+        self.thumbnail_cache = RenderCache()
+        for name, cache in (
+            ("render_cache", self.render_cache),
+            ("thumbnail_cache", self.thumbnail_cache),
+        ):
+            patcher = mock.patch.object(DataHandler, name, cache)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.handler = DataHandler(db=db)
+        # A wide tree, so the image's sides differ
+        self.handler.generate_tree("8,4,12,2,6,10,14,1,3,5,7,9,11,13,15", False)
+
+    def _size_and_format(self, image_bytes: bytes) -> tuple:
+        with Image.open(BytesIO(image_bytes)) as image:
+            return image.size, image.format
+
+    def test_source_size_not_cached_again(self) -> None:
+        thumbnail = self.handler.resize_image()
+        self.assertIs(thumbnail, self.handler.image)
+        self.assertEqual(
+            max(self._size_and_format(thumbnail)[0]), DataHandler.image_size
+        )
+        self.assertEqual(len(self.thumbnail_cache), 0)
+
+    def test_smaller_size(self) -> None:
+        source_width, source_height = self._size_and_format(self.handler.image)[0]
+        thumbnail = self.handler.resize_image(size=200)
+        (width, height), image_format = self._size_and_format(thumbnail)
+        self.assertEqual((max(width, height), image_format), (200, "PNG"))
+        # The aspect ratio is kept, to within rounding
+        self.assertAlmostEqual(width / height, source_width / source_height, delta=0.02)
+        self.assertEqual(len(self.thumbnail_cache), 1)
+        self.assertIs(self.handler.resize_image(size=200), thumbnail)
+        self.assertEqual(self.thumbnail_cache.memory_usage()["hits"], 1)
+
+    def test_other_format(self) -> None:
+        thumbnail = self.handler.resize_image("JPEG")
+        size, image_format = self._size_and_format(thumbnail)
+        self.assertEqual((max(size), image_format), (DataHandler.image_size, "JPEG"))
+        self.assertEqual(len(self.thumbnail_cache), 1)
+
+    def test_thumbnail_follows_tree(self) -> None:
+        first = self.handler.resize_image(size=200)
+        self.handler.add_tree_node("16")
+        self.assertNotEqual(self.handler.resize_image(size=200), first)
+        self.assertEqual(len(self.thumbnail_cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
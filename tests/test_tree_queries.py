@@ -0,0 +1,143 @@
+from balanced_trees import AVLTree, RedBlackTree
+from binary_search_tree import BinarySearchTree
+from data_handler import DataHandler
+from database_access import Database
+from pathlib import Path
+from typing import List
+import random
+import tempfile
+import unittest
+
+"""
+Checks tree queries against the values in the tree, and that their traces follow the path taken from the root
+"""
+
+
+def search_path(tree: BinarySearchTree, value: int) -> List[int]:
+    """Return the values on the path from the root towards a value, ending at the value or an empty subtree."""
+    path, node = [], tree.root
+    while node is not None:
+        path.append(node.value)
+        if value == node.value:
+            break
+        node = node.left if value < node.value else node.right
+    return path
+
+
+class TreeQueriesTest(unittest.TestCase):
+    tree_classes = (BinarySearchTree, AVLTree, RedBlackTree)
+
+    def _tree(self, tree_class: type, values: List[int]) -> BinarySearchTree:
+        tree = tree_class()
+        tree.build_tree(values)
+        return tree
+
+    def test_queries_match_values(self) -> None:
+        values = random.sample(range(0, 2000, 2), 300)
+        ordered = sorted(values)
+        for tree_class in self.tree_classes:
+            with self.subTest(tree_class.__name__):
+                tree = self._tree(tree_class, values)
+                self.assertEqual(tree.minimum(), ordered[0])
+                self.assertEqual(tree.maximum(), ordered[-1])
+                for query in random.sample(range(-10, 2010), 200):
+                    self.assertEqual(tree.search(query), query in values)
+                    greater = [value for value in ordered if value > query]
+                    self.assertEqual(
+                        tree.successor(query), greater[0] if greater else None
+                    )
+                    low, high = sorted((query, random.randint(-10, 2010)))
+                    self.assertEqual(
+                        list(tree.range_query(low, high)),
+                        [value for value in ordered if low <= value <= high],
+                    )
+
+    def test_traces_follow_search_path(self) -> None:
+        values = random.sample(range(1000), 200)
+        for tree_class in self.tree_classes:
+            with self.subTest(tree_class.__name__):
+                tree = self._tree(tree_class, values)
+                for query in random.sample(range(-10, 1010), 100):
+                    trace = {}
+                    found = tree.search(query, trace)
+                    path = search_path(tree, query)
+                    self.assertEqual(trace["visited"], path)
+                    # One equality check per node, and one ordering check per step down
+                    self.assertEqual(trace["comparisons"], 2 * len(path) - found)
+                    trace = {}
+                    successor = tree.successor(query, trace)
+                    self.assertEqual(successor, tree.successor(query))
+                    self.assertEqual(trace["visited"][0], tree.root.value)
+                    self.assertEqual(len(trace["visited"]), trace["comparisons"])
+                    self.assertLessEqual(len(trace["visited"]), tree.height)
+                trace = {}
+                tree.minimum(trace)
+                self.assertEqual(
+                    trace["visited"], search_path(tree, -1)[:-1] + [min(values)]
+                )
+                trace = {}
+                tree.maximum(trace)
+                self.assertEqual(trace["visited"][-1], max(values))
+                self.assertEqual(len(trace["visited"]), len(search_path(tree, 10**6)))
+
+    def test_range_trace_is_bounded(self) -> None:
+        values = list(range(4096))
+        for tree_class in (AVLTree, RedBlackTree):
+            with self.subTest(tree_class.__name__):
+                tree = self._tree(tree_class, values)
+                trace = {}
+                found = list(tree.range_query(1000, 1009, trace))
+                self.assertEqual(found, list(range(1000, 1010)))
+                # Only the paths to the ends of the range and the values in it are visited
+                self.assertLessEqual(
+                    len(trace["visited"]), 2 * tree.height + len(found)
+                )
+
+    def test_trace_reset_between_queries(self) -> None:
+        tree = self._tree(BinarySearchTree, [5, 3, 8])
+        trace = {}
+        tree.search(8, trace)
+        tree.search(3, trace)
+        self.assertEqual(trace, {"visited": [5, 3], "comparisons": 3})
+
+    def test_delete_trace_includes_successor(self) -> None:
+        tree = self._tree(BinarySearchTree, [50, 30, 70, 60, 80, 65])
+        trace = {}
+        self.assertTrue(tree.delete(50, trace))
+        # 50 has two children, so its successor 60 is found down the right subtree
+        self.assertEqual(trace["visited"], [50, 70, 60])
+        self.assertEqual(tree.pre_order_traversal(), [60, 30, 70, 65, 80])
+        self.assertFalse(tree.delete(50, trace))
+
+    def test_empty_tree(self) -> None:
+        tree = BinarySearchTree()
+        trace = {}
+        self.assertIsNone(tree.minimum(trace))
+        self.assertEqual(trace, {"visited": [], "comparisons": 0})
+        self.assertFalse(tree.search(1, trace))
+        self.assertIsNone(tree.successor(1, trace))
+        self.assertEqual(list(tree.range_query(0, 10, trace)), [])
+
+
+class RunTreeOperationTest(unittest.TestCase):
+    def test_output_describes_trace(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        db = Database(Path(temp_dir.name) / "study_tool_db.db")
+        db.check_database()
+        handler = DataHandler(db=db)
+        handler.session.tree = BinarySearchTree()
+        handler.session.tree.build_tree([5, 3, 8, 7])
+        result = handler.run_tree_operation("Search", "7")
+        self.assertTrue(result["result"])
+        self.assertEqual(
+            result["output"],
+            "7 is in the tree\nNodes visited (3): 5, 8, 7\nComparisons: 5",
+        )
+        result = handler.run_tree_operation("Range", "9, 2")
+        self.assertIn("Values from 2 to 9: 3, 5, 7, 8", result["output"])
+        self.assertFalse(handler.run_tree_operation("Search", "x")["result"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+from balanced_trees import AVLTree
+from binary_search_tree import BinarySearchTree
+from io import BytesIO
+from PIL import Image
+from tree_renderer import TreeRenderer
+import random
+import sys
+import unittest
+
+"""
+Checks tree layouts never overlap, keep the tree's shape, and are drawn at the requested size
+"""
+
+
+class TreeRendererTest(unittest.TestCase):
+    def _check_layout(self, tree: BinarySearchTree) -> None:
+        positions = TreeRenderer.layout(tree.root)
+        nodes = list(TreeRenderer._post_order(tree.root))
+        self.assertEqual(len(positions), len(nodes))
+        self.assertEqual(min(x for x, _ in positions.values()), 0)
+        # Nodes on each level are in in-order order, at least one unit apart
+        levels = {}
+        in_order = {
+            value: index for index, value in enumerate(tree.in_order_traversal())
+        }
+        for node in nodes:
+            x, depth = positions[id(node)]
+            levels.setdefault(depth, []).append((in_order[node.value], x))
+        for depth, level in levels.items():
+            xs = [x for _, x in sorted(level)]
+            for left_x, right_x in zip(xs, xs[1:]):
+                self.assertGreaterEqual(
+                    right_x - left_x, 1 - 1e-9, f"overlap at depth {depth}"
+                )
+        # Children are one level down, either side of their parent and centred under it
+        for node in nodes:
+            x, depth = positions[id(node)]
+            children = [child for child in (node.left, node.right) if child is not None]
+            for child in children:
+                self.assertEqual(positions[id(child)][1], depth + 1)
+            if node.left is not None:
+                self.assertLess(positions[id(node.left)][0], x)
+            if node.right is not None:
+                self.assertGreater(positions[id(node.right)][0], x)
+            if len(children) == 2:
+                self.assertAlmostEqual(
+                    (positions[id(node.left)][0] + positions[id(node.right)][0]) / 2, x
+                )
+            elif children:
+                self.assertAlmostEqual(abs(positions[id(children[0])][0] - x), 0.5)
+
+    def test_random_trees(self) -> None:
+        for _ in range(20):
+            tree = BinarySearchTree()
+            tree.build_tree(random.sample(range(1000), random.randint(1, 200)))
+            self._check_layout(tree)
+
+    def test_balanced_tree(self) -> None:
+        tree = AVLTree()
+        tree.build_tree(range(500))
+        self._check_layout(tree)
+
+    def test_perfect_tree_is_compact(self) -> None:
+        tree = BinarySearchTree()
+        tree.build_balanced_tree(range(2**6 - 1))
+        self._check_layout(tree)
+        positions = TreeRenderer.layout(tree.root)
+        # The bottom level is packed one unit apart, so the tree is as narrow as possible
+        self.assertEqual(max(x for x, _ in positions.values()), 2**5 - 1)
+
+    def test_tree_deeper_than_recursion_limit(self) -> None:
+        tree = BinarySearchTree()
+        tree.build_tree(range(sys.getrecursionlimit() + 500))
+        self._check_layout(tree)
+
+    def test_render_size(self) -> None:
+        tree = BinarySearchTree()
+        tree.build_tree([50, 30, 70, 20, 40, 60, 80, 10])
+        for encode_format in ("PNG", "JPEG"):
+            with self.subTest(encode_format):
+                image_bytes = TreeRenderer.render(tree.root, 300, None, encode_format)
+                with Image.open(BytesIO(image_bytes)) as image:
+                    self.assertEqual(image.format, encode_format)
+                    self.assertEqual(max(image.size), 300)
+        self.assertIsNone(TreeRenderer.render(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+from PIL import Image, ImageDraw, ImageFont
+from io import BytesIO
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+"""
+Draws binary trees straight to images, without Graphviz or temporary files
+"""
+
+
+class TreeRenderer:
+    """
+    Lays out binary trees with the Reingold-Tilford algorithm, and draws them with PIL.
+
+    Nodes can be any object with 'value', 'left' and 'right' attributes.
+    Sibling subtrees are pushed apart just far enough that no level overlaps, and parents are centred over their children.
+    """
+
+    # Distance between levels, in units of the minimum distance between nodes on the same level
+    level_spacing = 1.4
+    # Radius of a node, in the same units
+    node_radius = 0.4
+
+    @staticmethod
+    def _post_order(root: Any) -> Iterator[Any]:
+        """Yield the nodes of a tree in post-order, without recursion."""
+        stack, node, last_visited = [], root, None
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            top = stack[-1]
+            if top.right is not None and top.right is not last_visited:
+                node = top.right
+            else:
+                last_visited = stack.pop()
+                yield last_visited
+
+    @staticmethod
+    def layout(root: Any) -> Dict[int, Tuple[float, int]]:
+        """
+        Position every node of a tree, in O(n) time.
+
+        Each subtree's outline (its leftmost and rightmost x at each depth) is kept as two lists, deepest level first,
+        plus an offset added to every entry. Joining two subtrees only reads and rewrites the levels they share,
+        and the deeper subtree's lists are reused, so each level is only touched while it is the shallower side.
+
+        Arguments:
+            root (Any): Root node of the tree.
+
+        Returns:
+            Dict[int, Tuple[float, int]]: Position of each node by id(node), as (x, depth). x is in units of
+                                          the minimum distance between nodes, with the leftmost node at 0.
+        """
+        if root is None:
+            return {}
+        # Position of each child relative to its parent
+        offsets = {}
+        # Outline of each finished subtree, as (left list, left offset, right list, right offset)
+        outlines = {}
+        for node in TreeRenderer._post_order(root):
+            left = outlines.pop(id(node.left), None)
+            right = outlines.pop(id(node.right), None)
+            if left is not None and right is not None:
+                left_left, left_left_shift, left_right, left_right_shift = left
+                right_left, right_left_shift, right_right, right_right_shift = right
+                # Find how far apart the children must be for the subtrees not to overlap at any shared level
+                separation = 1 + max(
+                    left_right[len(left_right) - 1 - depth]
+                    + left_right_shift
+                    - right_left[len(right_left) - 1 - depth]
+                    - right_left_shift
+                    for depth in range(min(len(left_right), len(right_left)))
+                )
+                half = separation / 2
+                offsets[id(node.left)] = -half
+                offsets[id(node.right)] = half
+                # The left outline is the left subtree's, continued by the right subtree's below it
+                if len(right_left) > len(left_left):
+                    outline_left, outline_left_shift = (
+                        right_left,
+                        right_left_shift + half,
+                    )
+                    for depth in range(len(left_left)):
+                        outline_left[len(outline_left) - 1 - depth] = (
+                            left_left[len(left_left) - 1 - depth]
+                            + left_left_shift
+                            - half
+                            - outline_left_shift
+                        )
+                else:
+                    outline_left, outline_left_shift = left_left, left_left_shift - half
+                # The right outline is the right subtree's, continued by the left subtree's below it
+                if len(left_right) > len(right_right):
+                    outline_right, outline_right_shift = (
+                        left_right,
+                        left_right_shift - half,
+                    )
+                    for depth in range(len(right_right)):
+                        outline_right[len(outline_right) - 1 - depth] = (
+                            right_right[len(right_right) - 1 - depth]
+                            + right_right_shift
+                            + half
+                            - outline_right_shift
+                        )
+                else:
+                    outline_right, outline_right_shift = (
+                        right_right,
+                        right_right_shift + half,
+                    )
+            elif left is not None or right is not None:
+                # An only child sits half a unit to its side, so the tree's shape stays visible
+                child, offset = (
+                    (node.left, -0.5) if left is not None else (node.right, 0.5)
+                )
+                outline = left if left is not None else right
+                offsets[id(child)] = offset
+                outline_left, outline_left_shift = outline[0], outline[1] + offset
+                outline_right, outline_right_shift = outline[2], outline[3] + offset
+            else:
+                outline_left, outline_left_shift = [], 0
+                outline_right, outline_right_shift = [], 0
+            # The node itself is the top level of its outline, at x = 0
+            outline_left.append(-outline_left_shift)
+            outline_right.append(-outline_right_shift)
+            outlines[id(node)] = (
+                outline_left,
+                outline_left_shift,
+                outline_right,
+                outline_right_shift,
+            )
+        # Convert relative offsets to positions, from the root down
+        positions = {}
+        stack = [(root, 0.0, 0)]
+        while stack:
+            node, x, depth = stack.pop()
+            positions[id(node)] = (x, depth)
+            for child in (node.left, node.right):
+                if child is not None:
+                    stack.append((child, x + offsets[id(child)], depth + 1))
+        min_x = min(x for x, _ in positions.values())
+        return {
+            node_id: (x - min_x, depth) for node_id, (x, depth) in positions.items()
+        }
+
+    @staticmethod
+    def render(
+        root: Any,
+        size: int = 500,
+        node_colour: Callable[[Any], str] = None,
+        encode_format: str = "PNG",
+    ) -> Optional[bytes]:
+        """
+        Draw a tree as an image, scaled so its longer side is a given size.
+
+        Arguments:
+            root (Any): Root node of the tree.
+            size (int): Length of the image's longer side in pixels. Defaults to 500.
+            node_colour (Callable[[Any], str]): Optional. Returns the colour to outline and label a node with.
+                                                Defaults to None, drawing every node in black.
+            encode_format (str): Format to encode the image in. Defaults to "PNG".
+
+        Returns:
+            Optional[bytes]: The encoded image, otherwise None if the tree is empty.
+        """
+        positions = TreeRenderer.layout(root)
+        if not positions:
+            return None
+        # Scale the tree's extent in units, with half a unit of margin all round, to the image size
+        width_units = max(x for x, _ in positions.values()) + 1
+        height_units = (
+            max(depth for _, depth in positions.values()) * TreeRenderer.level_spacing
+            + 1
+        )
+        scale = size / max(width_units, height_units)
+        image = Image.new(
+            "RGB",
+            (max(1, round(width_units * scale)), max(1, round(height_units * scale))),
+            "white",
+        )
+        draw = ImageDraw.Draw(image)
+
+        def centre(node: Any) -> Tuple[float, float]:
+            x, depth = positions[id(node)]
+            return (x + 0.5) * scale, (depth * TreeRenderer.level_spacing + 0.5) * scale
+
+        radius = TreeRenderer.node_radius * scale
+        line_width = max(1, round(scale / 25))
+        nodes = list(TreeRenderer._post_order(root))
+        # Size the labels so the longest one fits inside a node
+        longest_label = max(len(str(node.value)) for node in nodes)
+        font_size = int(min(radius, 3 * radius / max(longest_label, 1)))
+        font = None
+        if font_size >= 6:
+            try:
+                font = ImageFont.load_default(size=font_size)
+            except TypeError:
+                # Older versions of PIL only have a fixed size default font
+                font = ImageFont.load_default()
+        # Edges first, so nodes are drawn over their ends
+        for node in nodes:
+            for child in (node.left, node.right):
+                if child is not None:
+                    draw.line(
+                        [centre(node), centre(child)], fill="black", width=line_width
+                    )
+        for node in nodes:
+            colour = node_colour(node) if node_colour is not None else "black"
+            x, y = centre(node)
+            draw.ellipse(
+                [x - radius, y - radius, x + radius, y + radius],
+                fill="white",
+                outline=colour,
+                width=line_width,
+            )
+            if font is not None:
+                label = str(node.value)
+                left, top, right, bottom = draw.textbbox((0, 0), label, font=font)
+                draw.text(
+                    (x - (left + right) / 2, y - (top + bottom) / 2),
+                    label,
+                    fill=colour,
+                    font=font,
+                )
+        with BytesIO() as buffer:
+            image.save(buffer, format=encode_format)
+            return buffer.getvalue()